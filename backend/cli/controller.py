@@ -1,12 +1,15 @@
 import argparse
 import json
+import sys
 from argparse import Namespace
-from inspect import signature
 from typing import Optional, Type, List
 
 from cli.reconstruction import ProjectReconstruction
 from core.service.data_source.database_common import DatabaseConnectionManager
 from core.service.generation_procedure.controller import ProcedureController
+from core.service.generation_procedure.database import TableStorage
+from core.service.generation_procedure.key_set import KeyStorage
+from core.service.generation_procedure.planner import RequisitionPlanner
 from core.service.output_driver import OutputDriver
 from core.service.output_driver.database import DatabaseOutputDriver
 from core.service.output_driver.file_driver.base import FileOutputDriver
@@ -43,6 +46,7 @@ class CommandLineController:
         """Assemble an INSERT command for the parser."""
         insert_parser = subparsers.add_parser(DatabaseOutputDriver.cli_command)
         self._add_project_argument(insert_parser)
+        self._add_generation_arguments(insert_parser)
         insert_parser.add_argument('url', help='SQLAlchemy database connection string')
         insert_parser.set_defaults(
             make_driver=lambda args: setattr(self,
@@ -54,16 +58,17 @@ class CommandLineController:
         """Assemble a command for an output file driver."""
         file_parser = subparsers.add_parser(file_driver.cli_command)
         self._add_project_argument(file_parser)
-        sig = signature(file_driver.dump)
-        output_bytes = sig.return_annotation == bytes
+        self._add_generation_arguments(file_parser)
+        output_bytes = file_driver.is_binary
         file_parser.add_argument(
             'output',
             help='path to the output file',
             type=argparse.FileType('wb' if output_bytes else 'w'),
             nargs=1 if output_bytes else '?'
         )
+        file_driver.add_cli_arguments(file_parser)
         file_parser.set_defaults(
-            make_driver=lambda args: setattr(self, '_driver', file_driver())
+            make_driver=lambda args: setattr(self, '_driver', file_driver.from_cli_arguments(args))
         )
 
     @staticmethod
@@ -74,6 +79,43 @@ class CommandLineController:
                             help='path to the project file',
                             type=argparse.FileType('r'))
 
+    @staticmethod
+    def _add_generation_arguments(parser: argparse.ArgumentParser):
+        """Add optional arguments to the parser, which configure
+        the generation procedure."""
+        parser.add_argument('--batch-size',
+                            help='generate the rows in batches of this size',
+                            type=int,
+                            default=None)
+        parser.add_argument('--storage',
+                            help='how to keep the generated rows needed during the generation',
+                            choices=TableStorage.get_storage_names(),
+                            default='rows')
+        parser.add_argument('--key-storage',
+                            help='how to keep the unique keys checked during the generation',
+                            choices=KeyStorage.get_storage_names(),
+                            default='tuples')
+        parser.add_argument('--key-filter',
+                            help='put Bloom filters in front of the unique keys '
+                                 'and report their statistics to the standard error',
+                            action='store_true')
+        parser.add_argument('--plan',
+                            help='before the generation, report the unique constraints likely to prevent '
+                                 'generating the requested rows to the standard error, fail in the strict mode, '
+                                 'pick the unique modes of the generators in the auto mode; '
+                                 'the requisition is not planned by default',
+                            choices=RequisitionPlanner.modes,
+                            default=None)
+        parser.add_argument('--workers',
+                            help='generate the tables level by level of their dependencies '
+                                 'in this many worker processes',
+                            type=int,
+                            default=None)
+        parser.add_argument('--shard-size',
+                            help='in the parallel mode, split larger tables into shards of this size',
+                            type=int,
+                            default=None)
+
     def _parse_project_file(self):
         """Read the contents of the project file, close the file
         and reconstruct the project entities.
@@ -89,22 +131,36 @@ class CommandLineController:
         controller = ProcedureController(
             self._saved_project.project,
             self._saved_project.requisition,
-            self._driver
+            self._driver,
+            batch_size=self._args.batch_size,
+            storage=TableStorage.make_storage(self._args.storage),
+            workers=self._args.workers,
+            shard_size=self._args.shard_size,
+            key_storage=KeyStorage.make_storage(self._args.key_storage),
+            key_filter=self._args.key_filter,
+            plan_mode=self._args.plan
         )
-        controller.run()
+        for issue in controller.plan_requisition().issues:
+            print(issue, file=sys.stderr)
+        database = controller.run()
+        database.clean_up()
+        for constraint_name, statistics in controller.statistics.key_filters.items():
+            print('{}: {}'.format(constraint_name, statistics), file=sys.stderr)
+        for constraint_name, retry_count in controller.statistics.retry_counts.items():
+            print('{}: {} retries'.format(constraint_name, retry_count), file=sys.stderr)
 
     def _maybe_write_output(self):
         """Depending on the type of the output driver,
-        write to the output file or standard output.
+        stream the content to the output file or standard output.
         """
         if not isinstance(self._driver, FileOutputDriver):
             return
-        dump = self._driver.dump()
         if not self._args.output:
-            print(dump)
+            self._driver.dump_to(sys.stdout)
         elif isinstance(self._args.output, list):
-            self._args.output[0].write(dump)
+            self._driver.dump_to(self._args.output[0])
             self._args.output[0].close()
         else:
-            self._args.output.write(dump)
+            self._driver.dump_to(self._args.output)
             self._args.output.close()
+        self._driver.close()
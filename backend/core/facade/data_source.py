@@ -8,6 +8,7 @@ from core.facade.project import ProjectFacade, ProjectStorage
 from core.model.data_source import DataSource
 from core.model.project import Project
 from core.model.user import User
+from core.service.data_source.csv_common import CsvColumnCache
 from core.service.data_source.database_common import DatabaseConnectionManager
 from core.service.data_source.file_common import FileDataSourceFactory, is_file_allowed
 from core.service.data_source.schema import DataSourceSchemaImport
@@ -22,6 +23,10 @@ from core.service.output_driver.database import DatabaseOutputDriver
 class DataSourceFacade:
     """Provide CRUD operations related to DataSource."""
 
+    export_batch_size = 1000
+    """Number of rows generated and inserted at once by an export to a database.
+    The rows rejected by the batch check are repaired like in the row mode."""
+
     def __init__(self,
                  db_session: Session,
                  user: User,
@@ -55,8 +60,11 @@ class DataSourceFacade:
         if data_source.driver is None:
             return DataSourceError('The data source is not a database', data_source)
         database_driver = DatabaseOutputDriver(data_source, self._conn_manager)
-        controller = ProcedureController(data_source.project, requisition, database_driver)
-        controller.run()
+        controller = ProcedureController(data_source.project,
+                                         requisition,
+                                         database_driver,
+                                         batch_size=self.export_batch_size)
+        controller.run().clean_up()
 
     def import_schema(self, data_source: DataSource):
         """Import schema from a data source to its project."""
@@ -70,6 +78,7 @@ class DataSourceFacade:
                 os.remove(data_source.file_path)
             except OSError:
                 pass
+            CsvColumnCache(data_source.file_path).remove()
         self._db_session.delete(data_source)
 
     @staticmethod
@@ -1,4 +1,4 @@
-from typing import NewType
+from typing import NewType, Tuple, Dict
 
 from sqlalchemy.orm import Session
 
@@ -33,15 +33,18 @@ class ProjectFacade:
             one()
 
     @staticmethod
-    def generate_preview(project: Project, requisition: ExportRequisition) -> dict:
-        """Generate data for the project and return it as dict.
+    def generate_preview(project: Project, requisition: ExportRequisition) -> Tuple[dict, Dict[str, int]]:
+        """Generate data for the project and return it as dict,
+        along with the numbers of column regenerations by the violated constraint name.
 
         Keys are table names, values are lists of dicts (GeneratedTable).
         """
         preview_driver = PreviewOutputDriver()
         controller = ProcedureController(project, requisition, preview_driver)
         preview = controller.run()
-        return preview.get_dict()
+        preview_dict = preview.get_dict()
+        preview.clean_up()
+        return preview_dict, controller.statistics.retry_counts
 
     def create_project(self, name: str) -> Project:
         """Create and return a new project for the logged in user."""
@@ -58,5 +61,5 @@ class ProjectFacade:
         """
         file_driver = FileOutputDriverFacade.make_driver(driver_name)
         controller = ProcedureController(project, requisition, file_driver)
-        controller.run()
+        controller.run().clean_up()
         return file_driver
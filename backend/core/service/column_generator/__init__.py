@@ -1,3 +1,3 @@
 import core.service.column_generator.basic_generator.special
 import core.service.column_generator.faker_generator
-from core.service.column_generator.basic_generator import boolean, number, string, list_of_values
+from core.service.column_generator.basic_generator import boolean, number, string, list_of_values, categorical
@@ -1,9 +1,10 @@
-from typing import Type, Iterable, List, Union
+from typing import Type, List
 
 from core.model.generator_setting import GeneratorSetting
 from core.model.meta_column import MetaColumn
 from core.model.meta_table import MetaTable
-from core.service.column_generator.base import RegisteredGenerator, ColumnGenerator, MultiColumnGenerator
+from core.service.column_generator.base import RegisteredGenerator, ColumnGenerator, MultiColumnGenerator, \
+    GeneratorMetadata
 from core.service.column_generator.setting_facade import GeneratorSettingFacade
 from core.service.exception import ColumnGeneratorError
 
@@ -16,26 +17,12 @@ class GeneratorAssignment:
         self._instances: List[ColumnGenerator] = []
         self._multi: List[MultiColumnGenerator] = []
 
-    @classmethod
-    def _type_matches(cls,
-                      column_gen: Union[Type[ColumnGenerator], ColumnGenerator],
-                      col_type: str) -> bool:
-        """Return whether a generator instance/type is compatible with column type."""
-        return column_gen.only_for_type() is None or column_gen.only_for_type() == col_type
-
-    @classmethod
-    def _generators_for_type(cls, col_type: str) -> Iterable[Type[ColumnGenerator]]:
-        """Return an iterable of generators compatible with given type."""
-        for column_gen in RegisteredGenerator.iter():
-            if cls._type_matches(column_gen, col_type):
-                yield column_gen
-
     @classmethod
     def _find_for_single_column(cls, meta_column: MetaColumn) -> Type[ColumnGenerator]:
         """Find the recommended generator for a column."""
-        for column_gen in cls._generators_for_type(meta_column.col_type):
-            if column_gen.is_recommended_for(meta_column):
-                return column_gen
+        for metadata in RegisteredGenerator.for_type(meta_column.col_type):
+            if metadata.factory.is_recommended_for(meta_column):
+                return metadata.factory
         raise ColumnGeneratorError('No suitable generator found', meta_column)
 
     @classmethod
@@ -45,11 +32,11 @@ class GeneratorAssignment:
         We check that the types are compatible and if there are already assigned
         columns, the generator must be multi column.
         """
-        factory = RegisteredGenerator.get_by_name(generator_setting.name)
-        if not cls._assignment_allowed(factory, generator_setting, meta_column):
+        metadata = RegisteredGenerator.get_metadata(generator_setting.name)
+        if not cls._assignment_allowed(metadata, generator_setting, meta_column):
             return False
-        if issubclass(factory, MultiColumnGenerator):
-            column_gen = factory(generator_setting)
+        if metadata.is_multi_column:
+            column_gen = metadata.factory(generator_setting)
             column_gen.unite_with(meta_column)
         else:
             meta_column.generator_setting = generator_setting
@@ -57,7 +44,7 @@ class GeneratorAssignment:
 
     @classmethod
     def _assignment_allowed(cls,
-                            factory: Type[ColumnGenerator],
+                            metadata: GeneratorMetadata,
                             generator_setting: GeneratorSetting,
                             meta_column: MetaColumn) -> bool:
         """Return whether generator (and its setting) is assignable to a column.
@@ -65,10 +52,10 @@ class GeneratorAssignment:
         The types must match. In case there are columns already assignment,
         it must be a multi column generator.
         """
-        if not cls._type_matches(factory, meta_column.col_type):
+        if not metadata.is_compatible_with(meta_column.col_type):
             return False
         if generator_setting.columns:
-            return issubclass(factory, MultiColumnGenerator)
+            return metadata.is_multi_column
         return True
 
     def _maybe_unite(self, factory: Type[ColumnGenerator], meta_column: MetaColumn) -> bool:
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import random
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from enum import Enum
 from inspect import signature
 from typing import List, Dict, Generic, TypeVar, Optional, Callable, Any, Type, Iterable
@@ -12,6 +13,7 @@ from core.service.column_generator.params import normalized_params, ColumnGenera
 from core.service.data_source.data_provider.base_provider import DataProvider
 from core.service.exception import GeneratorSettingError, GeneratorRegistrationError, SomeError
 from core.service.generation_procedure.database import GeneratedDatabase
+from core.service.generation_procedure.parallel import ShardPosition
 from core.service.types import class_to_types, Types
 
 OutputType = TypeVar('OutputType')
@@ -20,6 +22,11 @@ OutputType = TypeVar('OutputType')
 OutputDict = Dict[str, Optional[OutputType]]
 """Output type of a (multi column) generator. Keys are column names."""
 
+OutputBatch = Dict[str, List[Optional[OutputType]]]
+"""Batch output type of a (multi column) generator. Keys are column names,
+values are column chunks of equal length.
+"""
+
 
 class GeneratorCategory(Enum):
     """Taxonomy of generators, used in the frontend."""
@@ -104,6 +111,25 @@ class ColumnGenerator(Generic[OutputType], ABC):
         """Set random seed."""
         self._random.seed(seed)
 
+    def start_shard(self, position: ShardPosition, table_seed: Optional[float]):
+        """The following rows belong to a shard of the table at the given position.
+
+        The table seed is the seed the generator would get for the whole table,
+        it is shared by all shards of the table. Generators deriving values
+        from a sequence should derive it from the table seed and map their
+        draws to it by the shard position, so that the shards get disjoint values.
+        """
+        pass
+
+    def domain_size(self) -> Optional[int]:
+        """Return how many distinct values the generator can produce
+        with its current parameters, counting tuples of values
+        in case of multiple columns. Nulls are not counted.
+
+        None means that the number is unknown or practically unbounded.
+        """
+        return None
+
     @abstractmethod
     def make_dict(self, generated_database: GeneratedDatabase) -> OutputDict:
         """Generate and return the data for assigned columns.
@@ -113,6 +139,20 @@ class ColumnGenerator(Generic[OutputType], ABC):
         """
         pass
 
+    def make_batch(self, size: int, generated_database: GeneratedDatabase) -> OutputBatch:
+        """Generate and return column chunks of given size for assigned columns.
+
+        The output dictionary must contain exactly the keys of assigned column names,
+        each value being a list of exactly size elements.
+        Falls back to calling make_dict once per row. Generators able to produce
+        whole columns at once should override this method.
+        """
+        batch: OutputBatch = {}
+        for _ in range(size):
+            for column_name, value in self.make_dict(generated_database).items():
+                batch.setdefault(column_name, []).append(value)
+        return batch
+
     @classmethod
     def create_setting_instance(cls) -> GeneratorSetting:
         """Return a new setting instance of this generator type."""
@@ -151,50 +191,115 @@ class ColumnGenerator(Generic[OutputType], ABC):
             estimator(self, provider)
 
 
+@dataclass
+class GeneratorMetadata:
+    """Facts about a registered generator type, resolved once on its registration."""
+
+    factory: Type[ColumnGenerator]
+    """The generator type."""
+
+    name: str
+    """The generator name."""
+
+    only_for_type: Optional[Types]
+    """The supported column type, None means any type."""
+
+    category: GeneratorCategory
+    """Category of the generator, used in the frontend."""
+
+    supports_null: bool
+    """Are nulls handled automatically?"""
+
+    is_multi_column: bool
+    """Is it a multi column generator?"""
+
+    param_list: ColumnGeneratorParamList
+    """List of parameter definitions."""
+
+    tooltip: Optional[str]
+    """Description of the generator, used in the frontend."""
+
+    def is_compatible_with(self, col_type: Any) -> bool:
+        """Is the generator assignable to a column of the given type?"""
+        return self.only_for_type is None or self.only_for_type == col_type
+
+
 class RegisteredGenerator(ABC):
     """Marks a column generator. Manages the list of column generators.
 
-    Each column generator deriving from this class is automatically
+    Each column generator deriving directly from this class is automatically
     considered for generator assignment and should show up in the frontend.
+    The generator types are registered with their metadata as they are defined.
     """
 
-    _by_name: Optional[Dict[str, Type[ColumnGenerator]]] = None
-    """Column generator types by generator name."""
+    _by_name: Dict[str, GeneratorMetadata] = {}
+    """Metadata of the generator types by generator name."""
 
-    @classmethod
-    def _make_dict(cls):
-        """Prepare dictionary of generators by name."""
-        cls._by_name = {}
-        for column_gen in RegisteredGenerator.__subclasses__():
-            if not issubclass(column_gen, ColumnGenerator):
-                raise GeneratorRegistrationError()
-            cls._by_name[column_gen.name()] = column_gen
+    _by_type: Dict[Any, List[GeneratorMetadata]] = {}
+    """Metadata of the generator types compatible with a column type,
+    by the column type. Filled on demand, cleared on registration.
+    """
 
-    @classmethod
-    def _require_dict(cls):
-        """Make sure that we have the generator dictionary."""
-        if cls._by_name is None:
-            cls._make_dict()
+    def __init_subclass__(cls, **kwargs):
+        """Register the generator type, if it derives directly from this class."""
+        super().__init_subclass__(**kwargs)
+        if RegisteredGenerator not in cls.__bases__:
+            return
+        if not issubclass(cls, ColumnGenerator):
+            raise GeneratorRegistrationError()
+        metadata = GeneratorMetadata(
+            factory=cls,
+            name=cls.name(),
+            only_for_type=cls.only_for_type(),
+            category=cls.category,
+            supports_null=cls.supports_null,
+            is_multi_column=issubclass(cls, MultiColumnGenerator),
+            param_list=cls.param_list,
+            tooltip=cls.__doc__
+        )
+        RegisteredGenerator._by_name[metadata.name] = metadata
+        RegisteredGenerator._by_type.clear()
 
     @classmethod
     def is_name_registered(cls, name: str) -> bool:
         """Return whether the name is a registered generator name."""
-        cls._require_dict()
         return name in cls._by_name
 
     @classmethod
-    def get_by_name(cls, name: str) -> Type[ColumnGenerator[OutputType]]:
-        """Return generator type by name."""
+    def get_metadata(cls, name: str) -> GeneratorMetadata:
+        """Return generator type metadata by name."""
         if not cls.is_name_registered(name):
             raise SomeError('invalid generator name')
         return cls._by_name[name]
 
+    @classmethod
+    def get_by_name(cls, name: str) -> Type[ColumnGenerator[OutputType]]:
+        """Return generator type by name."""
+        return cls.get_metadata(name).factory
+
     @classmethod
     def iter(cls) -> Iterable[Type[ColumnGenerator]]:
         """Return iterator of generator types."""
-        cls._require_dict()
+        return (metadata.factory for metadata in cls._by_name.values())
+
+    @classmethod
+    def iter_metadata(cls) -> Iterable[GeneratorMetadata]:
+        """Return iterator of generator type metadata, in order of registration."""
         return cls._by_name.values()
 
+    @classmethod
+    def for_type(cls, col_type: Any) -> List[GeneratorMetadata]:
+        """Return metadata of the generator types compatible with the column type,
+        in order of registration.
+        """
+        if col_type not in cls._by_type:
+            cls._by_type[col_type] = [
+                metadata
+                for metadata in cls._by_name.values()
+                if metadata.is_compatible_with(col_type)
+            ]
+        return cls._by_type[col_type]
+
 
 class SingleColumnGenerator(Generic[OutputType], ColumnGenerator[OutputType]):
     """Base class for single column generators."""
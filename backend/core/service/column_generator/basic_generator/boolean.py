@@ -1,11 +1,14 @@
+from typing import Any, Optional
+
 from core.model.meta_column import MetaColumn
-from core.service.column_generator.base import SingleColumnGenerator, RegisteredGenerator
+from core.service.column_generator.base import RegisteredGenerator
+from core.service.column_generator.basic_generator.vectorized import VectorizedGenerator
 from core.service.column_generator.decorator import parameter
 from core.service.data_source.data_provider import DataProvider
 from core.service.generation_procedure.database import GeneratedDatabase
 
 
-class BernoulliGenerator(RegisteredGenerator, SingleColumnGenerator[bool]):
+class BernoulliGenerator(RegisteredGenerator, VectorizedGenerator[bool]):
     """Generate booleans from a Bernoulli distribution."""
 
     @parameter(min_value=0, max_value=1)
@@ -14,16 +17,19 @@ class BernoulliGenerator(RegisteredGenerator, SingleColumnGenerator[bool]):
 
     @success_probability.estimator
     def success_probability(self, provider: DataProvider) -> float:
-        samples = 2
-        successes = 1
-        for sample in provider.scalar_data_not_none():
-            samples += 1
-            successes += bool(sample)
+        samples = 2 + provider.get_not_null_count()
+        successes = 1 + provider.get_true_count()
         return successes / samples
 
+    def domain_size(self) -> Optional[int]:
+        return 2
+
     def make_scalar(self, generated_database: GeneratedDatabase) -> bool:
         return self._random.random() <= self.success_probability
 
+    def make_array(self, size: int) -> Any:
+        return self._numpy_random.random(size) <= self.success_probability
+
     @classmethod
     def is_recommended_for(cls, meta_column: MetaColumn) -> bool:
         return True
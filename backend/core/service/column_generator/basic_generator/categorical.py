@@ -0,0 +1,163 @@
+import random
+from typing import Any, Optional, List, Tuple
+
+from core.model.generator_setting import GeneratorSetting
+from core.service.column_generator.base import RegisteredGenerator
+from core.service.column_generator.basic_generator.vectorized import VectorizedGenerator, numpy
+from core.service.column_generator.decorator import parameter
+from core.service.data_source.data_provider import DataProvider
+from core.service.exception import SomeError, ColumnGeneratorError
+from core.service.generation_procedure.database import GeneratedDatabase
+from core.service.types import Types, get_type_conversion_functor, DATETIME_FORMAT_NICE
+
+
+class AliasTable:
+    """Walker's alias table for sampling from a discrete distribution in O(1).
+
+    Built by Vose's method in O(n) from non-negative weights.
+    """
+
+    def __init__(self, weights: List[float]):
+        total = sum(weights)
+        if not weights or total <= 0:
+            raise ValueError('The weights must have a positive sum')
+        size = len(weights)
+        scaled = [weight * size / total for weight in weights]
+        self.probabilities = [1.] * size
+        """Probability of keeping the drawn column, by column."""
+        self.aliases = list(range(size))
+        """The alternative outcome, by column."""
+        small = [index for index, weight in enumerate(scaled) if weight < 1]
+        large = [index for index, weight in enumerate(scaled) if weight >= 1]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.probabilities[less] = scaled[less]
+            self.aliases[less] = more
+            scaled[more] -= 1 - scaled[less]
+            if scaled[more] < 1:
+                small.append(more)
+            else:
+                large.append(more)
+
+    def __len__(self) -> int:
+        return len(self.probabilities)
+
+    def draw(self, random_inst: random.Random) -> int:
+        """Draw an outcome index."""
+        column = random_inst.randrange(len(self.probabilities))
+        if random_inst.random() < self.probabilities[column]:
+            return column
+        return self.aliases[column]
+
+    def draw_array(self, numpy_random: Any, size: int) -> Any:
+        """Draw a NumPy array of outcome indexes."""
+        columns = numpy_random.integers(len(self.probabilities), size=size)
+        keep = numpy_random.random(size) < numpy.asarray(self.probabilities)[columns]
+        return numpy.where(keep, columns, numpy.asarray(self.aliases)[columns])
+
+
+class CategoricalGenerator(RegisteredGenerator, VectorizedGenerator[Any]):
+    """Select a random value from a list of values with given weights.
+
+    The values are separated with a customizable separator, the weights
+    are comma separated counts. Estimation stores the most common values
+    of the data source with their counts, the less common values
+    are not generated.
+    """
+
+    max_estimated_values = 100
+    """How many values are estimated at most."""
+
+    def __init__(self, generator_setting: GeneratorSetting):
+        super().__init__(generator_setting)
+        self._values: Optional[List[Any]] = None
+        self._alias_table: Optional[AliasTable] = None
+        self._value_array: Optional[Any] = None
+        self._top_values: Optional[Tuple[DataProvider, List[Tuple[Any, int]]]] = None
+        """The most common values with their counts, read from a provider."""
+
+    @parameter
+    def values(self) -> str:
+        return '1,2,3'
+
+    @values.estimator
+    def values(self, provider: DataProvider) -> Optional[str]:
+        top_values = self._read_top_values(provider)
+        if not top_values:
+            return None
+        return self.separator.join(str(value) for value, _ in top_values)
+
+    @parameter
+    def separator(self) -> str:
+        return ','
+
+    @parameter
+    def weights(self) -> str:
+        return '1,1,1'
+
+    @weights.estimator
+    def weights(self, provider: DataProvider) -> Optional[str]:
+        top_values = self._read_top_values(provider)
+        if not top_values:
+            return None
+        return ','.join(str(count) for _, count in top_values)
+
+    @classmethod
+    def only_for_type(cls) -> Optional[Types]:
+        return None
+
+    def _read_top_values(self, provider: DataProvider) -> List[Tuple[Any, int]]:
+        """Return the most common values of the provider with their counts,
+        read once per provider.
+        """
+        if self._top_values is None or self._top_values[0] is not provider:
+            self._top_values = provider, provider.top_values(self.max_estimated_values)
+        return self._top_values[1]
+
+    def seed(self, seed: Optional[float]):
+        super().seed(seed)
+        self._values = self._convert_values()
+        weights = self._parse_weights()
+        if len(weights) != len(self._values):
+            raise ColumnGeneratorError('the number of weights does not match the values', self._meta_column)
+        try:
+            self._alias_table = AliasTable(weights)
+        except ValueError:
+            raise ColumnGeneratorError('the weights must have a positive sum', self._meta_column)
+        if numpy is not None:
+            self._value_array = numpy.empty(len(self._values), dtype=object)
+            self._value_array[:] = self._values
+
+    def _convert_values(self) -> List[Any]:
+        """Return the list of values converted to the column type."""
+        col_type = self._meta_column.col_type
+        converter = get_type_conversion_functor(col_type, DATETIME_FORMAT_NICE)
+        values = []
+        for value in self.values.split(self.separator):
+            try:
+                values.append(converter(value))
+            except (SomeError, ValueError):
+                raise ColumnGeneratorError(
+                    'conversion of the value `{}` to {} failed'.format(value, col_type),
+                    self._meta_column
+                )
+        return values
+
+    def _parse_weights(self) -> List[float]:
+        """Return the list of weights."""
+        try:
+            weights = [float(weight) for weight in self.weights.split(',')]
+        except ValueError:
+            raise ColumnGeneratorError('the weights must be numbers', self._meta_column)
+        if any(weight < 0 for weight in weights):
+            raise ColumnGeneratorError('the weights must not be negative', self._meta_column)
+        return weights
+
+    def domain_size(self) -> Optional[int]:
+        return len(set(self.values.split(self.separator)))
+
+    def make_scalar(self, generated_database: GeneratedDatabase) -> Any:
+        return self._values[self._alias_table.draw(self._random)]
+
+    def make_array(self, size: int) -> Any:
+        return self._value_array[self._alias_table.draw_array(self._numpy_random, size)]
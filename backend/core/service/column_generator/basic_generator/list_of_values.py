@@ -13,8 +13,12 @@ class ListOfValuesGenerator(RegisteredGenerator, SingleColumnGenerator[Any]):
     """Select a random value from a list of values.
 
     The list contains values separated with a customizable separator.
+    The estimated list holds the most common values of the data source.
     """
 
+    max_estimated_values = 100
+    """How many values are estimated at most."""
+
     def __init__(self, generator_setting: GeneratorSetting):
         super().__init__(generator_setting)
         self._values: Optional[tuple] = None
@@ -25,7 +29,8 @@ class ListOfValuesGenerator(RegisteredGenerator, SingleColumnGenerator[Any]):
 
     @list_of_values.estimator
     def list_of_values(self, provider: DataProvider) -> str:
-        return self.separator.join(map(str, provider.scalar_data_not_none()))
+        values = (value for value, _ in provider.top_values(self.max_estimated_values))
+        return self.separator.join(map(str, values))
 
     @parameter
     def separator(self) -> str:
@@ -51,5 +56,8 @@ class ListOfValuesGenerator(RegisteredGenerator, SingleColumnGenerator[Any]):
         if not self._values:
             raise ColumnGeneratorError('the list of values is empty', self._meta_column)
 
+    def domain_size(self) -> Optional[int]:
+        return len(set(self.list_of_values.split(self.separator)))
+
     def make_scalar(self, generated_database: GeneratedDatabase) -> Any:
         return self._random.choice(self._values)
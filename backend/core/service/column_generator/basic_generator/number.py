@@ -1,15 +1,38 @@
 from math import sqrt
-from typing import Optional
+from typing import Optional, Any
 
+from core.model.generator_setting import GeneratorSetting
 from core.model.meta_column import MetaColumn
-from core.service.column_generator.base import RegisteredGenerator, SingleColumnGenerator
+from core.service.column_generator.base import RegisteredGenerator
+from core.service.column_generator.basic_generator.permutation import FeistelPermutation
+from core.service.column_generator.basic_generator.vectorized import VectorizedGenerator
 from core.service.column_generator.decorator import parameter
 from core.service.data_source.data_provider.base_provider import DataProvider
 from core.service.generation_procedure.database import GeneratedDatabase
+from core.service.generation_procedure.parallel import ShardPosition
 
 
-class IntegerGenerator(RegisteredGenerator, SingleColumnGenerator[int]):
-    """Generate integers uniformly from a closed interval."""
+INT64_MIN = -2 ** 63
+INT64_MAX = 2 ** 63 - 1
+"""Bounds of integers supported by the NumPy backend."""
+
+
+class IntegerGenerator(RegisteredGenerator, VectorizedGenerator[int]):
+    """Generate integers uniformly from a closed interval.
+
+    In the unique mode, the integers are drawn without replacement,
+    in the order of a pseudorandom permutation of the interval.
+    The permutation depends on the seed of the whole table,
+    so that the shards of the table draw disjoint integers.
+    Once the interval is exhausted, the integers are drawn uniformly again.
+    """
+
+    def __init__(self, generator_setting: GeneratorSetting):
+        super().__init__(generator_setting)
+        self._permutation: Optional[FeistelPermutation] = None
+        self._counter = 0
+        self._position: Optional[ShardPosition] = None
+        """Position of the current shard, None for the whole table."""
 
     @parameter
     def min(self) -> int:
@@ -19,6 +42,10 @@ class IntegerGenerator(RegisteredGenerator, SingleColumnGenerator[int]):
     def max(self) -> int:
         return 100
 
+    @parameter
+    def unique(self) -> bool:
+        return False
+
     @min.estimator
     def min(self, provider: DataProvider) -> int:
         return provider.estimate_min()
@@ -27,15 +54,53 @@ class IntegerGenerator(RegisteredGenerator, SingleColumnGenerator[int]):
     def max(self, provider: DataProvider) -> int:
         return provider.estimate_max()
 
+    def seed(self, seed: Optional[float]):
+        super().seed(seed)
+        self._make_permutation(seed)
+        self._counter = 0
+        self._position = None
+
+    def start_shard(self, position: ShardPosition, table_seed: Optional[float]):
+        self._make_permutation(table_seed)
+        self._counter = 0
+        self._position = position
+
+    def _make_permutation(self, seed: Optional[float]):
+        """In the unique mode, make the permutation of the interval keyed by the seed.
+        Without a seed, the key is random.
+        """
+        self._permutation = None
+        if not self.unique:
+            return
+        if seed is None:
+            seed = self._random.random()
+        key = '{}:{}:{}:{}'.format(seed, self._meta_column.name, self.min, self.max)
+        self._permutation = FeistelPermutation(self.max - self.min + 1, key)
+
+    def domain_size(self) -> Optional[int]:
+        return self.max - self.min + 1
+
     def make_scalar(self, generated_database: GeneratedDatabase) -> int:
+        if self._permutation is not None:
+            index = self._counter if self._position is None else self._position.sequence_number(self._counter)
+            self._counter += 1
+            if index < len(self._permutation):
+                return self.min + self._permutation(index)
         return self._random.randint(self.min, self.max)
 
+    def _can_vectorize(self) -> bool:
+        return super()._can_vectorize() and INT64_MIN <= self.min and self.max <= INT64_MAX \
+               and self._permutation is None
+
+    def make_array(self, size: int) -> Any:
+        return self._numpy_random.integers(self.min, self.max, size=size, endpoint=True)
+
     @classmethod
     def is_recommended_for(cls, meta_column: MetaColumn) -> bool:
         return True
 
 
-class FloatGenerator(RegisteredGenerator, SingleColumnGenerator[float]):
+class FloatGenerator(RegisteredGenerator, VectorizedGenerator[float]):
     """Generate uniform floats from a closed interval."""
 
     @parameter
@@ -61,8 +126,11 @@ class FloatGenerator(RegisteredGenerator, SingleColumnGenerator[float]):
     def make_scalar(self, generated_database: GeneratedDatabase) -> float:
         return self._random.uniform(self.min, self.max)
 
+    def make_array(self, size: int) -> Any:
+        return self._numpy_random.uniform(self.min, self.max, size=size)
+
 
-class GaussianGenerator(RegisteredGenerator, SingleColumnGenerator[float]):
+class GaussianGenerator(RegisteredGenerator, VectorizedGenerator[float]):
     """Generate floats from a Gaussian distribution.
 
     Mu is the mean, sigma is the standard deviation.
@@ -89,3 +157,6 @@ class GaussianGenerator(RegisteredGenerator, SingleColumnGenerator[float]):
 
     def make_scalar(self, generated_database: GeneratedDatabase) -> float:
         return self._random.gauss(self.mu, self.sigma)
+
+    def make_array(self, size: int) -> Any:
+        return self._numpy_random.normal(self.mu, self.sigma, size=size)
@@ -0,0 +1,47 @@
+import hashlib
+import random
+
+
+class FeistelPermutation:
+    """Pseudorandom permutation of the integers 0, ..., size - 1.
+
+    A balanced Feistel network permutes the integers of the smallest
+    even bit width covering the size. Results outside the range are
+    permuted again (cycle walking), until they fall inside.
+    The permutation is fully determined by the size and the key.
+    """
+
+    round_count = 4
+    """Number of Feistel rounds."""
+
+    def __init__(self, size: int, key: str):
+        if size < 1:
+            raise ValueError('The permutation size must be positive')
+        self._size = size
+        self._half_bits = max(((size - 1).bit_length() + 1) // 2, 1)
+        self._half_mask = (1 << self._half_bits) - 1
+        self._digest_size = min((self._half_bits + 7) // 8, 64)
+        key_random = random.Random(key)
+        self._round_keys = [key_random.getrandbits(128).to_bytes(16, 'big') for _ in range(self.round_count)]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _round(self, value: int, round_key: bytes) -> int:
+        """The round function, a keyed hash of the half block."""
+        data = value.to_bytes(self._digest_size, 'big')
+        digest = hashlib.blake2b(data, digest_size=self._digest_size, key=round_key).digest()
+        return int.from_bytes(digest, 'big') & self._half_mask
+
+    def __call__(self, index: int) -> int:
+        """Return the image of the index."""
+        if not 0 <= index < self._size:
+            raise IndexError('permutation index out of range')
+        value = index
+        while True:
+            left, right = value >> self._half_bits, value & self._half_mask
+            for round_key in self._round_keys:
+                left, right = right, left ^ self._round(right, round_key)
+            value = (left << self._half_bits) | right
+            if value < self._size:
+                return value
@@ -1,4 +1,4 @@
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
 
 from core.model.generator_setting import GeneratorSetting
 from core.model.meta_column import MetaColumn
@@ -8,6 +8,8 @@ from core.service.column_generator.base import RegisteredGenerator, SingleColumn
     OutputDict
 from core.service.exception import ColumnGeneratorError, GeneratorSettingError
 from core.service.generation_procedure.database import GeneratedDatabase, GeneratedTable
+from core.service.generation_procedure.parallel import ShardPosition
+from core.service.generation_procedure.reference_index import ReferenceIndex
 from core.service.types import Types
 
 
@@ -15,7 +17,7 @@ class ForeignKeyGenerator(RegisteredGenerator, MultiColumnGenerator):
     """General foreign key generator with composite key support.
 
     Requires a matching foreign key constraint on the table and the column.
-    The values are chosen randomly from the referenced table.
+    The values are chosen randomly from the keys in the referenced table.
     """
 
     def __init__(self, generator_setting: GeneratorSetting):
@@ -78,6 +80,11 @@ class ForeignKeyGenerator(RegisteredGenerator, MultiColumnGenerator):
     def only_for_type(cls) -> Optional[Types]:
         return None
 
+    @property
+    def constraint(self) -> Optional[MetaConstraint]:
+        """Return the matching FK constraint."""
+        return self._constraint
+
     @classmethod
     def is_recommended_for(cls, meta_column: MetaColumn) -> bool:
         for constraint in meta_column.constraints:
@@ -123,18 +130,32 @@ class ForeignKeyGenerator(RegisteredGenerator, MultiColumnGenerator):
             for column, ref_column in self._ref_column.items()
         }
 
+    def _from_random_key(self, reference_index: ReferenceIndex) -> OutputDict:
+        """Construct and return key chosen randomly from the index of referenced keys."""
+        key: Tuple = reference_index.choice(self._random)
+        referenced_columns = self._constraint.referenced_columns
+        return {
+            column.name: key[referenced_columns.index(ref_column)]
+            for column, ref_column in self._ref_column.items()
+        }
+
     def make_dict(self, generated_database: GeneratedDatabase) -> OutputDict:
         """Generate data for a foreign key.
 
         If there are no rows in the referenced table and all columns
         are nullable, we return None.
-        If there are some rows, we choose randomly.
+        If there are some rows, we choose randomly. The keys are taken
+        from the reference index if the database has one, from the rows otherwise.
         An error is raised in other cases.
         """
         if not self._constraint:
             raise GeneratorSettingError('Dangling FK generator', self._generator_setting)
 
-        row_count = generated_database.get_table_row_count(self._ref_table.name)
+        reference_index = generated_database.get_reference_index(self._constraint)
+        if reference_index is not None:
+            row_count = len(reference_index)
+        else:
+            row_count = generated_database.get_table_row_count(self._ref_table.name)
         if row_count == 0:
             if self._all_columns_nullable():
                 return self._none_dict()
@@ -143,6 +164,8 @@ class ForeignKeyGenerator(RegisteredGenerator, MultiColumnGenerator):
                 self._generator_setting
             )
 
+        if reference_index is not None:
+            return self._from_random_key(reference_index)
         rows = generated_database.get_table(self._ref_table.name)
         return self._from_random_row(rows)
 
@@ -152,7 +175,7 @@ class PrimaryKeyGenerator(RegisteredGenerator, SingleColumnGenerator[int]):
 
     The numbers are generated by an interactive driver.
     In case of a non-interactive driver, the IDs are assigned sequentially
-    starting from 1.
+    starting from 1. The shards of the table map their IDs by their shard positions.
     """
 
     supports_null = False
@@ -161,6 +184,8 @@ class PrimaryKeyGenerator(RegisteredGenerator, SingleColumnGenerator[int]):
     def __init__(self, generator_setting: GeneratorSetting):
         super().__init__(generator_setting)
         self._counter = 0
+        self._position: Optional[ShardPosition] = None
+        """Position of the current shard, None for the whole table."""
 
     @classmethod
     def is_recommended_for(cls, meta_column: MetaColumn) -> bool:
@@ -170,6 +195,12 @@ class PrimaryKeyGenerator(RegisteredGenerator, SingleColumnGenerator[int]):
                 return True
         return False
 
+    def start_shard(self, position: ShardPosition, table_seed: Optional[float]):
+        self._counter = 0
+        self._position = position
+
     def make_scalar(self, generated_database: GeneratedDatabase) -> int:
         self._counter += 1
-        return self._counter
+        if self._position is None:
+            return self._counter
+        return self._position.sequence_number(self._counter - 1) + 1
@@ -1,17 +1,35 @@
 import string
+from typing import Optional, Dict
 
+from core.model.generator_setting import GeneratorSetting
 from core.model.meta_column import MetaColumn
 from core.service.column_generator.base import RegisteredGenerator, SingleColumnGenerator
+from core.service.column_generator.basic_generator.permutation import FeistelPermutation
 from core.service.column_generator.decorator import parameter
 from core.service.data_source.data_provider import DataProvider
 from core.service.generation_procedure.database import GeneratedDatabase
+from core.service.generation_procedure.parallel import ShardPosition
 
 
 class StringGenerator(RegisteredGenerator, SingleColumnGenerator[str]):
     """Generate strings of ASCII letters of random length.
     The length is sampled uniformly from a closed interval.
+
+    In the unique mode, the strings of each length are drawn without replacement.
+    The n-th string of a length encodes the n-th element of a pseudorandom
+    permutation of all strings of that length, in base of the number of letters.
+    The permutations depend on the seed of the whole table, so that the shards
+    of the table draw disjoint strings. Exhausted lengths are skipped,
+    once all are exhausted, the strings are drawn randomly again.
     """
 
+    def __init__(self, generator_setting: GeneratorSetting):
+        super().__init__(generator_setting)
+        self._permutations: Optional[Dict[int, FeistelPermutation]] = None
+        self._counters: Dict[int, int] = {}
+        self._position: Optional[ShardPosition] = None
+        """Position of the current shard, None for the whole table."""
+
     @parameter(min_value=1)
     def min_length(self) -> int:
         return 1
@@ -20,9 +38,65 @@ class StringGenerator(RegisteredGenerator, SingleColumnGenerator[str]):
     def max_length(self) -> int:
         return 10
 
+    @parameter
+    def unique(self) -> bool:
+        return False
+
+    def seed(self, seed: Optional[float]):
+        super().seed(seed)
+        self.start_shard(None, seed)
+
+    def start_shard(self, position: Optional[ShardPosition], table_seed: Optional[float]):
+        self._permutations = None
+        if self.unique:
+            if table_seed is None:
+                table_seed = self._random.random()
+            letter_count = len(string.ascii_letters)
+            self._permutations = {
+                length: FeistelPermutation(
+                    letter_count ** length,
+                    '{}:{}:{}'.format(table_seed, self._meta_column.name, length)
+                )
+                for length in range(self.min_length, self.max_length + 1)
+            }
+        self._counters = {length: 0 for length in range(self.min_length, self.max_length + 1)}
+        self._position = position
+
+    def domain_size(self) -> Optional[int]:
+        letter_count = len(string.ascii_letters)
+        return sum(letter_count ** length for length in range(self.min_length, self.max_length + 1))
+
     def make_scalar(self, generated_database: GeneratedDatabase) -> str:
         length = self._random.randint(self.min_length, self.max_length)
-        return self._random_string_of_length(length)
+        if self._permutations is None:
+            return self._random_string_of_length(length)
+        if self._sequence_number(length) >= len(self._permutations[length]):
+            available = [
+                length
+                for length, permutation in self._permutations.items()
+                if self._sequence_number(length) < len(permutation)
+            ]
+            if not available:
+                return self._random_string_of_length(length)
+            length = self._random.choice(available)
+        index = self._permutations[length](self._sequence_number(length))
+        self._counters[length] += 1
+        return self._encode(index, length)
+
+    def _sequence_number(self, length: int) -> int:
+        """Return the index of the next string of the length in its permutation."""
+        if self._position is None:
+            return self._counters[length]
+        return self._position.sequence_number(self._counters[length])
+
+    @staticmethod
+    def _encode(index: int, length: int) -> str:
+        """Return the string of given length encoding the index in base of the number of letters."""
+        letters = []
+        for _ in range(length):
+            index, digit = divmod(index, len(string.ascii_letters))
+            letters.append(string.ascii_letters[digit])
+        return ''.join(letters)
 
     @classmethod
     def is_recommended_for(cls, meta_column: MetaColumn) -> bool:
@@ -35,12 +109,6 @@ class StringGenerator(RegisteredGenerator, SingleColumnGenerator[str]):
 
     def estimate_params(self, provider: DataProvider):
         super().estimate_params(provider)
-        min_len = None
-        max_len = None
-        for sample in provider.scalar_data_not_none():
-            if min_len is None or len(sample) < min_len:
-                min_len = len(sample)
-            if max_len is None or len(sample) > max_len:
-                max_len = len(sample)
-        self.min_length = min_len or 1
-        self.max_length = max_len or 10
+        min_length, max_length = provider.estimate_length_range()
+        self.min_length = min_length or 1
+        self.max_length = max_length or 10
@@ -0,0 +1,63 @@
+import random
+from abc import abstractmethod
+from typing import TypeVar, Generic, Optional, Any
+
+from core.model.generator_setting import GeneratorSetting
+from core.service.column_generator.base import SingleColumnGenerator, OutputBatch
+from core.service.generation_procedure.database import GeneratedDatabase
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+OutputType = TypeVar('OutputType')
+
+
+class VectorizedGenerator(Generic[OutputType], SingleColumnGenerator[OutputType]):
+    """Base generator with an optional NumPy backend for batch generation.
+
+    If NumPy is installed, batches of values and null masks are drawn
+    in bulk from a NumPy random generator, seeded by the same seed
+    as the generator itself. Otherwise, batches fall back to make_dict.
+    """
+
+    def __init__(self, generator_setting: GeneratorSetting):
+        super().__init__(generator_setting)
+        self._numpy_random: Optional[Any] = None
+
+    @staticmethod
+    def is_numpy_available() -> bool:
+        """Is the NumPy backend available?"""
+        return numpy is not None
+
+    def seed(self, seed: Optional[float]):
+        """Set random seed of both the Python and the NumPy random generator."""
+        super().seed(seed)
+        if numpy is None:
+            return
+        # NumPy accepts integer seeds only, derive one deterministically
+        numpy_seed = None if seed is None else random.Random(seed).getrandbits(64)
+        self._numpy_random = numpy.random.default_rng(numpy_seed)
+
+    @abstractmethod
+    def make_array(self, size: int) -> Any:
+        """Return a NumPy array of given size with generated values.
+
+        Only called when the NumPy backend is available.
+        """
+        pass
+
+    def _can_vectorize(self) -> bool:
+        """Can the current batch be generated by the NumPy backend?"""
+        return self._numpy_random is not None
+
+    def make_batch(self, size: int, generated_database: GeneratedDatabase) -> OutputBatch:
+        if not self._can_vectorize():
+            return super().make_batch(size, generated_database)
+        values = self.make_array(size).tolist()
+        if self.supports_null and self._null_frequency > 0:
+            null_mask = self._numpy_random.random(size) < self._null_frequency
+            for index in numpy.flatnonzero(null_mask).tolist():
+                values[index] = None
+        return {self._meta_column.name: values}
@@ -4,20 +4,31 @@ from faker import Faker
 
 from core.model.generator_setting import GeneratorSetting
 from core.service.column_generator.base import SingleColumnGenerator
+from core.service.column_generator.faker_generator.pool import FakerPool
 from core.service.generation_procedure.database import GeneratedDatabase
 
 OutputType = TypeVar('OutputType')
 
 
 class FakerGenerator(Generic[OutputType], SingleColumnGenerator[OutputType]):
-    """Base Faker generator. Adapts Faker generators to our generators."""
+    """Base Faker generator. Adapts Faker generators to our generators.
+
+    The Faker instance is taken from the pool, seeding the generator
+    gives it its own random state.
+    """
 
     provider: str
     """The name of the Faker provider."""
 
+    value_count: Optional[int] = None
+    """Number of distinct values of the Faker provider, if it is small and known."""
+
+    locale: Optional[str] = None
+    """Locale of the Faker instance, the default locale if None."""
+
     def __init__(self, generator_setting: GeneratorSetting):
         super().__init__(generator_setting)
-        self._fake: Faker = Faker()
+        self._fake: Faker = FakerPool.acquire(self, self.locale)
         self._functor = getattr(self._fake, self.provider)
 
     def seed(self, seed: Optional[float]):
@@ -25,6 +36,9 @@ class FakerGenerator(Generic[OutputType], SingleColumnGenerator[OutputType]):
         super().seed(seed)
         self._fake.seed_instance(seed)
 
+    def domain_size(self) -> Optional[int]:
+        return self.value_count
+
     def make_scalar(self, generated_database: GeneratedDatabase) -> OutputType:
         """Call the Faker generator instance."""
         return self._functor()
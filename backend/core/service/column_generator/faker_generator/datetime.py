@@ -93,22 +93,26 @@ class TimeStringGenerator(RegisteredGenerator, FakerDateTimeStringGenerator):
 
 class DayOfMonthGenerator(RegisteredGenerator, FakerDateTimeStringGenerator):
     provider = 'day_of_month'
+    value_count = 31
 
 
 class DayOfWeekGenerator(RegisteredGenerator, FakerDateTimeStringGenerator):
     """Generate English names of the days of the week."""
 
     provider = 'day_of_week'
+    value_count = 7
 
 
 class MonthGenerator(RegisteredGenerator, FakerDateTimeStringGenerator):
     provider = 'month'
+    value_count = 12
 
 
 class MonthNameGenerator(RegisteredGenerator, FakerDateTimeStringGenerator):
     """Generate English names of the month."""
 
     provider = 'month_name'
+    value_count = 12
 
 
 class TimeZoneGenerator(RegisteredGenerator, FakerDateTimeStringGenerator):
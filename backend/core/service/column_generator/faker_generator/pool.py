@@ -0,0 +1,57 @@
+import threading
+import weakref
+from typing import Optional, Dict, List
+
+from faker import Faker
+
+
+class FakerPool:
+    """Pool of Faker instances by locale, shared by all threads of the process.
+
+    Creating a Faker instance loads the providers of its locale,
+    which takes milliseconds. The pool hands out an instance to a single owner
+    at a time, and takes it back once the owner is garbage collected,
+    so that the next owner reuses it, whichever thread it runs in.
+    A reused instance gets a fresh random state, each owner should
+    still seed the instance with seed_instance.
+    """
+
+    max_free_count = 8
+    """Maximum number of free instances kept for each locale."""
+
+    _free_instances: Dict[Optional[str], List[Faker]] = {}
+    """Free instances by locale."""
+
+    _lock = threading.RLock()
+    """Guards the free instances. Reentrant, since the garbage collector may release
+    an instance in the thread holding the lock."""
+
+    @classmethod
+    def acquire(cls, owner: object, locale: Optional[str] = None) -> Faker:
+        """Return a Faker instance of the locale, the default locale if None,
+        held by the owner until it is garbage collected.
+        """
+        with cls._lock:
+            free_instances = cls._free_instances.get(locale)
+            fake = free_instances.pop() if free_instances else None
+        if fake is None:
+            fake = Faker(locale)
+        else:
+            fake.unique.clear()
+            fake.seed_instance()
+        weakref.finalize(owner, cls._release, locale, fake)
+        return fake
+
+    @classmethod
+    def free_count(cls, locale: Optional[str] = None) -> int:
+        """Return the number of free instances of the locale."""
+        with cls._lock:
+            return len(cls._free_instances.get(locale, []))
+
+    @classmethod
+    def _release(cls, locale: Optional[str], fake: Faker):
+        """Take back the instance of a garbage collected owner, unless the pool of the locale is full."""
+        with cls._lock:
+            free_instances = cls._free_instances.setdefault(locale, [])
+            if len(free_instances) < cls.max_free_count:
+                free_instances.append(fake)
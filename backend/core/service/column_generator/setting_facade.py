@@ -1,12 +1,13 @@
 from __future__ import annotations
 
-from typing import List, Type
+from typing import List, Type, Optional
 
 from core.model.generator_setting import GeneratorSetting
 from core.model.meta_column import MetaColumn
 from core.service.column_generator.base import ColumnGenerator, RegisteredGenerator
 
 from core.service.data_source.data_provider import DataProviderFactory
+from core.service.data_source.data_provider.profile import EstimateAccuracy
 from core.service.injector import Injector
 
 GeneratorList = List[ColumnGenerator]
@@ -43,27 +44,31 @@ class GeneratorSettingFacade:
         factory = RegisteredGenerator.get_by_name(self._generator_setting.name)
         return factory(self._generator_setting)
 
-    def maybe_estimate_params(self, injector: Injector):
+    def maybe_estimate_params(self, injector: Injector) -> Optional[EstimateAccuracy]:
         """Estimate the generator setting params in case a data source is available.
 
         The generator parameters are normalized and saved in either case.
+        Return the accuracy of the estimates, None if they were not estimated
+        or they are exact.
         """
         gen_instance = self.make_generator_instance()
         if not self._has_data_source():
             gen_instance.save_params()
-            return
-        self.estimate_params(gen_instance, injector)
+            return None
+        return self.estimate_params(gen_instance, injector)
 
-    def estimate_params(self, gen_instance: ColumnGenerator, injector: Injector):
+    def estimate_params(self, gen_instance: ColumnGenerator, injector: Injector) -> Optional[EstimateAccuracy]:
         """Estimate parameters for the generator instance.
 
         The estimated parameters are normalized and saved to the generator setting
-        instance.
+        instance. Return the accuracy of the estimates computed from a sample,
+        None if no estimate was computed from a sample.
         """
         factory = DataProviderFactory(self._generator_setting.columns, injector)
         provider = factory.find_provider()
         gen_instance.estimate_params(provider)
         gen_instance.save_params()
+        return provider.estimate_accuracy()
 
     def _has_data_source(self) -> bool:
         """Return whether any of the assigned column has a data source defined."""
@@ -0,0 +1,156 @@
+import csv
+import json
+import mmap
+import os
+import shutil
+from array import array
+from typing import Iterable, Dict, Any, Iterator, List, Optional, IO
+
+
+class CsvColumnCache:
+    """Columnar cache of a CSV file, stored in a directory next to the file.
+
+    Each column is stored in its own file, so that reading a column costs
+    O(column) instead of O(file). Columns of floats only are stored
+    as 64-bit floats and memory-mapped on read, other columns are stored
+    as JSON lines. The manifest records the modification time and size
+    of the CSV file, the cache is used only if they match.
+    """
+
+    directory_suffix = '.columns'
+    """Suffix appended to the CSV file path to get the cache directory."""
+
+    manifest_name = 'manifest.json'
+    """Name of the manifest file in the cache directory."""
+
+    def __init__(self, file_path: str):
+        self._file_path = file_path
+        self._directory = file_path + self.directory_suffix
+        self._manifest: Optional[dict] = None
+
+    def _source_version(self) -> List[int]:
+        """Return the modification time and the size of the CSV file."""
+        stat = os.stat(self._file_path)
+        return [stat.st_mtime_ns, stat.st_size]
+
+    def _read_manifest(self) -> Optional[dict]:
+        """Return the manifest, or None if it is missing or stale."""
+        if self._manifest is None:
+            try:
+                with open(os.path.join(self._directory, self.manifest_name)) as file:
+                    self._manifest = json.load(file)
+            except (OSError, ValueError):
+                return None
+        if self._manifest.get('source') != self._source_version():
+            return None
+        return self._manifest
+
+    def is_fresh(self) -> bool:
+        """Does the cache exist and match the current CSV file?"""
+        return self._read_manifest() is not None
+
+    def has_column(self, column_name: str) -> bool:
+        """Is the column available in a fresh cache?"""
+        manifest = self._read_manifest()
+        return manifest is not None and column_name in manifest['columns']
+
+    def build(self, field_names: List[str], rows: Iterable[Dict[str, Any]]):
+        """Write the cache from the rows of the CSV file, replacing the old one.
+
+        The rows are consumed even if the cache cannot be written.
+        Errors raised by the rows themselves are propagated.
+        The temporary directory is removed in any case.
+        """
+        temp_directory = self._directory + '.tmp'
+        try:
+            shutil.rmtree(temp_directory, ignore_errors=True)
+            os.mkdir(temp_directory)
+            manifest = self._write_columns(temp_directory, field_names, rows)
+            with open(os.path.join(temp_directory, self.manifest_name), 'w') as file:
+                json.dump(manifest, file)
+            self.remove()
+            os.rename(temp_directory, self._directory)
+        except OSError:
+            for _ in rows:
+                pass
+        finally:
+            shutil.rmtree(temp_directory, ignore_errors=True)
+            self._manifest = None
+
+    def build_from_file(self):
+        """Read the CSV file and write the cache."""
+        with open(self._file_path) as file:
+            reader = csv.DictReader(file, quoting=csv.QUOTE_NONNUMERIC)
+            self.build(reader.fieldnames or [], reader)
+
+    def _write_columns(self, directory: str, field_names: List[str], rows: Iterable[Dict[str, Any]]) -> dict:
+        """Write each column as JSON lines, convert the float columns to binary.
+        Return the manifest.
+        """
+        source = self._source_version()
+        files: List[IO[str]] = []
+        all_floats = [True] * len(field_names)
+        row_count = 0
+        try:
+            for index in range(len(field_names)):
+                files.append(open(os.path.join(directory, 'c{}.jsonl'.format(index)), 'w'))
+            for row in rows:
+                row_count += 1
+                for index, name in enumerate(field_names):
+                    value = row.get(name)
+                    if type(value) is not float:
+                        all_floats[index] = False
+                    files[index].write(json.dumps(value))
+                    files[index].write('\n')
+        finally:
+            for file in files:
+                file.close()
+        columns = {}
+        for index, name in enumerate(field_names):
+            file_name = 'c{}.jsonl'.format(index)
+            if all_floats[index]:
+                file_name = self._convert_to_floats(directory, file_name, index)
+            columns[name] = file_name
+        return {'source': source, 'row_count': row_count, 'columns': columns}
+
+    @staticmethod
+    def _convert_to_floats(directory: str, file_name: str, index: int) -> str:
+        """Convert a column of JSON lines to a binary column of 64-bit floats.
+        Return the new file name.
+        """
+        float_file_name = 'c{}.f64'.format(index)
+        buffer = array('d')
+        with open(os.path.join(directory, file_name)) as json_file, \
+                open(os.path.join(directory, float_file_name), 'wb') as float_file:
+            for line in json_file:
+                buffer.append(json.loads(line))
+                if len(buffer) >= 64 * 1024:
+                    buffer.tofile(float_file)
+                    del buffer[:]
+            buffer.tofile(float_file)
+        os.remove(os.path.join(directory, file_name))
+        return float_file_name
+
+    def iter_column(self, column_name: str) -> Iterator[Any]:
+        """Yield the values of a column from a fresh cache."""
+        manifest = self._read_manifest()
+        file_path = os.path.join(self._directory, manifest['columns'][column_name])
+        if file_path.endswith('.jsonl'):
+            with open(file_path) as file:
+                for line in file:
+                    yield json.loads(line)
+            return
+        if manifest['row_count'] == 0:
+            return
+        with open(file_path, 'rb') as file, \
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped).cast('d')
+            try:
+                yield from view
+            finally:
+                view.release()
+
+    def remove(self):
+        """Remove the cache directory, if it exists."""
+        shutil.rmtree(self._directory, ignore_errors=True)
+        self._manifest = None
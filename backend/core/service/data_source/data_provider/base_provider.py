@@ -2,9 +2,11 @@ from abc import ABC, abstractmethod
 from functools import reduce
 from itertools import islice
 
-from typing import Iterator, Callable, Any, Tuple, Optional
+from typing import Iterator, Callable, Any, Tuple, Optional, List
 
 from core.model.data_source import DataSource
+from core.service.data_source.data_provider.profile import ColumnProfile, EstimateAccuracy
+from core.service.data_source.data_provider.sampling import EstimationBudget, Sample, reservoir_sample
 from core.service.data_source.identifier import Identifiers
 from core.service.injector import Injector
 
@@ -12,12 +14,20 @@ DEFAULT_ROW_LIMIT = 100
 
 
 class DataProvider(ABC):
-    """Provide data from a data source."""
+    """Provide data from a data source.
+
+    The estimates are based on a column profile, computed once per provider
+    from a sample of the scalar data. The sample size and the time spent
+    reading the data source are limited by the estimation budget.
+    The counts are scaled from the sample to the whole data source.
+    """
 
     def __init__(self, data_source: DataSource, identifiers: Identifiers, injector: Injector):
         self._data_source = data_source
         self._identifiers = identifiers
         self._injector = injector
+        self._sample: Optional[Sample] = None
+        self._profile: Optional[ColumnProfile] = None
 
     @abstractmethod
     def scalar_data(self) -> Iterator[Any]:
@@ -59,63 +69,89 @@ class DataProvider(ABC):
             initial
         )
 
+    def sample(self) -> Sample:
+        """Return a sample of the scalar data.
+
+        The sample is drawn on the first call and served to every later call.
+        """
+        if self._sample is None:
+            self._sample = self._draw_sample(self._injector.get(EstimationBudget))
+        return self._sample
+
+    def _draw_sample(self, budget: EstimationBudget) -> Sample:
+        """Draw a sample of the scalar data within the budget."""
+        return reservoir_sample(self.scalar_data(), budget)
+
+    def profile(self) -> ColumnProfile:
+        """Return the profile of the sampled scalar data.
+
+        The profile is computed in a single pass on the first call
+        and served to every later call.
+        """
+        if self._profile is None:
+            self._profile = ColumnProfile.from_sample(self.sample())
+        return self._profile
+
     def estimate_min(self):
         """Return minimum scalar value or None in case there are no values."""
-        def safe_min(seq, elem):
-            if seq is None:
-                return elem
-            return min(seq, elem)
-        return self.reduce_not_none(safe_min, None)
+        return self.profile().min
 
     def estimate_max(self):
         """Return maximum scalar value or None in case there are no values."""
-        def safe_max(seq, elem):
-            if seq is None:
-                return elem
-            return max(seq, elem)
-        return self.reduce_not_none(safe_max, None)
+        return self.profile().max
 
     def get_count(self) -> int:
-        """Return number of scalar entries."""
-        return self.reduce(lambda x, _: x + 1, 0)
+        """Return number of scalar entries, or the sample size if it is unknown."""
+        profile = self.profile()
+        if profile.population_count is None:
+            return profile.count
+        return profile.population_count
 
-    def get_null_count(self):
+    def get_null_count(self) -> int:
         """Return number of None scalar entries."""
-        def count_nulls(seq, elem):
-            if elem is None:
-                return seq + 1
-            return seq
-        return self.reduce(count_nulls, 0)
+        profile = self.profile()
+        return profile.scale(profile.null_count)
 
     def estimate_null_frequency(self) -> Optional[float]:
         """Return frequency of None values in scalar entries or None."""
-        count = self.get_count()
-        if count == 0:
-            return None
-        nulls = self.get_null_count()
-        return nulls / count
+        return self.profile().null_frequency
 
     def estimate_mean(self) -> Optional[float]:
         """Return mean scalar value or None."""
-        sample_sum = 0
-        count = 0
-        for sample in self.scalar_data_not_none():
-            count += 1
-            sample_sum += sample
-        if count == 0:
-            return None
-        return sample_sum / count
+        return self.profile().mean
 
     def estimate_variance(self) -> Optional[float]:
         """Return an estimate of scalar values or None."""
-        sample_sum = 0
-        square_sum = 0
-        count = 0
-        for sample in self.scalar_data_not_none():
-            count += 1
-            sample_sum += sample
-            square_sum += sample ** 2
-        if count == 0:
+        return self.profile().variance
+
+    def get_not_null_count(self) -> int:
+        """Return number of non-null scalar entries."""
+        profile = self.profile()
+        return profile.scale(profile.not_null_count)
+
+    def get_true_count(self) -> int:
+        """Return number of non-null scalar entries evaluating to True."""
+        profile = self.profile()
+        return profile.scale(profile.true_count)
+
+    def estimate_length_range(self) -> Tuple[Optional[int], Optional[int]]:
+        """Return minimum and maximum length of string scalar values,
+        or Nones in case there are no strings.
+        """
+        profile = self.profile()
+        return profile.min_length, profile.max_length
+
+    def top_values(self, k: int) -> List[Tuple[Any, int]]:
+        """Return at most k most common non-null scalar values with their counts,
+        most common first.
+        """
+        profile = self.profile()
+        return [(value, profile.scale(count)) for value, count in profile.top_values(k)]
+
+    def estimate_accuracy(self) -> Optional[EstimateAccuracy]:
+        """Return the accuracy of the estimates computed so far from the sample,
+        None if no estimate was computed from the sample.
+        """
+        if self._profile is None:
             return None
-        mean = sample_sum / count
-        return max(square_sum - mean, 0)
+        return self._profile.accuracy()
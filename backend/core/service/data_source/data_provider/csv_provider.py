@@ -1,21 +1,32 @@
 import csv
 from typing import Iterator, Tuple, Any
 
+from core.service.data_source.csv_common import CsvColumnCache
 from core.service.data_source.data_provider.base_provider import DataProvider
 
 
 class CsvDataProvider(DataProvider):
-    """Provide data from a CSV file."""
+    """Provide data from a CSV file.
 
-    def scalar_data(self) -> Iterator[Any]:
-        idf = self._identifiers[0]
+    The columns are read from the columnar cache of the file,
+    which is built on first use. The file is parsed as a fallback.
+    """
+
+    def _column_data(self, column_name: str) -> Iterator[Any]:
+        """Yield the values of a column."""
+        cache = CsvColumnCache(self._data_source.file_path)
+        if not cache.is_fresh():
+            cache.build_from_file()
+        if cache.has_column(column_name):
+            yield from cache.iter_column(column_name)
+            return
         with open(self._data_source.file_path) as file:
             reader = csv.DictReader(file, quoting=csv.QUOTE_NONNUMERIC)
             for row in reader:
-                yield row[idf.column]
+                yield row[column_name]
+
+    def scalar_data(self) -> Iterator[Any]:
+        yield from self._column_data(self._identifiers[0].column)
 
     def vector_data(self) -> Iterator[Tuple]:
-        with open(self._data_source.file_path) as file:
-            reader = csv.DictReader(file, quoting=csv.QUOTE_NONNUMERIC)
-            for row in reader:
-                yield (row[idf.column] for idf in self._identifiers)
+        yield from zip(*(self._column_data(idf.column) for idf in self._identifiers))
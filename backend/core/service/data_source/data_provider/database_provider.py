@@ -1,17 +1,36 @@
-from typing import Iterator, Tuple, Any, Optional
+import math
+from typing import Iterator, Tuple, Any, Optional, Dict, List
 
-from sqlalchemy import MetaData, select, Column, func
+from sqlalchemy import select, Column, func, tablesample, literal, String, Boolean, true, desc, Integer, Numeric
 from sqlalchemy.engine import Connection
 from sqlalchemy.exc import SQLAlchemyError
 
 from core.service.data_source.data_provider.base_provider import DataProvider
-from core.service.data_source.database_common import DatabaseConnectionManager
+from core.service.data_source.data_provider.sampling import EstimationBudget, Sample, reservoir_sample
+from core.model.data_source import DataSource
+from core.service.data_source.database_common import DatabaseConnectionManager, DatabaseReflectionCache
 from core.service.data_source.identifier import Identifiers, Identifier
-from core.service.exception import DataSourceIdentifierError, DatabaseNotReadable, FatalDatabaseError
+from core.service.exception import DataSourceIdentifierError, FatalDatabaseError
+from core.service.injector import Injector
 
 
 class DatabaseDataProvider(DataProvider):
-    """Provide data from a database."""
+    """Provide data from a database.
+
+    The tables are reflected through the shared reflection cache,
+    the resolved columns are kept by the provider.
+
+    Tables larger than the estimation budget are sampled by the database,
+    by TABLESAMPLE on PostgreSQL and by reading blocks of rows at random
+    offsets elsewhere.
+    """
+
+    sample_block_size = 100
+    """Number of rows read by a single random offset query."""
+
+    def __init__(self, data_source: DataSource, identifiers: Identifiers, injector: Injector):
+        super().__init__(data_source, identifiers, injector)
+        self._columns: Dict[Tuple[str, str], Column] = {}
 
     def scalar_data(self) -> Iterator[Any]:
         idf = self._identifiers[0]
@@ -47,21 +66,58 @@ class DatabaseDataProvider(DataProvider):
         for row in self._safe_exec(select(columns)):
             yield row
 
+    def _draw_sample(self, budget: EstimationBudget) -> Sample:
+        column = self._first_column
+        count = self._safe_exec(select([func.count()]).select_from(column.table)).scalar()
+        if count <= budget.max_rows:
+            return reservoir_sample(self.scalar_data(), budget, count)
+        if self._conn.dialect.name == 'postgresql':
+            return self._draw_table_sample(budget, count)
+        return self._draw_block_sample(budget, count)
+
+    def _draw_table_sample(self, budget: EstimationBudget, count: int) -> Sample:
+        """Sample the rows by the database, cut the sample down to the budget."""
+        column = self._first_column
+        # oversample slightly, so that the sample is rarely smaller than the budget
+        percent = min(100., 110. * budget.max_rows / count)
+        sampled = tablesample(column.table, func.bernoulli(percent), seed=literal(budget.seed))
+        values = (row[0] for row in self._safe_exec(select([sampled.c[column.name]])))
+        return reservoir_sample(values, budget, count)
+
+    def _draw_block_sample(self, budget: EstimationBudget, count: int) -> Sample:
+        """Read blocks of rows at random offsets until the budget is exhausted.
+
+        The rows are ordered by the primary key, or by the column
+        if the table has none, so that the blocks are stable.
+        """
+        column = self._first_column
+        block_count = math.ceil(budget.max_rows / self.sample_block_size)
+        all_blocks = math.ceil(count / self.sample_block_size)
+        blocks = sorted(budget.make_random().sample(range(all_blocks), min(block_count, all_blocks)))
+        order_columns = list(column.table.primary_key.columns) or [column]
+        query = select([column]).order_by(*order_columns).limit(self.sample_block_size)
+        deadline = budget.make_deadline()
+        values = []
+        for block in blocks:
+            if budget.is_past(deadline):
+                break
+            rows = self._safe_exec(query.offset(block * self.sample_block_size))
+            values.extend(row[0] for row in rows)
+        return Sample(values[:budget.max_rows], count)
+
     def _get_column(self, idf: Identifier) -> Column:
         """Convert identifier to a column bound to a database connection."""
-        conn_manager = self._injector.get(DatabaseConnectionManager)
-        engine = conn_manager.get_engine(self._data_source)
-        meta = MetaData()
-        try:
-            meta.reflect(bind=engine)
-        except SQLAlchemyError:
-            raise DatabaseNotReadable(self._data_source)
-        if idf.table not in meta.tables:
+        key = (idf.table, idf.column)
+        if key in self._columns:
+            return self._columns[key]
+        reflection_cache = self._injector.get(DatabaseReflectionCache)
+        table = reflection_cache.get_table(self._data_source, idf.table)
+        if table is None:
             raise DataSourceIdentifierError('Table not found', self._data_source, repr(idf))
-        table = meta.tables[idf.table]
         if idf.column not in table.columns:
             raise DataSourceIdentifierError('Column not found', self._data_source, repr(idf))
-        return table.columns[idf.column]
+        self._columns[key] = table.columns[idf.column]
+        return self._columns[key]
 
     def scalar_data_not_none(self) -> Iterator[Any]:
         column = self._first_column
@@ -112,3 +168,50 @@ class DatabaseDataProvider(DataProvider):
         if avg is None:
             return None
         return max(square_avg - avg ** 2, 0)
+
+    def get_true_count(self) -> int:
+        """Return number of non-null values evaluating to True in the whole table.
+
+        Values of other than boolean, numeric and string types are counted
+        in the sample, the count is scaled to the whole table, so that it stays
+        comparable with the not null count.
+        """
+        column = self._first_column
+        if isinstance(column.type, Boolean):
+            condition = column == true()
+        elif isinstance(column.type, (Integer, Numeric)):
+            condition = column != 0
+        elif isinstance(column.type, String):
+            condition = func.length(column) > 0
+        else:
+            return self._scaled_true_count()
+        query = select([func.count()]).where(condition)
+        return self._safe_exec(query).scalar()
+
+    def _scaled_true_count(self) -> int:
+        """Return the true count of the sample, scaled to the not null count of the table."""
+        profile = self.profile()
+        if profile.not_null_count == 0:
+            return 0
+        return round(profile.true_count * self.get_not_null_count() / profile.not_null_count)
+
+    def estimate_length_range(self) -> Tuple[Optional[int], Optional[int]]:
+        column = self._first_column
+        if not isinstance(column.type, String):
+            return None, None
+        query = select([
+            func.min(func.length(column)),
+            func.max(func.length(column))
+        ])
+        min_length, max_length = self._safe_exec(query).fetchone()
+        return min_length, max_length
+
+    def top_values(self, k: int) -> List[Tuple[Any, int]]:
+        column = self._first_column
+        count = func.count().label('value_count')
+        query = select([column, count])\
+            .where(column.isnot(None))\
+            .group_by(column)\
+            .order_by(desc(count), column)\
+            .limit(k)
+        return [(row[0], row[1]) for row in self._safe_exec(query)]
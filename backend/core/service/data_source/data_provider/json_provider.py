@@ -1,43 +1,63 @@
-import json
 from typing import Iterator, Tuple, Any
 
 from core.service.data_source.data_provider.base_provider import DataProvider
 from core.service.data_source.identifier import Identifier
+from core.service.data_source.json_common import JsonDocumentCache
 from core.service.exception import DataSourceIdentifierError, DataSourceError
 
 
 class JsonDataProvider(DataProvider):
-    """Provide data from a JSON data source."""
+    """Provide data from a JSON data source.
+
+    The parsed document is shared through the JSON document cache.
+    Large files are streamed row by row instead.
+    """
 
     def scalar_data(self) -> Iterator[Any]:
         idf = self._identifiers[0]
-        json_obj = self._parse_json()
-        return self._yield_column(json_obj, idf)
+        return self._yield_column(idf)
 
     def vector_data(self) -> Iterator[Tuple]:
-        json_obj = self._parse_json()
         scalars = (
-            self._yield_column(json_obj, idf)
+            self._yield_column(idf)
             for idf in self._identifiers
         )
-        return zip(scalars)
+        return zip(*scalars)
 
-    def _parse_json(self) -> Any:
-        """Open and parse the file, return python object."""
-        with open(self._data_source.file_path) as file:
-            return json.load(file)
+    def _yield_rows(self, table_name: str) -> Iterator[Any]:
+        """Yield the rows of a table by name.
 
-    def _yield_column(self, json_obj: Any, idf: Identifier) -> Iterator[Any]:
-        """Yield a column from python object by identifier."""
+        If the document is a single table, its rows are yielded regardless of the name.
+        """
+        cache = self._injector.get(JsonDocumentCache)
+        file_path = self._data_source.file_path
+        try:
+            if cache.should_stream(file_path):
+                yield from self._stream_rows(cache, table_name)
+                return
+            json_obj = cache.get(file_path)
+        except ValueError:
+            raise DataSourceError('malformed json data source', self._data_source)
         if isinstance(json_obj, dict):
-            if idf.table not in json_obj:
-                raise DataSourceIdentifierError('table not found', self._data_source, repr(idf))
-            table = json_obj[idf.table]
+            if table_name not in json_obj:
+                raise DataSourceIdentifierError('table not found', self._data_source, table_name)
+            yield from json_obj[table_name]
         else:
             if not isinstance(json_obj, list):
                 raise DataSourceError('malformed json data source', self._data_source)
-            table = json_obj
-        for row in table:
+            yield from json_obj
+
+    def _stream_rows(self, cache: JsonDocumentCache, table_name: str) -> Iterator[Any]:
+        """Yield the rows of a table by name, streamed from the file."""
+        for name, rows in cache.iter_tables(self._data_source.file_path):
+            if name is None or name == table_name:
+                yield from rows
+                return
+        raise DataSourceIdentifierError('table not found', self._data_source, table_name)
+
+    def _yield_column(self, idf: Identifier) -> Iterator[Any]:
+        """Yield a column by identifier."""
+        for row in self._yield_rows(idf.table):
             if idf.column not in row:
                 raise DataSourceIdentifierError('column not found', self._data_source, repr(idf))
             yield row[idf.column]
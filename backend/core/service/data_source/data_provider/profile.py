@@ -0,0 +1,221 @@
+import math
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Optional, Iterable, List, Tuple
+
+from core.service.data_source.data_provider.sampling import Sample
+
+
+@dataclass
+class EstimateAccuracy:
+    """Accuracy of the estimates computed from a sample."""
+
+    is_exact: bool
+    """Does the sample cover the whole data source?"""
+
+    sample_count: int
+    """Number of sampled values."""
+
+    population_count: Optional[int]
+    """Number of values in the data source, None if it is unknown."""
+
+    mean_standard_error: Optional[float]
+    """Standard error of the mean estimate, None if there are no numeric values."""
+
+    null_frequency_standard_error: Optional[float]
+    """Standard error of the null frequency estimate, None if there are no values."""
+
+
+class ColumnProfile:
+    """Statistics of scalar column data, computed in a single pass.
+
+    The mean and the variance of numeric values are updated by Welford's
+    algorithm. Length statistics are collected for string values.
+    Distinct values are counted exactly up to the distinct limit. Beyond it,
+    the value counts are approximated by the Misra-Gries summary, which
+    still finds every value more frequent than count / distinct limit.
+
+    A profile computed from a sample reports the standard errors
+    of its estimates, relative to the whole data source, and scales
+    its counts to the whole data source.
+    """
+
+    distinct_limit = 1000
+    """How many distinct values are counted at most."""
+
+    def __init__(self):
+        self.count = 0
+        """Number of all values."""
+        self.null_count = 0
+        """Number of None values."""
+        self.min: Any = None
+        """Minimum non-null value or None."""
+        self.max: Any = None
+        """Maximum non-null value or None."""
+        self.true_count = 0
+        """Number of non-null values evaluating to True."""
+        self.numeric_count = 0
+        """Number of numeric values."""
+        self._mean = 0.
+        self._m2 = 0.
+        self.string_count = 0
+        """Number of string values."""
+        self.min_length: Optional[int] = None
+        """Minimum length of a string value or None."""
+        self.max_length: Optional[int] = None
+        """Maximum length of a string value or None."""
+        self._length_sum = 0
+        self._value_counts: Counter = Counter()
+        self._distinct_exceeded = False
+        self.population_count: Optional[int] = None
+        """Number of values in the data source, None if it is unknown."""
+
+    @classmethod
+    def from_values(cls, values: Iterable[Any]) -> 'ColumnProfile':
+        """Create the profile of the values."""
+        profile = cls()
+        for value in values:
+            profile.add(value)
+        return profile
+
+    @classmethod
+    def from_sample(cls, sample: Sample) -> 'ColumnProfile':
+        """Create the profile of the sampled values."""
+        profile = cls.from_values(sample.values)
+        profile.population_count = sample.population_count
+        return profile
+
+    def add(self, value: Any):
+        """Update the statistics by a value."""
+        self.count += 1
+        if value is None:
+            self.null_count += 1
+            return
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        if value:
+            self.true_count += 1
+        if isinstance(value, (int, float)):
+            self.numeric_count += 1
+            delta = value - self._mean
+            self._mean += delta / self.numeric_count
+            self._m2 += delta * (value - self._mean)
+        elif isinstance(value, str):
+            self._add_length(len(value))
+        self._add_distinct(value)
+
+    def _add_length(self, length: int):
+        """Update the length statistics by the length of a string value."""
+        self.string_count += 1
+        self._length_sum += length
+        if self.min_length is None or length < self.min_length:
+            self.min_length = length
+        if self.max_length is None or length > self.max_length:
+            self.max_length = length
+
+    def _add_distinct(self, value: Any):
+        """Count the value, decrement all counts if the limit is exceeded."""
+        if value in self._value_counts or len(self._value_counts) < self.distinct_limit:
+            self._value_counts[value] += 1
+            return
+        self._distinct_exceeded = True
+        for counted in list(self._value_counts):
+            self._value_counts[counted] -= 1
+            if self._value_counts[counted] <= 0:
+                del self._value_counts[counted]
+
+    @property
+    def not_null_count(self) -> int:
+        """Number of non-null values."""
+        return self.count - self.null_count
+
+    @property
+    def null_frequency(self) -> Optional[float]:
+        """Frequency of None values or None if there are no values."""
+        if self.count == 0:
+            return None
+        return self.null_count / self.count
+
+    @property
+    def mean(self) -> Optional[float]:
+        """Mean of the numeric values or None."""
+        if self.numeric_count == 0:
+            return None
+        return self._mean
+
+    @property
+    def variance(self) -> Optional[float]:
+        """Population variance of the numeric values or None."""
+        if self.numeric_count == 0:
+            return None
+        return self._m2 / self.numeric_count
+
+    @property
+    def mean_length(self) -> Optional[float]:
+        """Mean length of the string values or None."""
+        if self.string_count == 0:
+            return None
+        return self._length_sum / self.string_count
+
+    @property
+    def distinct_count(self) -> Optional[int]:
+        """Number of distinct non-null values, None if it exceeds the limit."""
+        if self._distinct_exceeded:
+            return None
+        return len(self._value_counts)
+
+    def top_values(self, k: int) -> List[Tuple[Any, int]]:
+        """Return at most k most common non-null values with their counts.
+
+        The counts are lower bounds if the distinct limit is exceeded.
+        """
+        return self._value_counts.most_common(k)
+
+    @property
+    def is_exact(self) -> bool:
+        """Does the profile cover the whole data source?"""
+        return self.population_count == self.count
+
+    def _correction(self, sample_count: int) -> float:
+        """Return the finite population correction factor of a sample."""
+        if self.population_count is None or self.population_count <= 1:
+            return 1.
+        remaining = max(self.population_count - sample_count, 0)
+        return math.sqrt(remaining / (self.population_count - 1))
+
+    @property
+    def mean_standard_error(self) -> Optional[float]:
+        """Standard error of the mean estimate or None."""
+        if self.numeric_count == 0:
+            return None
+        if self.is_exact:
+            return 0.
+        return math.sqrt(self.variance / self.numeric_count) * self._correction(self.count)
+
+    @property
+    def null_frequency_standard_error(self) -> Optional[float]:
+        """Standard error of the null frequency estimate or None."""
+        frequency = self.null_frequency
+        if frequency is None:
+            return None
+        if self.is_exact:
+            return 0.
+        return math.sqrt(frequency * (1 - frequency) / self.count) * self._correction(self.count)
+
+    def scale(self, count: int) -> int:
+        """Scale a count of sampled values to the whole data source."""
+        if self.population_count is None or self.count == 0 or self.is_exact:
+            return count
+        return round(count * self.population_count / self.count)
+
+    def accuracy(self) -> EstimateAccuracy:
+        """Return the accuracy of the estimates."""
+        return EstimateAccuracy(
+            is_exact=self.is_exact,
+            sample_count=self.count,
+            population_count=self.population_count,
+            mean_standard_error=self.mean_standard_error,
+            null_frequency_standard_error=self.null_frequency_standard_error
+        )
@@ -0,0 +1,106 @@
+import random
+import time
+from dataclasses import dataclass
+from typing import List, Any, Optional, Iterable
+
+
+class EstimationBudget:
+    """Limits on the work spent by a single estimation.
+
+    The estimates are computed from a sample of at most max_rows values.
+    The sample is deterministic given the seed. Optionally, reading
+    of the source stops after max_seconds, checked every checkpoint_rows
+    read rows; the sample then covers only the rows read so far,
+    and depends on the speed of the source.
+
+    The injector constructs the default budget, a configured budget
+    should be provided to the injector.
+    """
+
+    max_rows = 10000
+    """Maximum size of the sample."""
+
+    max_seconds: Optional[float] = None
+    """Maximum time spent reading the data source, None means no limit."""
+
+    seed = 0
+    """Seed of the sampling random generator."""
+
+    checkpoint_rows = 1024
+    """Number of read rows between the checks of the time limit."""
+
+    def __init__(self):
+        # the injector constructs the budget without arguments
+        pass
+
+    @classmethod
+    def configured(cls,
+                   max_rows: Optional[int] = None,
+                   max_seconds: Optional[float] = None,
+                   seed: Optional[int] = None) -> 'EstimationBudget':
+        """Return a budget with the given limits, the missing ones are the defaults."""
+        budget = cls()
+        if max_rows is not None:
+            budget.max_rows = max_rows
+        budget.max_seconds = max_seconds
+        if seed is not None:
+            budget.seed = seed
+        return budget
+
+    def make_random(self) -> random.Random:
+        """Return a new random generator seeded by the budget seed."""
+        return random.Random(self.seed)
+
+    def make_deadline(self) -> Optional[float]:
+        """Return the monotonic time at which the sampling should stop,
+        None if the time is not limited.
+        """
+        if self.max_seconds is None:
+            return None
+        return time.monotonic() + self.max_seconds
+
+    @staticmethod
+    def is_past(deadline: Optional[float]) -> bool:
+        """Is the time past the deadline?"""
+        return deadline is not None and time.monotonic() > deadline
+
+
+@dataclass
+class Sample:
+    """Values sampled from a data source."""
+
+    values: List[Any]
+    """The sampled values."""
+
+    population_count: Optional[int]
+    """Number of values in the data source, None if it is unknown."""
+
+
+def reservoir_sample(values: Iterable[Any],
+                     budget: EstimationBudget,
+                     population_count: Optional[int] = None) -> Sample:
+    """Draw a uniform sample of the values by reservoir sampling.
+
+    If all values fit in the budget, they are sampled in their original order.
+    The population count is the number of read values, unless it is given,
+    or the reading was stopped by the deadline.
+    """
+    random_inst = budget.make_random()
+    deadline = budget.make_deadline()
+    reservoir = []
+    read_count = 0
+    timed_out = False
+    for value in values:
+        read_count += 1
+        if len(reservoir) < budget.max_rows:
+            reservoir.append(value)
+        else:
+            index = random_inst.randrange(read_count)
+            if index < budget.max_rows:
+                reservoir[index] = value
+        if read_count % budget.checkpoint_rows == 0 and budget.is_past(deadline):
+            timed_out = True
+            break
+    if population_count is None and not timed_out:
+        population_count = read_count
+    return Sample(reservoir, population_count)
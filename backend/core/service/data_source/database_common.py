@@ -1,12 +1,12 @@
-from typing import Dict, Union
+from typing import Dict, Union, Optional
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, MetaData, Table
 from sqlalchemy.engine import Engine, Connection
 from sqlalchemy.engine.url import URL
 from sqlalchemy.exc import SQLAlchemyError
 
 from core.model.data_source import DataSource
-from core.service.exception import DatabaseConnectionError
+from core.service.exception import DatabaseConnectionError, DatabaseNotReadable
 from core.service.injector import HasCleanUp
 
 DataSourceOrUrl = Union[DataSource, str]
@@ -65,3 +65,45 @@ class DatabaseConnectionManager(HasCleanUp):
             _, conn = self._connection.popitem()
             conn.close()
         self._engine.clear()
+
+
+class DatabaseReflectionCache(HasCleanUp):
+    """Holds reflected tables per database.
+
+    Only the requested tables are reflected, each of them once,
+    until the cache is invalidated for the database.
+    A database is identified by its URL or data source object.
+    """
+
+    def __init__(self, conn_manager: DatabaseConnectionManager):
+        self._conn_manager = conn_manager
+        self._meta: Dict[DataSourceOrUrl, MetaData] = {}
+
+    def get_table(self, data_source_url: DataSourceOrUrl, table_name: str) -> Optional[Table]:
+        """Return the reflected table by name, reflecting it if necessary.
+
+        Return None if the database has no such table.
+        """
+        meta = self._meta.setdefault(data_source_url, MetaData())
+        if table_name in meta.tables:
+            return meta.tables[table_name]
+        engine = self._conn_manager.get_engine(data_source_url)
+        try:
+            if not engine.has_table(table_name):
+                return None
+            meta.reflect(bind=engine, only=[table_name], resolve_fks=False)
+        except SQLAlchemyError:
+            raise DatabaseNotReadable(data_source_url)
+        return meta.tables[table_name]
+
+    def replace(self, data_source_url: DataSourceOrUrl, meta: MetaData):
+        """Replace the cached tables of a database by freshly reflected metadata."""
+        self._meta[data_source_url] = meta
+
+    def invalidate(self, data_source_url: DataSourceOrUrl):
+        """Forget the reflected tables of a database."""
+        self._meta.pop(data_source_url, None)
+
+    def clean_up(self):
+        """Forget all reflected tables."""
+        self._meta.clear()
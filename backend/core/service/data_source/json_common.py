@@ -0,0 +1,186 @@
+import json
+import os
+from collections import OrderedDict
+from typing import Any, Iterator, Tuple, Optional, IO, Dict
+
+from core.service.injector import HasCleanUp
+
+JsonTableRows = Tuple[Optional[str], Iterator[Any]]
+"""Table name and an iterator of the table rows.
+
+The name is None if the document is a single table.
+"""
+
+
+class JsonStreamReader:
+    """Incremental reader of a JSON document holding tables.
+
+    The document is either a list of rows, or an object mapping
+    table names to lists of rows. The rows are decoded one at a time,
+    so that the memory usage is bounded by the size of a single row.
+    """
+
+    chunk_size = 64 * 1024
+    """How many characters are read from the file at once."""
+
+    def __init__(self, file: IO[str]):
+        self._file = file
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _read_more(self) -> bool:
+        """Append the next chunk to the buffer, dropping the consumed part.
+        Return False at the end of the file.
+        """
+        if self._eof:
+            return False
+        chunk = self._file.read(self.chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _peek(self) -> str:
+        """Skip whitespace and return the next character, or an empty string at the end."""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos].isspace():
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._read_more():
+                return ''
+
+    def _expect(self, char: str):
+        """Consume the next character, which must be the given one."""
+        if self._peek() != char:
+            raise ValueError('Expected `{}` in the JSON document'.format(char))
+        self._pos += 1
+
+    def _decode_value(self) -> Any:
+        """Decode and consume the next JSON value."""
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._read_more():
+                    continue
+                raise ValueError('Malformed JSON document')
+            # a number at the end of the buffer may continue in the next chunk
+            if end == len(self._buffer) and self._read_more():
+                continue
+            self._pos = end
+            return value
+
+    def _iter_array(self) -> Iterator[Any]:
+        """Decode the elements of the next array one by one."""
+        self._expect('[')
+        if self._peek() == ']':
+            self._pos += 1
+            return
+        while True:
+            yield self._decode_value()
+            if self._peek() == ',':
+                self._pos += 1
+                continue
+            self._expect(']')
+            return
+
+    def iter_tables(self) -> Iterator[JsonTableRows]:
+        """Yield the tables of the document in order.
+
+        The rows of a table must be consumed before the next table is yielded,
+        the remaining rows are skipped otherwise.
+        """
+        if self._peek() == '[':
+            yield None, self._iter_array()
+            return
+        self._expect('{')
+        if self._peek() == '}':
+            return
+        while True:
+            table_name = self._decode_value()
+            self._expect(':')
+            rows = self._iter_array()
+            yield table_name, rows
+            for _ in rows:
+                pass
+            if self._peek() == ',':
+                self._pos += 1
+                continue
+            self._expect('}')
+            return
+
+
+class JsonDocumentCache(HasCleanUp):
+    """Parsed JSON documents keyed on file path and modification time.
+
+    The documents are evicted in least recently used order, so that
+    the total size of the cached files stays within the limit.
+    Files larger than the streaming threshold are not parsed at once,
+    their tables should be streamed instead.
+    """
+
+    max_bytes = 256 * 1024 * 1024
+    """Limit on the total size of the cached files."""
+
+    stream_bytes = 64 * 1024 * 1024
+    """Files larger than this should be streamed."""
+
+    def __init__(self):
+        self._documents: 'OrderedDict[str, Tuple[Tuple[int, int], Any]]' = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._total_bytes = 0
+
+    @staticmethod
+    def _file_version(file_path: str) -> Tuple[int, int]:
+        """Return the modification time and the size of the file."""
+        stat = os.stat(file_path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def should_stream(self, file_path: str) -> bool:
+        """Is the file too large to be parsed at once?"""
+        return os.path.getsize(file_path) > self.stream_bytes
+
+    def get(self, file_path: str) -> Any:
+        """Return the parsed document, parsing the file if it is not cached
+        or it was modified since.
+
+        The returned object is shared and must not be modified.
+        """
+        version = self._file_version(file_path)
+        if file_path in self._documents:
+            cached_version, document = self._documents[file_path]
+            if cached_version == version:
+                self._documents.move_to_end(file_path)
+                return document
+            self._evict(file_path)
+        with open(file_path) as file:
+            document = json.load(file)
+        self._documents[file_path] = (version, document)
+        self._sizes[file_path] = version[1]
+        self._total_bytes += version[1]
+        while self._total_bytes > self.max_bytes and len(self._documents) > 1:
+            self._evict(next(iter(self._documents)))
+        return document
+
+    @staticmethod
+    def iter_tables(file_path: str) -> Iterator[JsonTableRows]:
+        """Stream the tables of the file, see JsonStreamReader."""
+        with open(file_path) as file:
+            yield from JsonStreamReader(file).iter_tables()
+
+    def _evict(self, file_path: str):
+        """Forget a cached document."""
+        del self._documents[file_path]
+        self._total_bytes -= self._sizes.pop(file_path)
+
+    def clean_up(self):
+        """Forget all cached documents."""
+        self._documents.clear()
+        self._sizes.clear()
+        self._total_bytes = 0
@@ -3,6 +3,7 @@ from typing import List
 
 from core.model.meta_column import MetaColumn
 from core.model.meta_table import MetaTable
+from core.service.data_source.csv_common import CsvColumnCache
 from core.service.data_source.file_common import strip_file_extensions
 from core.service.data_source.identifier import Identifier
 from core.service.data_source.schema import SchemaProvider
@@ -19,13 +20,21 @@ class CsvSchemaProvider(SchemaProvider):
     be double quoted. The file name and column names must be valid identifiers.
     Missing values are interpreted as empty strings, it is not possible
     to define None value.
+
+    The columnar cache of the file is built in the same pass.
     """
     def read_structure(self) -> List[MetaTable]:
+        type_deduction = TypeDeduction()
+
+        def deduced_rows(rows):
+            for row in rows:
+                type_deduction.next_row(row)
+                yield row
+
         with open(self._data_source.file_path) as file:
             reader = csv.DictReader(file, quoting=csv.QUOTE_NONNUMERIC)
-            type_deduction = TypeDeduction()
-            for row in reader:
-                type_deduction.next_row(row)
+            cache = CsvColumnCache(self._data_source.file_path)
+            cache.build(reader.fieldnames or [], deduced_rows(reader))
         return [
             self._make_table(type_deduction, self._file_name_to_table_name())
         ]
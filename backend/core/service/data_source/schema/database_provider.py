@@ -10,7 +10,7 @@ from core.model.meta_column import MetaColumn
 from core.model.meta_constraint import MetaConstraint
 from core.model.meta_table import MetaTable
 from core.model.reference_constraint import ReferenceConstraint
-from core.service.data_source.database_common import DatabaseConnectionManager
+from core.service.data_source.database_common import DatabaseConnectionManager, DatabaseReflectionCache
 from core.service.data_source.identifier import Identifier
 from core.service.data_source.schema.base_provider import SchemaProvider
 from core.service.exception import DataSourceError, DatabaseNotReadable
@@ -34,6 +34,8 @@ class DatabaseSchemaProvider(SchemaProvider):
             meta.reflect(bind=engine)
         except SQLAlchemyError:
             raise DatabaseNotReadable(self._data_source)
+        # the schema may have changed, the estimators will reuse the fresh reflection
+        self._injector.get(DatabaseReflectionCache).replace(self._data_source, meta)
         self._column = {}
         self._table_list = [
             self._make_meta_table(tab)
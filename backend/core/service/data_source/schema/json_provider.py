@@ -1,10 +1,10 @@
-import json
-from typing import List, Dict, Any
+from typing import List, Dict, Iterable
 
 from core.model.meta_column import MetaColumn
 from core.model.meta_table import MetaTable
 from core.service.data_source.file_common import strip_file_extensions
 from core.service.data_source.identifier import Identifier
+from core.service.data_source.json_common import JsonDocumentCache
 from core.service.data_source.schema import SchemaProvider
 from core.service.data_source.schema.type_deduction import TypeDeduction
 from core.service.exception import DataSourceError
@@ -21,21 +21,44 @@ class JsonSchemaProvider(SchemaProvider):
     The JSON must be of type Dict[str, List[Dict[str, AnyBasicType]]].
     The string in the outer dictionary defines a table name, while the inner
     string defines a column name. Both must be valid identifiers.
+    The parsed document is shared through the JSON document cache,
+    large files are streamed instead.
     """
     def read_structure(self) -> List[MetaTable]:
-        with open(self._data_source.file_path) as file:
-            obj = json.loads(file.read())
-            if self._is_json_table_dict(obj):
-                return self._parse_table_dict(obj)
-            elif self._is_json_table(obj):
-                return [
-                    self._parse_table(
-                        obj,
-                        self._file_name_to_table_name()
-                    )
-                ]
+        cache = self._injector.get(JsonDocumentCache)
+        try:
+            if cache.should_stream(self._data_source.file_path):
+                return self._stream_structure(cache)
+            obj = cache.get(self._data_source.file_path)
+        except ValueError:
+            raise DataSourceError('Invalid JSON structure', self._data_source)
+        if self._is_json_table_dict(obj):
+            return self._parse_table_dict(obj)
+        elif self._is_json_table(obj):
+            return [
+                self._parse_table(
+                    obj,
+                    self._file_name_to_table_name()
+                )
+            ]
         raise DataSourceError('Invalid JSON structure', self._data_source)
 
+    def _stream_structure(self, cache: JsonDocumentCache) -> List[MetaTable]:
+        """Read the structure table by table, streaming the rows from the file."""
+        tables = []
+        for table_name, rows in cache.iter_tables(self._data_source.file_path):
+            if table_name is None:
+                table_name = self._file_name_to_table_name()
+            tables.append(self._parse_table(self._checked_rows(rows), table_name))
+        return tables
+
+    def _checked_rows(self, rows: Iterable) -> Iterable[JsonRow]:
+        """Yield the rows, checking that each of them is an object."""
+        for row in rows:
+            if not isinstance(row, dict):
+                raise DataSourceError('Invalid JSON structure', self._data_source)
+            yield row
+
     def _file_name_to_table_name(self) -> str:
         return strip_file_extensions(self._data_source.file_name)
 
@@ -75,7 +98,7 @@ class JsonSchemaProvider(SchemaProvider):
             reflected_column_idf=repr(Identifier(table_name, col_name))
         )
 
-    def _parse_table(self, obj: JsonTable, table_name: str) -> MetaTable:
+    def _parse_table(self, obj: Iterable[JsonRow], table_name: str) -> MetaTable:
         type_deduction = TypeDeduction()
         for row in obj:
             type_deduction.next_row(row)
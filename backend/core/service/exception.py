@@ -1,3 +1,5 @@
+from typing import List
+
 from core.model.data_source import DataSource
 from core.model.generator_setting import GeneratorSetting
 from core.model.meta_column import MetaColumn
@@ -82,3 +84,9 @@ class RequisitionMissingReferenceError(SomeError):
     def __init__(self, included_table: str, ref_table: str):
         super().__init__('The table `{}` references the table `{}`, but it is not included in the export'
                          .format(included_table, ref_table))
+
+
+class RequisitionInfeasibleError(SomeError):
+    def __init__(self, issues: List[str]):
+        super().__init__('The requested rows cannot be generated: {}'.format('; '.join(issues)))
+        self.issues = issues
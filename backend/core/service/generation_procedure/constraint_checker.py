@@ -1,4 +1,6 @@
-from typing import Dict, Tuple, Set, Iterable, List
+from dataclasses import dataclass, field
+from operator import itemgetter
+from typing import Dict, Tuple, Iterable, List, Union, Callable, Optional
 
 from core.model.meta_column import MetaColumn
 from core.model.meta_constraint import MetaConstraint
@@ -6,16 +8,95 @@ from core.model.meta_table import MetaTable
 from core.model.project import Project
 from core.service.exception import RequisitionMissingReferenceError
 from core.service.generation_procedure.database import GeneratedRow
+from core.service.generation_procedure.key_set import KeySet, KeyStorage, TupleKeyStorage, FilteredKeySet
+from core.service.generation_procedure.reference_index import ReferenceIndex
 from core.service.generation_procedure.requisition import ExportRequisition
+from core.service.generation_procedure.statistics import KeyFilterStatistics
+
+KeyGetter = Callable[[GeneratedRow], Tuple]
+"""Function returning the tuple of values of some columns in a row."""
+
+UniqueTuples = Union[KeySet, ReferenceIndex]
+"""Set of unique tuples of a constraint."""
+
+
+def make_key_getter(column_names: List[str]) -> KeyGetter:
+    """Return a function collecting the tuple of values of the named columns."""
+    if len(column_names) == 1:
+        column_name = column_names[0]
+        return lambda row: (row[column_name],)
+    return itemgetter(*column_names)
+
+
+def qualified_constraint_name(constraint: MetaConstraint) -> str:
+    """Return the constraint name prefixed by the table name.
+
+    Unnamed constraints are named by their columns.
+    """
+    name = constraint.name or ','.join(column.name for column in constraint.constrained_columns)
+    return '{}.{}'.format(constraint.table.name, name)
+
+
+def is_none_tuple(row_tuple: Tuple) -> bool:
+    """Is each tuple element None?"""
+    for elem in row_tuple:
+        if elem is not None:
+            return False
+    return True
+
+
+@dataclass
+class Violation:
+    """Constraint violated by a row."""
+
+    constraint_name: str
+    """Name of the constraint, prefixed by the table name."""
+
+    column_names: List[str]
+    """Names of the constrained columns."""
+
+
+ConstraintCheck = Tuple[KeyGetter, UniqueTuples, Violation]
+"""Key getter of a constraint, its tuples and the violation reported on failure."""
+
+
+@dataclass
+class TableCheckPlan:
+    """Checks of a single table, resolved once from its constraints."""
+
+    foreign_checks: List[ConstraintCheck] = field(default_factory=list)
+    """Checks of FOREIGN constraints against the referenced tuples."""
+
+    unique_checks: List[ConstraintCheck] = field(default_factory=list)
+    """Checks of UNIQUE and PRIMARY constraints against their tuples."""
+
+    not_null_columns: List[str] = field(default_factory=list)
+    """Names of the columns, which must not be None."""
+
+    registrations: List[Tuple[KeyGetter, UniqueTuples]] = field(default_factory=list)
+    """Key getters and tuple sets updated by a registered row."""
 
 
 class ConstraintChecker:
     """Provide integrity constraint checking for NOT NULL, PRIMARY,
     UNIQUE and FOREIGN constraints.
+
+    The constraints of each table are compiled to a check plan,
+    so that the rows are checked without resolving the constraints again.
+    The unique tuples are kept in key sets made by the key storage,
+    in sets of tuples by default. Optionally, each key set of a UNIQUE
+    or PRIMARY constraint gets a Bloom filter in front of it.
     """
 
-    def __init__(self, project: Project, interactive_driver: bool, requisition: ExportRequisition):
+    def __init__(self,
+                 project: Project,
+                 interactive_driver: bool,
+                 requisition: ExportRequisition,
+                 key_storage: Optional[KeyStorage] = None,
+                 key_filter: bool = False):
         self._project = project
+        self._key_storage = key_storage if key_storage is not None else TupleKeyStorage()
+        self._key_filter = key_filter
         self._interactive_driver = interactive_driver
         """Is the driver interactive?"""
         self._watched_by_table: Dict[MetaTable, List[MetaConstraint]] = {
@@ -24,20 +105,22 @@ class ConstraintChecker:
         """List of constraints for each table, that should have unique tuples
         inserted on insert to the table.
         """
-        self._unique_tuples: Dict[MetaConstraint, Set[Tuple]] = {}
+        self._unique_tuples: Dict[MetaConstraint, UniqueTuples] = {}
         """Set of unique values per constraint.
         
         For UNIQUE and PRIMARY constraints, these are sets of unique tuples
         constructed from constrained columns in the given table.
-        For a FOREIGN constraint, these are sets of unique tuples
+        For a FOREIGN constraint, these are reference indexes of unique tuples
         constructed from referenced columns in the referenced table.
         """
+        self._plans: Dict[MetaTable, TableCheckPlan] = {}
+        """Check plan of each table."""
         self._prepare(requisition)
 
     def _prepare(self, requisition: ExportRequisition):
         """Prepare the watched_by_table list of constraints for each table
         in the export requisition. Create empty sets of unique tuples
-        for relevant constraints.
+        for relevant constraints and compile the check plans.
 
         Raise an error if a table included in the requisition references a table
         outside the requisition.
@@ -50,15 +133,59 @@ class ConstraintChecker:
                                                       MetaConstraint.PRIMARY,
                                                       MetaConstraint.UNIQUE):
                     continue
-                self._unique_tuples[constraint] = set()
                 ref_table = meta_table
-                if constraint.constraint_type == MetaConstraint.FOREIGN:
+                if constraint.constraint_type != MetaConstraint.FOREIGN:
+                    self._unique_tuples[constraint] = self._make_key_set(meta_table, requisition)
+                else:
+                    self._unique_tuples[constraint] = self._key_storage.make_key_set()
                     if not constraint.referenced_columns:
                         continue
+                    self._unique_tuples[constraint] = ReferenceIndex()
                     ref_table = constraint.referenced_columns[0].table
                     if ref_table.name not in requisition:
                         raise RequisitionMissingReferenceError(meta_table.name, ref_table.name)
                 self._watched_by_table[ref_table].append(constraint)
+        self._compile_plans()
+
+    def _make_key_set(self, meta_table: MetaTable, requisition: ExportRequisition) -> KeySet:
+        """Make the key set of a constraint of the table, filtered if requested."""
+        key_set = self._key_storage.make_key_set()
+        if not self._key_filter:
+            return key_set
+        return FilteredKeySet(key_set, requisition.number_of_rows(meta_table.name))
+
+    def get_key_filter_statistics(self, meta_table: Optional[MetaTable] = None) -> Dict[str, KeyFilterStatistics]:
+        """Return the statistics of the filtered key sets by constraint name,
+        of the given table only, if any.
+        """
+        return {
+            qualified_constraint_name(constraint): unique_tuples.statistics
+            for constraint, unique_tuples in self._unique_tuples.items()
+            if isinstance(unique_tuples, FilteredKeySet)
+            and (meta_table is None or constraint.table == meta_table)
+        }
+
+    def get_reference_indexes(self) -> Dict[MetaConstraint, ReferenceIndex]:
+        """Return the reference index of each FOREIGN constraint in the requisition.
+
+        The indexes are filled as the referenced rows are registered.
+        """
+        return {
+            constraint: unique_tuples
+            for constraint, unique_tuples in self._unique_tuples.items()
+            if isinstance(unique_tuples, ReferenceIndex)
+        }
+
+    def set_reference_index(self, constraint: MetaConstraint, reference_index: ReferenceIndex):
+        """Replace the reference index of a FOREIGN constraint,
+        e.g. by an index filled by another checker.
+        """
+        self._unique_tuples[constraint] = reference_index
+        self._compile_plans()
+
+    def clean_up(self):
+        """Release the key storage."""
+        self._key_storage.clean_up()
 
     @classmethod
     def _is_unique_constraint(cls, constraint: MetaConstraint) -> bool:
@@ -74,60 +201,112 @@ class ConstraintChecker:
         return constraint.constraint_type == MetaConstraint.UNIQUE or \
                (constraint.constraint_type == MetaConstraint.PRIMARY and not self._interactive_driver)
 
-    @classmethod
-    def _collect_tuple(cls, row: GeneratedRow, columns: Iterable[MetaColumn]) -> Tuple:
-        """Return tuple created from the row by selecting the given columns."""
-        return tuple(row[column.name] for column in columns)
-
-    def _insert_tuple(self, row: GeneratedRow, constraint: MetaConstraint, columns: Iterable[MetaColumn]):
-        """Insert a new unique tuple to the set of constraint's unique tuples."""
-        unique_tuples = self._unique_tuples[constraint]
-        row_tuple = self._collect_tuple(row, columns)
-        unique_tuples.add(row_tuple)
-
-    def _tuple_exists(self, row: GeneratedRow, constraint: MetaConstraint, columns: Iterable[MetaColumn]) -> bool:
-        """Return whether the tuple is in the set of constraint's unique tuples."""
-        unique_tuples = self._unique_tuples[constraint]
-        row_tuple = self._collect_tuple(row, columns)
-        return row_tuple in unique_tuples
-
-    def _tuple_is_none(self, row: GeneratedRow, columns: Iterable[MetaColumn]) -> bool:
-        """Is each tuple element None?"""
-        row_tuple = self._collect_tuple(row, columns)
-        return all(map(lambda elem: elem is None, row_tuple))
+    @staticmethod
+    def _key_getter(columns: Iterable[MetaColumn]) -> KeyGetter:
+        """Return the key getter of the columns."""
+        return make_key_getter([column.name for column in columns])
+
+    def _compile_plans(self):
+        """Compile the check plan of each table."""
+        self._plans = {}
+        for meta_table in self._project.tables:
+            plan = TableCheckPlan()
+            for constraint in meta_table.constraints:
+                if constraint not in self._unique_tuples:
+                    continue
+                check = (
+                    self._key_getter(constraint.constrained_columns),
+                    self._unique_tuples[constraint],
+                    Violation(qualified_constraint_name(constraint),
+                              [column.name for column in constraint.constrained_columns])
+                )
+                if constraint.constraint_type == MetaConstraint.FOREIGN:
+                    plan.foreign_checks.append(check)
+                elif self._should_check_uniqueness(constraint):
+                    plan.unique_checks.append(check)
+            plan.not_null_columns = [
+                meta_column.name
+                for meta_column in meta_table.columns
+                if not meta_column.nullable
+            ]
+            for constraint in self._watched_by_table[meta_table]:
+                if constraint.constraint_type == MetaConstraint.FOREIGN:
+                    columns = constraint.referenced_columns
+                else:
+                    columns = constraint.constrained_columns
+                plan.registrations.append((self._key_getter(columns), self._unique_tuples[constraint]))
+            self._plans[meta_table] = plan
 
     def check_row(self, meta_table: MetaTable, row: GeneratedRow) -> bool:
         """Check whether the row satisfies each constraint.
 
         Called before insertion to the output driver.
         """
-        for constraint in meta_table.constraints:
-            if constraint not in self._unique_tuples:
-                continue
+        return self.find_violation(meta_table, row) is None
+
+    def find_violation(self, meta_table: MetaTable, row: GeneratedRow) -> Optional[Violation]:
+        """Return the first constraint violated by the row, or None if the row
+        satisfies each constraint.
 
-            if constraint.constraint_type == MetaConstraint.FOREIGN \
-               and not self._tuple_is_none(row, constraint.constrained_columns) \
-               and not self._tuple_exists(row, constraint, constraint.constrained_columns):
-                return False
-            elif self._should_check_uniqueness(constraint) \
-                    and not self._tuple_is_none(row, constraint.constrained_columns) \
-                    and self._tuple_exists(row, constraint, constraint.constrained_columns):
-                return False
-        for meta_column in meta_table.columns:
-            if not meta_column.nullable and \
-               meta_column.name in row and \
-               row[meta_column.name] is None:
-                return False
-        return True
+        A NOT NULL violation is reported as a constraint named by the column.
+        """
+        plan = self._plans[meta_table]
+        for key_getter, referenced_tuples, violation in plan.foreign_checks:
+            row_tuple = key_getter(row)
+            if row_tuple not in referenced_tuples and not is_none_tuple(row_tuple):
+                return violation
+        for key_getter, unique_tuples, violation in plan.unique_checks:
+            row_tuple = key_getter(row)
+            if row_tuple in unique_tuples and not is_none_tuple(row_tuple):
+                return violation
+        for column_name in plan.not_null_columns:
+            if column_name in row and row[column_name] is None:
+                return Violation('{}.{}'.format(meta_table.name, column_name), [column_name])
+        return None
+
+    def check_batch(self, meta_table: MetaTable, rows: List[GeneratedRow]) -> List[GeneratedRow]:
+        """Check a batch of rows and return those passing, in order.
+
+        The rows are checked constraint by constraint. Besides the checks
+        of check_row, a row must not repeat a unique tuple of a previous
+        passing row of the batch, since the batch is registered only
+        after insertion to the output driver.
+        """
+        plan = self._plans[meta_table]
+        passing = [True] * len(rows)
+        for column_name in plan.not_null_columns:
+            for index, row in enumerate(rows):
+                if column_name in row and row[column_name] is None:
+                    passing[index] = False
+        for key_getter, referenced_tuples, _ in plan.foreign_checks:
+            for index, row_tuple in enumerate(map(key_getter, rows)):
+                if row_tuple not in referenced_tuples and not is_none_tuple(row_tuple):
+                    passing[index] = False
+        batch_tuples = []
+        for key_getter, unique_tuples, _ in plan.unique_checks:
+            row_tuples = [None if is_none_tuple(row_tuple) else row_tuple for row_tuple in map(key_getter, rows)]
+            indexes = [index for index, row_tuple in enumerate(row_tuples) if row_tuple is not None]
+            present = unique_tuples.contains_many([row_tuples[index] for index in indexes])
+            for index, is_present in zip(indexes, present):
+                if is_present:
+                    passing[index] = False
+            batch_tuples.append((row_tuples, set()))
+        checked_rows = []
+        for index, row in enumerate(rows):
+            if not passing[index]:
+                continue
+            if any(row_tuples[index] in seen for row_tuples, seen in batch_tuples):
+                continue
+            for row_tuples, seen in batch_tuples:
+                if row_tuples[index] is not None:
+                    seen.add(row_tuples[index])
+            checked_rows.append(row)
+        return checked_rows
 
     def register_row(self, meta_table: MetaTable, row: GeneratedRow):
         """Register a successfully inserted row.
 
         Called after successful check and after successful insertion to the output driver.
         """
-        for constraint in self._watched_by_table[meta_table]:
-            if constraint.constraint_type == MetaConstraint.FOREIGN:
-                columns = constraint.referenced_columns
-            else:
-                columns = constraint.constrained_columns
-            self._insert_tuple(row, constraint, columns)
+        for key_getter, unique_tuples in self._plans[meta_table].registrations:
+            unique_tuples.add(key_getter(row))
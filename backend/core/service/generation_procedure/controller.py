@@ -1,45 +1,131 @@
 import random
 from collections import deque
-from typing import Iterable, Tuple, Optional
+from typing import Iterable, Tuple, Optional, List, Dict, Set
 
 from sqlalchemy import Table
 
+from core.model.meta_constraint import MetaConstraint
 from core.model.meta_table import MetaTable
 from core.model.project import Project
 from core.service.column_generator.setting_facade import GeneratorSettingFacade, GeneratorList
 from core.service.exception import SomeError
 from core.service.generation_procedure.deserializer import StructureDeserializer
-from core.service.generation_procedure.constraint_checker import ConstraintChecker
-from core.service.generation_procedure.database import GeneratedRow, GeneratedDatabase
+from core.service.generation_procedure.parallel import WorkerPool, TableResult, ShippedIndexes, TableShard, \
+    ShardPosition
+from core.service.generation_procedure.constraint_checker import ConstraintChecker, Violation
+from core.service.generation_procedure.database import GeneratedRow, GeneratedDatabase, GeneratedBatch, \
+    GeneratedTable, TableStorage, KeptColumns
+from core.service.generation_procedure.key_set import KeyStorage
+from core.service.generation_procedure.planner import RequisitionPlanner, RequisitionPlan
 from core.service.generation_procedure.requisition import ExportRequisition
 from core.service.generation_procedure.sorted_tables import SortedTables
-from core.service.generation_procedure.statistics import ProcedureStatistics
+from core.service.generation_procedure.statistics import ProcedureStatistics, ProcedureTableStatistics
 from core.service.output_driver import OutputDriver
 
 
 class ProcedureController:
-    """Controller for the data generation procedure."""
+    """Controller for the data generation procedure.
+
+    By default, the rows are generated one by one. If a batch size is given,
+    the generators produce whole column chunks of (at most) that size,
+    which are assembled into rows only for checking and insertion.
+
+    Unless the output driver needs the whole generated rows, the generated
+    database keeps only the columns referenced by foreign keys.
+    The rows are kept using the given storage, in memory by default.
+    The unique keys checked by the constraint checker are kept using
+    the given key storage, in sets of tuples by default, optionally
+    behind Bloom filters.
+
+    By default, the tables are generated in an interleaved fashion.
+    If a number of workers is given, the tables are generated level by level
+    of their foreign key dependencies instead, in parallel worker processes.
+    Each table then depends only on its seed and the complete key sets
+    of the referenced tables, so the output is the same for any number of workers.
+    Tables larger than the shard size are split into shards, generated
+    by separate tasks and merged in the current process.
+
+    A row generated one by one, which violates a constraint, is repaired
+    by generating only the columns of the violated constraint again.
+
+    If a planning mode is given, the requisition is planned before the run,
+    which reports the unique constraints likely to prevent generating
+    the requested rows, fails fast in the strict mode, or picks
+    the unique modes of the generators in the auto mode.
+    """
 
     def __init__(self,
                  project: Project,
                  requisition: ExportRequisition,
-                 output_driver: OutputDriver):
+                 output_driver: OutputDriver,
+                 batch_size: Optional[int] = None,
+                 storage: Optional[TableStorage] = None,
+                 workers: Optional[int] = None,
+                 shard_size: Optional[int] = None,
+                 key_storage: Optional[KeyStorage] = None,
+                 key_filter: bool = False,
+                 plan_mode: Optional[str] = None):
+        if batch_size is not None and batch_size < 1:
+            raise SomeError('The batch size must be a positive number')
+        if workers is not None and workers < 1:
+            raise SomeError('The number of workers must be a positive number')
+        if workers is not None and output_driver.is_interactive:
+            raise SomeError('The parallel mode requires a non-interactive output driver')
+        if shard_size is not None and shard_size < 1:
+            raise SomeError('The shard size must be a positive number')
+        if shard_size is not None and workers is None:
+            raise SomeError('Sharding requires the parallel mode')
+        if plan_mode is not None and plan_mode not in RequisitionPlanner.modes:
+            raise SomeError('Invalid planning mode')
+        self._workers = workers
+        self._shard_size = shard_size
+        self._sharded_seeds: Dict[str, int] = {}
+        """Seeds of the tables generated in shards, by table name."""
         self._project = project
+        self._batch_size = batch_size
         self._statistics = ProcedureStatistics(requisition)
         self._requisition = requisition
         self._output_driver = output_driver
-        self._database = GeneratedDatabase()
+        self._database = GeneratedDatabase(storage)
+        self._key_storage = key_storage
+        self._key_filter = key_filter
+        self._plan_mode = plan_mode
+        self._plan: Optional[RequisitionPlan] = None
         self._checker = ConstraintChecker(self._project,
                                           self._output_driver.is_interactive,
-                                          requisition)
+                                          requisition,
+                                          key_storage,
+                                          key_filter)
+        self._statistics.key_filters.update(self._checker.get_key_filter_statistics())
+        for constraint, reference_index in self._checker.get_reference_indexes().items():
+            self._database.add_reference_index(constraint, reference_index)
         deserializer = StructureDeserializer(self._project)
         self._meta = deserializer.deserialize()
 
     def run(self) -> GeneratedDatabase:
         """Generate the data according to the requisition using
-        the provided output driver. Return the generated data.
+        the provided output driver. Return the generated data,
+        which the caller cleans up. If the run fails, the generated data
+        is cleaned up here.
         """
-        self._output_driver.start_run(self._meta)
+        try:
+            self.plan_requisition()
+            self._output_driver.start_run(self._meta)
+            try:
+                if self._workers is not None:
+                    self._run_by_levels()
+                else:
+                    self._run_interleaved()
+            finally:
+                self._checker.clean_up()
+            self._output_driver.end_run(self._database)
+        except BaseException:
+            self._database.clean_up()
+            raise
+        return self._database
+
+    def _run_interleaved(self):
+        """Generate the tables in an interleaved fashion."""
         states = deque((iter(self._table_loop(meta_table)), table, meta_table)
                        for table, meta_table in self._sorted_tables())
         while states:
@@ -50,8 +136,35 @@ class ProcedureController:
                 states.append((it, table, meta_table))
             except StopIteration:
                 pass
-        self._output_driver.end_run(self._database)
-        return self._database
+
+    @property
+    def statistics(self) -> ProcedureStatistics:
+        """Return the statistics of the run."""
+        return self._statistics
+
+    def plan_requisition(self) -> RequisitionPlan:
+        """Plan the requisition in the planning mode, unless planned already.
+        Return the plan, which is empty without a planning mode.
+
+        In the strict mode, an error is raised if the plan has issues.
+        """
+        if self._plan is not None:
+            return self._plan
+        if self._plan_mode is None:
+            self._plan = RequisitionPlan()
+            return self._plan
+        planner = RequisitionPlanner(self._project,
+                                     self._requisition,
+                                     self._output_driver.is_interactive,
+                                     self._batch_size is None or self._workers is not None)
+        self._plan = planner.plan(self._plan_mode)
+        return self._plan
+
+    def _table_generators(self, meta_table: MetaTable) -> GeneratorList:
+        """Make generator instances for a table, in the planned unique modes."""
+        generators = self.instances_from_table(meta_table)
+        self.plan_requisition().apply(generators)
+        return generators
 
     def _sorted_tables(self) -> Iterable[Tuple[Table, MetaTable]]:
         """Return pairs of SQL Alchemy tables and MetaTables
@@ -65,42 +178,415 @@ class ProcedureController:
         for meta_table in sorted_tables.get_order():
             yield table_by_name[meta_table.name], meta_table
 
-    def _table_loop(self, meta_table: MetaTable) -> Iterable[GeneratedRow]:
+    def _referenced_tables(self, meta_table: MetaTable) -> Iterable[MetaTable]:
+        """Yield the tables in the requisition referenced by the table,
+        excluding self-references.
+        """
+        for constraint in meta_table.constraints:
+            if constraint.constraint_type != MetaConstraint.FOREIGN or not constraint.referenced_columns:
+                continue
+            ref_table = constraint.referenced_columns[0].table
+            if ref_table != meta_table and ref_table.name in self._requisition:
+                yield ref_table
+
+    def _reachable_tables(self, meta_table: MetaTable) -> Set[MetaTable]:
+        """Return the tables in the requisition reachable by the references from the table."""
+        reachable: Set[MetaTable] = set()
+        stack = [meta_table]
+        while stack:
+            for ref_table in self._referenced_tables(stack.pop()):
+                if ref_table not in reachable:
+                    reachable.add(ref_table)
+                    stack.append(ref_table)
+        return reachable
+
+    def _dependency_levels(self) -> List[List[Tuple[Table, MetaTable]]]:
+        """Split the sorted tables into levels. Each table is placed
+        one level after the last of the tables it references, which precede it
+        in the sorted order. The first level has no such references.
+
+        The tables of a reference cycle are placed in separate levels
+        in the sorted order, so that each of them references the rows
+        of the preceding ones, like in the sequential run.
+        """
+        sorted_tables = list(self._sorted_tables())
+        reachable = {meta_table: self._reachable_tables(meta_table) for _, meta_table in sorted_tables}
+        level_by_table: Dict[MetaTable, int] = {}
+        levels: List[List[Tuple[Table, MetaTable]]] = []
+        for table, meta_table in sorted_tables:
+            level = 0
+            for ref_table in self._referenced_tables(meta_table):
+                if ref_table in level_by_table:
+                    level = max(level, level_by_table[ref_table] + 1)
+            for placed_table, placed_level in level_by_table.items():
+                if placed_table in reachable[meta_table] and meta_table in reachable[placed_table]:
+                    level = max(level, placed_level + 1)
+            level_by_table[meta_table] = level
+            if level == len(levels):
+                levels.append([])
+            levels[level].append((table, meta_table))
+        return levels
+
+    def _run_by_levels(self):
+        """Generate the tables level by level in the worker pool.
+
+        The generated rows are inserted to the output driver and registered
+        in the current process, in the order of the levels.
+        """
+        completed: Set[str] = set()
+        with WorkerPool(self._generate_shard, self._workers) as pool:
+            for level in self._dependency_levels():
+                shards_by_table = [self._make_shards(meta_table) for _, meta_table in level]
+                tasks = [
+                    (shard, self._shipped_indexes(meta_table, completed))
+                    for (_, meta_table), shards in zip(level, shards_by_table)
+                    for shard in shards
+                ]
+                results = iter(pool.map(tasks))
+                for (table, meta_table), shards in zip(level, shards_by_table):
+                    self._output_driver.switch_table(table, meta_table)
+                    table_results = [next(results) for _ in shards]
+                    self._insert_results(meta_table, table_results)
+                completed.update(meta_table.name for _, meta_table in level)
+
+    def _is_self_referencing(self, meta_table: MetaTable) -> bool:
+        """Does the table have a foreign key referencing itself?"""
+        return any(
+            constraint.constraint_type == MetaConstraint.FOREIGN
+            and constraint.referenced_columns
+            and constraint.referenced_columns[0].table == meta_table
+            for constraint in meta_table.constraints
+        )
+
+    def _sharded_table_seed(self, meta_table: MetaTable) -> int:
+        """Return the seed of a table generated in shards.
+
+        A table without a seed gets a random one, which its shards share.
+        """
+        if meta_table.name not in self._sharded_seeds:
+            seed = self._requisition.seed(meta_table.name)
+            self._sharded_seeds[meta_table.name] = seed if seed is not None else random.getrandbits(32)
+        return self._sharded_seeds[meta_table.name]
+
+    @staticmethod
+    def _shard_seed(seed: Optional[int], index: int) -> Optional[int]:
+        """Derive the seed of a shard by its index from the table seed."""
+        if seed is None:
+            return None
+        return random.Random('{}:{}'.format(seed, index)).getrandbits(32)
+
+    def _make_shards(self, meta_table: MetaTable) -> List[TableShard]:
+        """Split the requested rows of the table into shards of at most the shard size.
+
+        Tables with self-references are not split, since their rows depend
+        on the previous rows. A table in a single shard keeps its own seed.
+        """
+        row_count = self._requisition.number_of_rows(meta_table.name)
+        seed = self._sharded_table_seed(meta_table)
+        if self._shard_size is None or row_count <= self._shard_size or self._is_self_referencing(meta_table):
+            return [TableShard(meta_table.name, row_count, seed, ShardPosition.whole_table(row_count), seed)]
+        starts = range(0, row_count, self._shard_size)
+        shards = []
+        for index, start in enumerate(starts):
+            shard_count = min(self._shard_size, row_count - start)
+            position = ShardPosition(start, shard_count, row_count, index, len(starts))
+            shards.append(TableShard(meta_table.name,
+                                     shard_count,
+                                     self._shard_seed(seed, index),
+                                     position,
+                                     seed))
+        return shards
+
+    def _shipped_indexes(self, meta_table: MetaTable, completed: Set[str]) -> ShippedIndexes:
+        """Return the reference indexes of the table's foreign keys,
+        which reference completed tables.
+        """
+        reference_indexes = self._checker.get_reference_indexes()
+        shipped: ShippedIndexes = {}
+        for position, constraint in enumerate(meta_table.constraints):
+            if constraint not in reference_indexes:
+                continue
+            if constraint.referenced_columns[0].table.name in completed:
+                shipped[position] = reference_indexes[constraint]
+        return shipped
+
+    def _generate_shard(self, shard: TableShard, shipped: ShippedIndexes) -> TableResult:
+        """Generate and check the rows of a table shard, without inserting them.
+
+        Runs in a worker process. Foreign keys are chosen from the shipped
+        reference indexes, other constraints are checked against the rows
+        generated by this call only.
+        """
+        table_name = shard.table_name
+        meta_table = next(meta_table for meta_table in self._project.tables if meta_table.name == table_name)
+        key_storage = None if self._key_storage is None else type(self._key_storage)()
+        checker = ConstraintChecker(self._project, False, self._requisition, key_storage, self._key_filter)
+        for position, reference_index in shipped.items():
+            checker.set_reference_index(meta_table.constraints[position], reference_index)
+        database = GeneratedDatabase()
+        for constraint, reference_index in checker.get_reference_indexes().items():
+            database.add_reference_index(constraint, reference_index)
+        generators = self._shard_generators(meta_table, shard)
+        stats = ProcedureTableStatistics(table_name, shard.row_count)
+        result = TableResult(rows=[], check_failure_count=0)
+        try:
+            while stats.expects_next_row:
+                if self._batch_size is None:
+                    rows = [self._make_row(generators, database)]
+                else:
+                    size = stats.next_batch_size(self._batch_size)
+                    rows = self._batch_rows(self._make_batch(generators, size, database), size)
+                for row in rows:
+                    if not self._repair_row(meta_table, row, generators, database, checker, stats):
+                        stats.fail_check()
+                        result.check_failure_count += 1
+                        continue
+                    stats.succeed_insert()
+                    checker.register_row(meta_table, row)
+                    result.rows.append(row)
+        finally:
+            checker.clean_up()
+        result.retry_counts = stats.retry_counts
+        result.key_filters = checker.get_key_filter_statistics(meta_table)
+        return result
+
+    def _shard_generators(self, meta_table: MetaTable, shard: TableShard) -> GeneratorList:
+        """Create generators for a table shard, seeded by the shard seed."""
+        generators = self._table_generators(meta_table)
+        self.seed_all(generators, shard.seed)
+        for generator, table_seed in zip(generators, self.generator_seeds(len(generators), shard.table_seed)):
+            generator.start_shard(shard.position, table_seed)
+        return generators
+
+    def _insert_results(self, meta_table: MetaTable, results: List[TableResult]):
+        """Insert the rows generated by the workers using the output driver,
+        shard by shard. Update the statistics and register the inserted rows.
+
+        The rows of multiple shards are checked again, since the shards
+        were checked independently. If some rows are missing after that,
+        they are topped up in the current process.
+        """
+        table_db = self._database.add_table(meta_table.name, self._kept_columns(meta_table))
+        stats = self._statistics.get_table_statistics(meta_table.name)
+        sharded = len(results) > 1
+        for result in results:
+            stats.fail_check(result.check_failure_count)
+            for constraint_name, retry_count in result.retry_counts.items():
+                stats.retry(constraint_name, retry_count)
+            for constraint_name, key_filter in result.key_filters.items():
+                self._statistics.key_filters[constraint_name].merge(key_filter)
+            rows = result.rows
+            if sharded:
+                rows = self._checker.check_batch(meta_table, rows)
+                stats.fail_check(len(result.rows) - len(rows))
+            insertion_results = self._output_driver.insert_rows(rows)
+            for row, insertion_result in zip(rows, insertion_results):
+                if insertion_result is None:
+                    stats.fail_insert()
+                    continue
+                stats.succeed_insert()
+                table_db.append(row)
+                self._checker.register_row(meta_table, row)
+        if sharded and stats.expects_next_row:
+            self._top_up(meta_table, table_db, stats, len(results))
+
+    def _top_up(self,
+                meta_table: MetaTable,
+                table_db: GeneratedTable,
+                stats: ProcedureTableStatistics,
+                index: int):
+        """Generate the rows missing after merging the shards, as an extra shard
+        with the given index, checked directly against the merged rows.
+        """
+        row_count = self._requisition.number_of_rows(meta_table.name)
+        seed = self._sharded_table_seed(meta_table)
+        max_draw_count = ProcedureTableStatistics.tolerance_factor * min(self._shard_size, row_count)
+        shard = TableShard(
+            meta_table.name,
+            row_count,
+            self._shard_seed(seed, index),
+            ShardPosition.after_shards(row_count, index, max_draw_count),
+            seed
+        )
+        generators = self._shard_generators(meta_table, shard)
+        while stats.expects_next_row:
+            row = self._make_row(generators, self._database)
+            self._try_insert_row(meta_table, row, generators, table_db, stats)
+
+    def _table_loop(self, meta_table: MetaTable) -> Iterable[Optional[GeneratedRow]]:
         """Create generators for a given table and fill it with data,
         while checking the integrity constraints.
 
-        Yield complete row after each successful insert.
+        Yield complete row after each successful insert. In batch mode,
+        yield after each processed batch instead.
         """
-        table_db = self._database.add_table(meta_table.name)
+        table_db = self._database.add_table(meta_table.name, self._kept_columns(meta_table))
         stats = self._statistics.get_table_statistics(meta_table.name)
-        generators = self.instances_from_table(meta_table)
+        generators = self._table_generators(meta_table)
         table_seed = self._requisition.seed(meta_table.name)
         self.seed_all(generators, table_seed)
+        if self._batch_size is not None:
+            yield from self._batch_loop(meta_table, generators, table_db, stats)
+            return
         while stats.expects_next_row:
-            row = self._make_row(generators)
-            if not self._checker.check_row(meta_table, row):
-                stats.fail_check()
+            row = self._make_row(generators, self._database)
+            if self._try_insert_row(meta_table, row, generators, table_db, stats):
+                yield row
+
+    def _kept_columns(self, meta_table: MetaTable) -> KeptColumns:
+        """Return the columns of the table, which must be kept in the generated database.
+
+        These are the columns referenced by foreign keys of tables in the requisition.
+        Return None if the output driver needs whole rows.
+        """
+        if self._output_driver.needs_generated_rows:
+            return None
+        kept_columns = {}
+        for referencing_table in self._project.tables:
+            if referencing_table.name not in self._requisition:
                 continue
-            insertion_result = self._output_driver.insert_row(row)
+            for constraint in referencing_table.constraints:
+                if constraint.constraint_type != MetaConstraint.FOREIGN:
+                    continue
+                for ref_column in constraint.referenced_columns:
+                    if ref_column.table == meta_table:
+                        kept_columns[ref_column.name] = ref_column.col_type
+        return kept_columns
+
+    def _batch_loop(self,
+                    meta_table: MetaTable,
+                    generators: GeneratorList,
+                    table_db: GeneratedTable,
+                    stats: ProcedureTableStatistics) -> Iterable[None]:
+        """Fill the table with data generated in batches.
+
+        Yield after each processed batch.
+        """
+        while stats.expects_next_row:
+            size = stats.next_batch_size(self._batch_size)
+            batch = self._make_batch(generators, size, self._database)
+            self._insert_batch(meta_table, self._batch_rows(batch, size), generators, table_db, stats)
+            yield
+
+    def _insert_batch(self,
+                      meta_table: MetaTable,
+                      rows: Iterable[GeneratedRow],
+                      generators: GeneratorList,
+                      table_db: GeneratedTable,
+                      stats: ProcedureTableStatistics):
+        """Check the rows and insert those passing the check in bulk
+        using the output driver. Then repair and insert the rejected rows
+        one by one, like in the row mode. Update the statistics.
+        """
+        rows = list(rows)
+        checked_rows = self._checker.check_batch(meta_table, rows)
+        passing_ids = {id(row) for row in checked_rows}
+        rejected_rows = [row for row in rows if id(row) not in passing_ids]
+        insertion_results = self._output_driver.insert_rows(checked_rows)
+        for row, insertion_result in zip(checked_rows, insertion_results):
             if insertion_result is None:
                 stats.fail_insert()
                 continue
             stats.succeed_insert()
             table_db.append(row)
             self._checker.register_row(meta_table, row)
-            yield row
+        for row in rejected_rows:
+            self._try_insert_row(meta_table, row, generators, table_db, stats)
 
-    def _make_row(self, generators: GeneratorList) -> GeneratedRow:
+    def _try_insert_row(self,
+                        meta_table: MetaTable,
+                        row: GeneratedRow,
+                        generators: GeneratorList,
+                        table_db: GeneratedTable,
+                        stats: ProcedureTableStatistics) -> bool:
+        """Check the row, repairing it if possible, and insert it using the output driver.
+        Update the statistics and return whether the row was inserted.
+        """
+        if not self._repair_row(meta_table, row, generators, self._database, self._checker, stats):
+            stats.fail_check()
+            return False
+        insertion_result = self._output_driver.insert_row(row)
+        if insertion_result is None:
+            stats.fail_insert()
+            return False
+        stats.succeed_insert()
+        table_db.append(row)
+        self._checker.register_row(meta_table, row)
+        return True
+
+    def _repair_row(self,
+                    meta_table: MetaTable,
+                    row: GeneratedRow,
+                    generators: GeneratorList,
+                    database: GeneratedDatabase,
+                    checker: ConstraintChecker,
+                    stats: ProcedureTableStatistics) -> bool:
+        """Check the row and return whether it satisfies each constraint.
+
+        While some constraint is violated, only the generators of its columns
+        generate their values again, the rest of the row is kept.
+        The regenerations are counted by constraint and limited by the retry limit.
+        """
+        violation = checker.find_violation(meta_table, row)
+        retry_count = 0
+        while violation is not None:
+            violating_generators = self._violating_generators(generators, violation)
+            if retry_count >= stats.retry_limit or not violating_generators:
+                return False
+            stats.retry(violation.constraint_name)
+            for generator in violating_generators:
+                row.update(generator.make_dict(database))
+            retry_count += 1
+            violation = checker.find_violation(meta_table, row)
+        return True
+
+    def _violating_generators(self, generators: GeneratorList, violation: Violation) -> GeneratorList:
+        """Return the generators of the columns of the violated constraint.
+
+        Return an empty list if some of the columns is not generated here.
+        """
+        violating_generators = []
+        for generator in generators:
+            if not any(meta_column.name in violation.column_names for meta_column in generator.setting.columns):
+                continue
+            if generator.is_database_generated and self._output_driver.is_interactive:
+                return []
+            violating_generators.append(generator)
+        return violating_generators
+
+    def _make_row(self, generators: GeneratorList, database: GeneratedDatabase) -> GeneratedRow:
         """Using the given list of generators, generate the row.
         Take driver interactivity into account.
         """
         row: GeneratedRow = {}
         for generator in generators:
             if not generator.is_database_generated or not self._output_driver.is_interactive:
-                generated = generator.make_dict(self._database)
+                generated = generator.make_dict(database)
                 row.update(generated)
         return row
 
+    def _make_batch(self, generators: GeneratorList, size: int, database: GeneratedDatabase) -> GeneratedBatch:
+        """Using the given list of generators, generate column chunks
+        of given size. Take driver interactivity into account.
+        """
+        batch: GeneratedBatch = {}
+        for generator in generators:
+            if not generator.is_database_generated or not self._output_driver.is_interactive:
+                generated = generator.make_batch(size, database)
+                batch.update(generated)
+        return batch
+
+    @staticmethod
+    def _batch_rows(batch: GeneratedBatch, size: int) -> Iterable[GeneratedRow]:
+        """Lazily assemble rows from the column chunks."""
+        column_names = list(batch.keys())
+        if not column_names:
+            for _ in range(size):
+                yield {}
+            return
+        for values in zip(*batch.values()):
+            yield dict(zip(column_names, values))
+
     @staticmethod
     def seed_all(instances: GeneratorList, seed: Optional[int]):
         """Seed all generator instances in a list with a random seed,
@@ -108,13 +594,18 @@ class ProcedureController:
 
         None means to use a source of randomness provided by the OS.
         """
+        for instance, instance_seed in zip(instances, ProcedureController.generator_seeds(len(instances), seed)):
+            instance.seed(instance_seed)
+
+    @staticmethod
+    def generator_seeds(count: int, seed: Optional[int]) -> List[Optional[float]]:
+        """Return the seeds of the given number of generator instances,
+        derived from the input seed. None derives Nones.
+        """
         if seed is None:
-            for instance in instances:
-                instance.seed(None)
-        else:
-            random_inst = random.Random(seed)
-            for instance in instances:
-                instance.seed(random_inst.random())
+            return [None] * count
+        random_inst = random.Random(seed)
+        return [random_inst.random() for _ in range(count)]
 
     @staticmethod
     def instances_from_table(meta_table: MetaTable) -> GeneratorList:
@@ -1,4 +1,15 @@
-from typing import Dict, Any, List
+import os
+import sqlite3
+import tempfile
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Iterator
+
+from core.model.meta_constraint import MetaConstraint
+from core.service.exception import SomeError
+from core.service.generation_procedure.reference_index import ReferenceIndex
+from core.service.injector import HasCleanUp
+from core.service.types import Types
 
 GeneratedRow = Dict[str, Any]
 """Dictionary of generated values in a single row.
@@ -7,25 +18,290 @@ Keys are column names. Their respective values are the generated
 values for the column.
 """
 
-GeneratedTable = List[GeneratedRow]
-"""List of generated rows in a table."""
+GeneratedBatch = Dict[str, List[Any]]
+"""Dictionary of generated column chunks.
+
+Keys are column names. Their respective values are lists of generated
+values of equal length, one value per row.
+"""
+
+KeptColumns = Optional[Dict[str, Types]]
+"""Types of the columns kept by a generated table, by column names.
+
+None means that whole rows are kept.
+"""
+
+
+class GeneratedTable(ABC):
+    """Sequence of generated rows in a table.
+
+    Depending on the kept columns, the stored rows may contain
+    only a subset of the generated columns.
+    """
+
+    def __init__(self, kept_columns: KeptColumns):
+        self._kept_columns = kept_columns
+
+    @abstractmethod
+    def append(self, row: GeneratedRow):
+        """Store a generated row."""
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Return the number of stored rows."""
+        pass
+
+    @abstractmethod
+    def __getitem__(self, index: int) -> GeneratedRow:
+        """Return the stored row at the index."""
+        pass
+
+    def __iter__(self) -> Iterator[GeneratedRow]:
+        """Iterate over the stored rows."""
+        for index in range(len(self)):
+            yield self[index]
+
+    def close(self):
+        """Release the resources held by the table."""
+        pass
+
+
+class RowTable(GeneratedTable):
+    """Keep the rows in a list of dictionaries in memory."""
+
+    def __init__(self, kept_columns: KeptColumns):
+        super().__init__(kept_columns)
+        self._rows: List[GeneratedRow] = []
+
+    def append(self, row: GeneratedRow):
+        if self._kept_columns is not None:
+            row = {name: row[name] for name in self._kept_columns}
+        self._rows.append(row)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __getitem__(self, index: int) -> GeneratedRow:
+        return self._rows[index]
+
+
+class ColumnarTable(GeneratedTable):
+    """Keep the columns in lists of values in memory."""
+
+    def __init__(self, kept_columns: KeptColumns):
+        super().__init__(kept_columns)
+        self._columns: Dict[str, List[Any]] = {}
+        self._count = 0
+        if kept_columns is not None:
+            self._columns = {name: [] for name in kept_columns}
+
+    def append(self, row: GeneratedRow):
+        if self._kept_columns is None:
+            for name in row:
+                # whole rows are kept, columns may show up in the first row only
+                self._columns.setdefault(name, [None] * self._count)
+        for name, column in self._columns.items():
+            column.append(row.get(name))
+        self._count += 1
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> GeneratedRow:
+        if not -self._count <= index < self._count:
+            raise IndexError('generated table index out of range')
+        return {name: column[index] for name, column in self._columns.items()}
+
+
+class SqliteTable(GeneratedTable):
+    """Keep the columns in a table of an SQLite database on disk.
+
+    The rows are appended in buffered bulk inserts. Whole rows cannot be kept,
+    because the column types must be known upfront.
+    """
+
+    buffer_size = 1000
+    """How many rows are buffered before they are written to the database."""
+
+    def __init__(self, kept_columns: KeptColumns, conn: sqlite3.Connection, sql_name: str):
+        if kept_columns is None:
+            raise SomeError('The disk storage requires a list of kept columns')
+        super().__init__(kept_columns)
+        self._conn = conn
+        self._sql_name = sql_name
+        self._names = list(kept_columns)
+        self._types = [kept_columns[name] for name in self._names]
+        self._buffer: List[tuple] = []
+        self._count = 0
+        if self._names:
+            columns = ', '.join('c{}'.format(index) for index in range(len(self._names)))
+            self._conn.execute('CREATE TABLE {} ({})'.format(self._sql_name, columns))
+            placeholders = ', '.join('?' for _ in self._names)
+            self._insert_sql = 'INSERT INTO {} VALUES ({})'.format(self._sql_name, placeholders)
+            self._select_sql = 'SELECT {} FROM {} WHERE rowid = ?'.format(columns, self._sql_name)
+
+    @staticmethod
+    def _encode(value: Any) -> Any:
+        """Convert a value to a type supported by SQLite."""
+        if isinstance(value, datetime):
+            return value.isoformat()
+        return value
+
+    @staticmethod
+    def _decode(value: Any, type_literal: Types) -> Any:
+        """Convert a value read from SQLite back to the column type."""
+        if value is None:
+            return None
+        if type_literal == Types.DATETIME:
+            return datetime.fromisoformat(value)
+        if type_literal == Types.BOOL:
+            return bool(value)
+        return value
 
+    def _flush(self):
+        """Write the buffered rows to the database."""
+        if self._buffer:
+            self._conn.executemany(self._insert_sql, self._buffer)
+            self._buffer.clear()
 
-class GeneratedDatabase:
-    """Data structure holding the generated database."""
+    def append(self, row: GeneratedRow):
+        self._count += 1
+        if not self._names:
+            return
+        self._buffer.append(tuple(self._encode(row[name]) for name in self._names))
+        if len(self._buffer) >= self.buffer_size:
+            self._flush()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> GeneratedRow:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError('generated table index out of range')
+        if not self._names:
+            return {}
+        self._flush()
+        # rows are never deleted, so the row IDs are sequential starting from 1
+        values = self._conn.execute(self._select_sql, (index + 1,)).fetchone()
+        return {
+            name: self._decode(value, type_literal)
+            for name, type_literal, value in zip(self._names, self._types, values)
+        }
+
+
+class TableStorage(ABC):
+    """Creates generated tables of a particular storage type."""
+
+    name: str
+    """Identifier of the storage type, which makes it available from CLI."""
+
+    @abstractmethod
+    def make_table(self, table_name: str, kept_columns: KeptColumns) -> GeneratedTable:
+        """Create and return an empty table."""
+        pass
+
+    def clean_up(self):
+        """Release the resources held by the storage."""
+        pass
+
+    @staticmethod
+    def get_storage_names() -> List[str]:
+        """Return list of storage type identifiers."""
+        return [storage.name for storage in TableStorage.__subclasses__()]
+
+    @staticmethod
+    def make_storage(name: str) -> 'TableStorage':
+        """Make a storage from its identifier."""
+        for storage in TableStorage.__subclasses__():
+            if storage.name == name:
+                return storage()
+        raise SomeError('Invalid storage name')
+
+
+class RowStorage(TableStorage):
+    """Store the rows as dictionaries in memory."""
+
+    name = 'rows'
+
+    def make_table(self, table_name: str, kept_columns: KeptColumns) -> GeneratedTable:
+        return RowTable(kept_columns)
+
+
+class ColumnarStorage(TableStorage):
+    """Store the columns as lists of values in memory."""
+
+    name = 'columnar'
+
+    def make_table(self, table_name: str, kept_columns: KeptColumns) -> GeneratedTable:
+        return ColumnarTable(kept_columns)
+
+
+class SqliteStorage(TableStorage):
+    """Store the kept columns in a temporary SQLite database on disk.
+
+    Tables keeping whole rows are stored in memory instead.
+    """
+
+    name = 'disk'
 
     def __init__(self):
-        self._tables = {}
+        self._db_fd, self._db_file = tempfile.mkstemp()
+        self._conn = sqlite3.connect(self._db_file)
+        self._table_count = 0
+
+    def make_table(self, table_name: str, kept_columns: KeptColumns) -> GeneratedTable:
+        if kept_columns is None:
+            return ColumnarTable(kept_columns)
+        self._table_count += 1
+        sql_name = 't{}'.format(self._table_count)
+        return SqliteTable(kept_columns, self._conn, sql_name)
+
+    def clean_up(self):
+        if self._conn is None:
+            return
+        self._conn.close()
+        self._conn = None
+        os.close(self._db_fd)
+        os.unlink(self._db_file)
+
+
+class GeneratedDatabase(HasCleanUp):
+    """Data structure holding the generated database.
+
+    The tables are created by the storage, rows are kept in memory by default.
+    The keys referenced by foreign keys are also available in reference indexes.
+    """
+
+    def __init__(self, storage: Optional[TableStorage] = None):
+        self._storage = storage if storage is not None else RowStorage()
+        self._tables: Dict[str, GeneratedTable] = {}
+        self._reference_indexes: Dict[MetaConstraint, ReferenceIndex] = {}
 
     def get_table(self, table_name: str) -> GeneratedTable:
         """Return generated table by name."""
         return self._tables[table_name]
 
-    def add_table(self, table_name: str) -> GeneratedTable:
-        """Add an empty table by name."""
-        self._tables[table_name] = []
+    def add_table(self, table_name: str, kept_columns: KeptColumns = None) -> GeneratedTable:
+        """Add an empty table by name.
+
+        The table keeps only the given columns, or whole rows in case of None.
+        """
+        self._tables[table_name] = self._storage.make_table(table_name, kept_columns)
         return self._tables[table_name]
 
+    def add_reference_index(self, constraint: MetaConstraint, reference_index: ReferenceIndex):
+        """Register the index of keys referenced by a FOREIGN constraint."""
+        self._reference_indexes[constraint] = reference_index
+
+    def get_reference_index(self, constraint: MetaConstraint) -> Optional[ReferenceIndex]:
+        """Return the index of keys referenced by a FOREIGN constraint,
+        or None if it is not registered.
+        """
+        return self._reference_indexes.get(constraint)
+
     def get_table_row_count(self, table_name: str) -> int:
         """Return the number of rows in a table by name.
 
@@ -35,10 +311,19 @@ class GeneratedDatabase:
             return 0
         return len(self._tables[table_name])
 
-    def get_dict(self) -> Dict[str, GeneratedTable]:
+    def get_dict(self) -> Dict[str, List[GeneratedRow]]:
         """Get the data structure as a python object."""
-        return self._tables
+        return {
+            table_name: list(table)
+            for table_name, table in self._tables.items()
+        }
 
     def __contains__(self, table_name: str) -> bool:
         """Is the table with this name registered?"""
         return table_name in self._tables
+
+    def clean_up(self):
+        """Close the tables and release the storage."""
+        for table in self._tables.values():
+            table.close()
+        self._storage.clean_up()
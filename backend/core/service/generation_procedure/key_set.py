@@ -0,0 +1,453 @@
+import math
+import os
+import pickle
+import sqlite3
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from array import array
+from datetime import datetime
+from typing import Tuple, Optional, List, Set
+
+from core.service.exception import SomeError
+from core.service.generation_procedure.statistics import KeyFilterStatistics
+
+
+class KeySet(ABC):
+    """Set of unique key tuples of a constraint."""
+
+    @abstractmethod
+    def add(self, key: Tuple):
+        """Add the key tuple."""
+        pass
+
+    @abstractmethod
+    def __contains__(self, key: Tuple) -> bool:
+        """Is the key tuple present?"""
+        pass
+
+    def contains_many(self, keys: List[Tuple]) -> List[bool]:
+        """Return whether each of the key tuples is present."""
+        return [key in self for key in keys]
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Return the number of added key tuples."""
+        pass
+
+
+class TupleKeySet(KeySet):
+    """Keep the key tuples in a set in memory."""
+
+    def __init__(self):
+        self._keys: Set[Tuple] = set()
+
+    def add(self, key: Tuple):
+        self._keys.add(key)
+
+    def __contains__(self, key: Tuple) -> bool:
+        return key in self._keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+class HashedKeySet(KeySet):
+    """Keep the key tuples pickled in a byte arena, indexed by an open
+    addressing table of their 64-bit hashes.
+
+    Each key takes the size of its pickle and 24 to 32 bytes. A hash match
+    is confirmed by comparing the pickles, so distinct keys with equal hashes
+    are told apart. Keys are equal if their pickles are, the values
+    of a column are expected to be of a single type.
+    """
+
+    _EMPTY = -1
+    """Marks an empty slot."""
+
+    def __init__(self):
+        self._slots = array('q', [self._EMPTY]) * 16
+        """Key indexes, placed by the key hashes."""
+        self._hashes = array('q')
+        """Hash of each key, by key index."""
+        self._ends = array('q')
+        """End offset of each key in the arena, by key index."""
+        self._arena = bytearray()
+        """The pickled keys."""
+
+    @staticmethod
+    def _encode(key: Tuple) -> bytes:
+        """Return the pickle of the key tuple."""
+        return pickle.dumps(key, pickle.HIGHEST_PROTOCOL)
+
+    def _key_bytes(self, index: int) -> bytes:
+        """Return the pickle of the key with the given index."""
+        start = self._ends[index - 1] if index > 0 else 0
+        return bytes(self._arena[start:self._ends[index]])
+
+    def _find(self, value: int, encoded: bytes) -> int:
+        """Return the slot holding the key, or the empty slot for it."""
+        slots = self._slots
+        mask = len(slots) - 1
+        position = value & mask
+        while slots[position] != self._EMPTY:
+            index = slots[position]
+            if self._hashes[index] == value and self._key_bytes(index) == encoded:
+                break
+            position = (position + 1) & mask
+        return position
+
+    def _grow(self):
+        """Double the number of slots and place the keys again."""
+        slots = array('q', [self._EMPTY]) * (2 * len(self._slots))
+        mask = len(slots) - 1
+        for index, value in enumerate(self._hashes):
+            position = value & mask
+            while slots[position] != self._EMPTY:
+                position = (position + 1) & mask
+            slots[position] = index
+        self._slots = slots
+
+    def add(self, key: Tuple):
+        value = hash(key)
+        encoded = self._encode(key)
+        position = self._find(value, encoded)
+        if self._slots[position] != self._EMPTY:
+            return
+        self._slots[position] = len(self._hashes)
+        self._hashes.append(value)
+        self._arena += encoded
+        self._ends.append(len(self._arena))
+        if 2 * len(self._hashes) > len(self._slots):
+            self._grow()
+
+    def __contains__(self, key: Tuple) -> bool:
+        position = self._find(hash(key), self._encode(key))
+        return self._slots[position] != self._EMPTY
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+
+class CompactKeySet(KeySet):
+    """Keep single integer keys in a bitmap, other keys in a hashed arena.
+
+    The bitmap covers the range between the smallest and the largest key,
+    one bit per value. Once a key is not a single integer, or the range
+    gets much sparser than the keys, the keys move to a HashedKeySet.
+    """
+
+    sparsity_limit = 64
+    """Maximum number of bitmap bits per key, before switching to the hashed arena."""
+
+    def __init__(self):
+        self._bitmap: Optional[bytearray] = bytearray()
+        self._offset = 0
+        self._count = 0
+        self._hashed: Optional[HashedKeySet] = None
+
+    @staticmethod
+    def _as_int(key: Tuple) -> Optional[int]:
+        """Return the integer of a single integer key, None otherwise."""
+        if len(key) != 1 or type(key[0]) is not int:
+            return None
+        return key[0]
+
+    def _to_hashed(self):
+        """Move the keys from the bitmap to a hashed key set."""
+        self._hashed = HashedKeySet()
+        for byte_index, byte in enumerate(self._bitmap):
+            for bit in range(8):
+                if byte & (1 << bit):
+                    self._hashed.add((self._offset + 8 * byte_index + bit,))
+        self._bitmap = None
+
+    def _is_too_sparse(self, value: int) -> bool:
+        """Would the bitmap covering the value be too sparse for one more key?
+
+        Checked before extending the bitmap, so that a distant key
+        does not allocate a huge bitmap.
+        """
+        if not self._bitmap:
+            return False
+        start = min(self._offset, value)
+        end = max(self._offset + 8 * len(self._bitmap), value + 1)
+        return end - start > self.sparsity_limit * max(self._count + 1, 1024)
+
+    def _cover(self, value: int):
+        """Extend the bitmap so that it covers the value."""
+        if not self._bitmap:
+            self._offset = value - value % 8
+            self._bitmap = bytearray(1)
+        if value < self._offset:
+            # grow at least twice, so that descending keys take amortized O(1)
+            missing = max((self._offset - value + 7) // 8, len(self._bitmap))
+            self._bitmap[0:0] = bytes(missing)
+            self._offset -= 8 * missing
+        end = self._offset + 8 * len(self._bitmap)
+        if value >= end:
+            self._bitmap.extend(bytes((value - end) // 8 + 1))
+
+    def add(self, key: Tuple):
+        if self._bitmap is not None:
+            value = self._as_int(key)
+            if value is None:
+                self._to_hashed()
+            elif self._is_too_sparse(value):
+                self._to_hashed()
+            else:
+                if key in self:
+                    return
+                self._cover(value)
+                position = value - self._offset
+                self._bitmap[position // 8] |= 1 << (position % 8)
+                self._count += 1
+                if 8 * len(self._bitmap) > self.sparsity_limit * max(self._count, 1024):
+                    self._to_hashed()
+                return
+        self._hashed.add(key)
+
+    def __contains__(self, key: Tuple) -> bool:
+        if self._bitmap is None:
+            return key in self._hashed
+        value = self._as_int(key)
+        if value is None:
+            return False
+        position = value - self._offset
+        if not 0 <= position < 8 * len(self._bitmap):
+            return False
+        return bool(self._bitmap[position // 8] & (1 << (position % 8)))
+
+    def __len__(self) -> int:
+        if self._bitmap is None:
+            return len(self._hashed)
+        return self._count
+
+
+class SqliteKeySet(KeySet):
+    """Keep the key tuples in a table of an SQLite database on disk.
+
+    The added keys are buffered and written in bulk inserts.
+    Keys already present are not added again.
+    """
+
+    buffer_size = 1000
+    """How many keys are buffered before they are written to the database."""
+
+    def __init__(self, conn: sqlite3.Connection, sql_name: str):
+        self._conn = conn
+        self._sql_name = sql_name
+        self._buffer: Set[Tuple] = set()
+        self._width: Optional[int] = None
+        self._count = 0
+
+    @staticmethod
+    def _encode(key: Tuple) -> Tuple:
+        """Convert the key values to types supported by SQLite."""
+        return tuple(
+            value.isoformat() if isinstance(value, datetime) else value
+            for value in key
+        )
+
+    def _create(self, width: int):
+        """Create the table for keys of the given width."""
+        self._width = width
+        columns = ', '.join('c{}'.format(index) for index in range(width))
+        # the keys may contain None values, which a unique index would consider distinct
+        self._conn.execute('CREATE TABLE {} ({})'.format(self._sql_name, columns))
+        self._conn.execute('CREATE INDEX {}_keys ON {} ({})'.format(self._sql_name, self._sql_name, columns))
+        placeholders = ', '.join('?' for _ in range(width))
+        self._insert_sql = 'INSERT INTO {} VALUES ({})'.format(self._sql_name, placeholders)
+        condition = ' AND '.join('c{} IS ?'.format(index) for index in range(width))
+        self._select_sql = 'SELECT 1 FROM {} WHERE {}'.format(self._sql_name, condition)
+
+    def _flush(self):
+        """Write the buffered keys to the database."""
+        if self._buffer:
+            self._conn.executemany(self._insert_sql, self._buffer)
+            self._buffer.clear()
+
+    def add(self, key: Tuple):
+        key = self._encode(key)
+        if self._width is None:
+            self._create(len(key))
+        if key in self._buffer or key in self:
+            return
+        self._buffer.add(key)
+        self._count += 1
+        if len(self._buffer) >= self.buffer_size:
+            self._flush()
+
+    def __contains__(self, key: Tuple) -> bool:
+        if self._width is None:
+            return False
+        key = self._encode(key)
+        if key in self._buffer:
+            return True
+        return self._conn.execute(self._select_sql, key).fetchone() is not None
+
+    def __len__(self) -> int:
+        return self._count
+
+
+class BloomFilter:
+    """Bit array answering whether a key was possibly added, or definitely not.
+
+    The probed bits are derived from the key hash by double hashing.
+    """
+
+    bits_per_key = 10
+    """Number of bits per expected key, giving about 1% false positives."""
+
+    def __init__(self, expected_count: int):
+        bit_count = max(self.bits_per_key * expected_count, 64)
+        self._bits = bytearray((bit_count + 7) // 8)
+        self._bit_count = 8 * len(self._bits)
+        self._probe_count = max(round(self.bits_per_key * math.log(2)), 1)
+
+    @property
+    def byte_count(self) -> int:
+        """Return the size of the bit array."""
+        return len(self._bits)
+
+    def _positions(self, key: Tuple) -> List[int]:
+        """Return the positions of the probed bits."""
+        value = hash(key) & 0xFFFFFFFFFFFFFFFF
+        first, second = value & 0xFFFFFFFF, (value >> 32) | 1
+        return [(first + probe * second) % self._bit_count for probe in range(self._probe_count)]
+
+    def add(self, key: Tuple):
+        """Set the bits of the key."""
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: Tuple) -> bool:
+        """Are all bits of the key set?"""
+        for position in self._positions(key):
+            if not self._bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+
+class FilteredKeySet(KeySet):
+    """Key set with a Bloom filter in front of it.
+
+    A key missing in the filter is definitely new, only possible hits
+    consult the exact key set. The lookups are counted in the statistics.
+    The lookups are timed per call of contains_many, and one in sample_interval
+    single lookups is timed, so that the timing stays out of the hot path.
+    """
+
+    sample_interval = 64
+    """Every how many single lookups one is timed."""
+
+    def __init__(self, key_set: KeySet, expected_count: int):
+        self._key_set = key_set
+        self._filter = BloomFilter(expected_count)
+        self.statistics = KeyFilterStatistics(self._filter.byte_count)
+        """Lookup counts, throughput and memory of the filter."""
+
+    def add(self, key: Tuple):
+        self._filter.add(key)
+        self._key_set.add(key)
+
+    def __contains__(self, key: Tuple) -> bool:
+        statistics = self.statistics
+        if statistics.lookup_count % self.sample_interval == 0:
+            start = time.perf_counter()
+            result = self._lookup(key)
+            statistics.time_lookups(1, time.perf_counter() - start)
+            return result
+        return self._lookup(key)
+
+    def contains_many(self, keys: List[Tuple]) -> List[bool]:
+        start = time.perf_counter()
+        result = [self._lookup(key) for key in keys]
+        self.statistics.time_lookups(len(keys), time.perf_counter() - start)
+        return result
+
+    def _lookup(self, key: Tuple) -> bool:
+        """Test the key against the filter and the key set, count the lookup."""
+        statistics = self.statistics
+        statistics.lookup_count += 1
+        if key not in self._filter:
+            statistics.filtered_count += 1
+            result = False
+        else:
+            result = key in self._key_set
+            if not result:
+                statistics.false_positive_count += 1
+        return result
+
+    def __len__(self) -> int:
+        return len(self._key_set)
+
+
+class KeyStorage(ABC):
+    """Creates key sets of a particular storage type."""
+
+    name: str
+    """Identifier of the storage type, which makes it available from CLI."""
+
+    @abstractmethod
+    def make_key_set(self) -> KeySet:
+        """Create and return an empty key set."""
+        pass
+
+    def clean_up(self):
+        """Release the resources held by the storage."""
+        pass
+
+    @staticmethod
+    def get_storage_names() -> List[str]:
+        """Return list of storage type identifiers."""
+        return [storage.name for storage in KeyStorage.__subclasses__()]
+
+    @staticmethod
+    def make_storage(name: str) -> 'KeyStorage':
+        """Make a storage from its identifier."""
+        for storage in KeyStorage.__subclasses__():
+            if storage.name == name:
+                return storage()
+        raise SomeError('Invalid key storage name')
+
+
+class TupleKeyStorage(KeyStorage):
+    """Store the key tuples in sets in memory."""
+
+    name = 'tuples'
+
+    def make_key_set(self) -> KeySet:
+        return TupleKeySet()
+
+
+class CompactKeyStorage(KeyStorage):
+    """Store the keys in bitmaps or pickled in a hashed arena in memory."""
+
+    name = 'compact'
+
+    def make_key_set(self) -> KeySet:
+        return CompactKeySet()
+
+
+class SqliteKeyStorage(KeyStorage):
+    """Store the key tuples in a temporary SQLite database on disk."""
+
+    name = 'disk'
+
+    def __init__(self):
+        self._db_fd, self._db_file = tempfile.mkstemp()
+        self._conn = sqlite3.connect(self._db_file)
+        self._set_count = 0
+
+    def make_key_set(self) -> KeySet:
+        self._set_count += 1
+        return SqliteKeySet(self._conn, 'k{}'.format(self._set_count))
+
+    def clean_up(self):
+        if self._conn is None:
+            return
+        self._conn.close()
+        self._conn = None
+        os.close(self._db_fd)
+        os.unlink(self._db_file)
@@ -0,0 +1,150 @@
+import multiprocessing
+from dataclasses import dataclass, field
+from typing import List, Dict, Callable, Optional, Tuple, Any
+
+from core.service.generation_procedure.database import GeneratedRow
+from core.service.generation_procedure.reference_index import ReferenceIndex
+from core.service.generation_procedure.statistics import KeyFilterStatistics
+
+
+@dataclass
+class ShardPosition:
+    """Position of a shard among the shards of its table.
+
+    Maps the draws of a shard to numbers in a sequence shared by the whole table,
+    so that the shards never share a number. The first draws of each shard
+    take consecutive numbers following the requested rows of the preceding shards,
+    so that a table requesting as many rows as the sequence has numbers
+    takes each number once. The draws replacing rejected rows take every
+    shard_count-th number after the requested rows of all shards.
+    """
+
+    first_row: int
+    """Number of rows requested from the preceding shards."""
+
+    row_count: int
+    """Number of rows requested from the shard."""
+
+    table_row_count: int
+    """Number of rows requested from the whole table."""
+
+    shard_index: int
+    """Index of the shard in its table."""
+
+    shard_count: int
+    """Number of shards of the table."""
+
+    @classmethod
+    def whole_table(cls, row_count: int) -> 'ShardPosition':
+        """Return the position of a table generated in a single shard."""
+        return cls(0, row_count, row_count, 0, 1)
+
+    @classmethod
+    def after_shards(cls, table_row_count: int, shard_count: int, max_draw_count: int) -> 'ShardPosition':
+        """Return the position of an extra shard, whose draws follow all the numbers,
+        which the given shards drawing at most max_draw_count times each could take.
+        """
+        first_number = table_row_count + shard_count * max(max_draw_count - 1, 0)
+        return cls(0, 0, first_number, 0, 1)
+
+    def sequence_number(self, draw: int) -> int:
+        """Return the number in the table sequence of the draw of the shard, counted from 0."""
+        if draw < self.row_count:
+            return self.first_row + draw
+        return self.table_row_count + self.shard_index + (draw - self.row_count) * self.shard_count
+
+
+@dataclass
+class TableShard:
+    """Part of a table generated by a single task."""
+
+    table_name: str
+    """The name of the table."""
+
+    row_count: int
+    """How many rows should be generated in the shard."""
+
+    seed: Optional[int]
+    """Primary seed for the column generators."""
+
+    position: ShardPosition
+    """Position of the shard among the shards of the table."""
+
+    table_seed: Optional[int]
+    """Seed of the whole table, shared by its shards."""
+
+
+ShippedIndexes = Dict[int, ReferenceIndex]
+"""Reference indexes shipped to a worker, by positions of the FOREIGN constraints
+in the constraint list of the generated table.
+"""
+
+GenerationTask = Tuple[Any, ...]
+"""Arguments of a single call of the generating function."""
+
+
+@dataclass
+class TableResult:
+    """Rows generated by a worker, which passed the constraint check,
+    but are not inserted to the output driver yet.
+    """
+
+    rows: List[GeneratedRow]
+    """The generated rows in order of generation."""
+
+    check_failure_count: int
+    """How many generated rows failed the constraint check."""
+
+    retry_counts: Dict[str, int] = field(default_factory=dict)
+    """Number of column regenerations by the violated constraint name."""
+
+    key_filters: Dict[str, KeyFilterStatistics] = field(default_factory=dict)
+    """Statistics of the filtered key sets of the table by constraint name."""
+
+
+_forked_generate: Optional[Callable[..., TableResult]] = None
+"""The generating function, inherited by the forked worker processes."""
+
+
+def _run_task(task: GenerationTask) -> TableResult:
+    """Entry point of a worker process."""
+    return _forked_generate(*task)
+
+
+class WorkerPool:
+    """Run generation tasks in forked worker processes.
+
+    The generating function is inherited by the workers on fork, so that
+    only the task arguments and the results must be pickled.
+    If there is a single worker, or the platform cannot fork,
+    the tasks run in the current process instead, with the same results.
+    """
+
+    def __init__(self, generate: Callable[..., TableResult], workers: int):
+        self._generate = generate
+        self._pool: Optional[multiprocessing.pool.Pool] = None
+        if workers > 1 and 'fork' in multiprocessing.get_all_start_methods():
+            global _forked_generate
+            _forked_generate = generate
+            self._pool = multiprocessing.get_context('fork').Pool(workers)
+
+    def map(self, tasks: List[GenerationTask]) -> List[TableResult]:
+        """Run the tasks and return their results in the same order."""
+        if self._pool is None:
+            return [self._generate(*task) for task in tasks]
+        return self._pool.map(_run_task, tasks, chunksize=1)
+
+    def close(self):
+        """Terminate the worker processes."""
+        global _forked_generate
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+        _forked_generate = None
+
+    def __enter__(self) -> 'WorkerPool':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
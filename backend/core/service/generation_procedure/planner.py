@@ -0,0 +1,229 @@
+import math
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set
+
+from core.model.generator_setting import GeneratorSetting
+from core.model.meta_constraint import MetaConstraint
+from core.model.meta_table import MetaTable
+from core.model.project import Project
+from core.service.column_generator.base import ColumnGenerator
+from core.service.column_generator.basic_generator.special import ForeignKeyGenerator
+from core.service.column_generator.setting_facade import GeneratorSettingFacade, GeneratorList
+from core.service.exception import SomeError, RequisitionInfeasibleError
+from core.service.generation_procedure.constraint_checker import qualified_constraint_name
+from core.service.generation_procedure.requisition import ExportRequisition
+from core.service.generation_procedure.sorted_tables import SortedTables
+from core.service.generation_procedure.statistics import ProcedureTableStatistics
+
+
+@dataclass
+class PlanIssue:
+    """Constraint, which likely prevents generating the requested rows of a table."""
+
+    table_name: str
+    """Name of the constrained table."""
+
+    constraint_name: str
+    """Name of the constraint, prefixed by the table name."""
+
+    message: str
+    """Description of the issue."""
+
+    def __str__(self) -> str:
+        return '{}: {}'.format(self.constraint_name, self.message)
+
+
+@dataclass
+class RequisitionPlan:
+    """Result of the requisition planning."""
+
+    expected_counts: Dict[str, int] = field(default_factory=dict)
+    """Number of rows expected to be generated, by table name."""
+
+    issues: List[PlanIssue] = field(default_factory=list)
+    """Constraints, which likely prevent generating the requested rows."""
+
+    unique_settings: Set[GeneratorSetting] = field(default_factory=set)
+    """Generator settings, whose generators should run in the unique mode."""
+
+    def apply(self, generators: GeneratorList):
+        """Switch the generators to the planned unique modes,
+        without changing their settings.
+        """
+        for generator in generators:
+            if generator.setting in self.unique_settings:
+                generator.unique = True
+
+
+class RequisitionPlanner:
+    """Estimate, before the generation, whether the requested row counts
+    can be met under the UNIQUE and PRIMARY constraints.
+
+    The number of distinct keys of a constraint is the product of the domain
+    sizes of the generators of its columns. The domain of a foreign key
+    generator is the number of rows expected in the referenced table,
+    so the tables are planned in the order of their dependencies.
+    A constraint is an issue, if it has fewer distinct keys than requested rows,
+    or if random draws are expected to collide more often than the tolerated
+    number of attempts and retries allows.
+
+    In the warn mode, the issues are only reported. In the strict mode,
+    an error is raised if there is any. In the auto mode, the generators
+    supporting it are switched to the unique mode where it resolves the collisions,
+    only the remaining issues are reported.
+    """
+
+    WARN = 'warn'
+    STRICT = 'strict'
+    AUTO = 'auto'
+
+    modes = [WARN, STRICT, AUTO]
+    """Identifiers of the planning modes."""
+
+    def __init__(self, project: Project, requisition: ExportRequisition, interactive_driver: bool, repairs: bool):
+        self._project = project
+        self._requisition = requisition
+        self._interactive_driver = interactive_driver
+        """Is the driver interactive?"""
+        self._repairs = repairs
+        """Are the rows violating a constraint repaired by retries?"""
+        self._plan = RequisitionPlan()
+
+    def plan(self, mode: str) -> RequisitionPlan:
+        """Plan the requisition in the given mode and return the plan."""
+        if mode not in self.modes:
+            raise SomeError('Invalid planning mode')
+        self._plan = RequisitionPlan()
+        sorted_tables = SortedTables(self._project.tables, self._requisition)
+        for meta_table in sorted_tables.get_order():
+            self._plan_table(meta_table, mode == self.AUTO)
+        if mode == self.STRICT and self._plan.issues:
+            raise RequisitionInfeasibleError([str(issue) for issue in self._plan.issues])
+        return self._plan
+
+    def _plan_table(self, meta_table: MetaTable, auto: bool):
+        """Check the unique constraints of the table and estimate its row count."""
+        requested_count = self._requisition.number_of_rows(meta_table.name)
+        expected_count = requested_count
+        generators = self._table_generators(meta_table)
+        for constraint in meta_table.constraints:
+            if constraint.constraint_type not in (MetaConstraint.UNIQUE, MetaConstraint.PRIMARY):
+                continue
+            column_names = {meta_column.name for meta_column in constraint.constrained_columns}
+            constraint_generators = [
+                generator
+                for generator in generators
+                if any(meta_column.name in column_names for meta_column in generator.setting.columns)
+            ]
+            if not constraint_generators or any(self._is_database_generated(generator)
+                                                for generator in constraint_generators):
+                continue
+            domain_sizes = [self._domain_size(generator, meta_table) for generator in constraint_generators]
+            if any(domain_size is None for domain_size in domain_sizes):
+                continue
+            required_count = self._required_count(constraint_generators, requested_count)
+            key_count = math.prod(domain_sizes)
+            name = qualified_constraint_name(constraint)
+            if key_count < required_count:
+                expected_count = min(expected_count, requested_count - required_count + key_count)
+                self._report(meta_table, name, 'at most {} distinct keys for {} requested rows'
+                             .format(key_count, requested_count))
+                continue
+            if any(self._is_unique_mode(generator) for generator in constraint_generators):
+                continue
+            draw_count = self._draw_count(constraint_generators, requested_count)
+            distinct_count = self._expected_distinct_count(key_count, draw_count)
+            if distinct_count >= required_count:
+                continue
+            if auto and self._pick_unique_mode(constraint_generators, domain_sizes, required_count):
+                continue
+            expected_count = min(expected_count, requested_count - required_count + math.floor(distinct_count))
+            self._report(meta_table, name, 'about {} distinct keys expected from {} random draws '
+                                           'for {} requested rows'.format(math.floor(distinct_count),
+                                                                          draw_count,
+                                                                          requested_count))
+        self._plan.expected_counts[meta_table.name] = expected_count
+
+    def _report(self, meta_table: MetaTable, constraint_name: str, message: str):
+        """Add an issue of the table to the plan."""
+        self._plan.issues.append(PlanIssue(meta_table.name, constraint_name, message))
+
+    def _table_generators(self, meta_table: MetaTable) -> GeneratorList:
+        """Make generator instances for the generator settings in the table,
+        switched to the unique modes planned so far.
+        """
+        generators = [
+            GeneratorSettingFacade(generator_setting).make_generator_instance()
+            for generator_setting in meta_table.generator_settings
+            if generator_setting.columns
+        ]
+        self._plan.apply(generators)
+        return generators
+
+    def _is_database_generated(self, generator: ColumnGenerator) -> bool:
+        """Are the values generated by the output driver, and not checked?"""
+        return generator.is_database_generated and self._interactive_driver
+
+    def _domain_size(self, generator: ColumnGenerator, meta_table: MetaTable) -> Optional[int]:
+        """Return the domain size of the generator.
+
+        A foreign key generator chooses from the rows expected in the referenced table.
+        The domain is unknown if the referenced table is not in the requisition.
+        """
+        if not isinstance(generator, ForeignKeyGenerator):
+            return generator.domain_size()
+        if generator.constraint is None or not generator.constraint.referenced_columns:
+            return None
+        ref_table = generator.constraint.referenced_columns[0].table
+        if ref_table == meta_table or ref_table.name not in self._requisition:
+            return None
+        if ref_table.name in self._plan.expected_counts:
+            return self._plan.expected_counts[ref_table.name]
+        return self._requisition.number_of_rows(ref_table.name)
+
+    @staticmethod
+    def _required_count(generators: GeneratorList, requested_count: int) -> int:
+        """Return how many distinct keys the requested rows need.
+
+        The key of a single nullable column is None in the null fraction of rows,
+        such keys are not checked for uniqueness.
+        """
+        if len(generators) == 1 and generators[0].supports_null and len(generators[0].setting.columns) == 1:
+            null_frequency = generators[0].setting.null_frequency or 0
+            return math.ceil(requested_count * (1 - null_frequency))
+        return requested_count
+
+    def _draw_count(self, generators: GeneratorList, requested_count: int) -> int:
+        """Return how many keys are drawn at most, within the tolerated attempts and retries."""
+        attempt_count = ProcedureTableStatistics.tolerance_factor * requested_count
+        if self._repairs:
+            attempt_count *= ProcedureTableStatistics.retry_limit + 1
+        return self._required_count(generators, attempt_count)
+
+    @staticmethod
+    def _expected_distinct_count(key_count: int, draw_count: int) -> float:
+        """Return the expected number of distinct keys among uniform random draws."""
+        if key_count >= draw_count ** 2:
+            # fewer than a half of a collision is expected
+            return draw_count
+        return -key_count * math.expm1(-draw_count / key_count)
+
+    @staticmethod
+    def _supports_unique_mode(generator: ColumnGenerator) -> bool:
+        """Does the generator have the unique parameter?"""
+        return any(param.name == 'unique' for param in generator.param_list)
+
+    def _is_unique_mode(self, generator: ColumnGenerator) -> bool:
+        """Does the generator draw its values without replacement?"""
+        return self._supports_unique_mode(generator) and generator.unique
+
+    def _pick_unique_mode(self, generators: GeneratorList, domain_sizes: List[int], required_count: int) -> bool:
+        """Switch a generator of the constraint to the unique mode, if its values
+        alone are enough to make the required keys distinct. Return whether it was switched.
+        """
+        for generator, domain_size in zip(generators, domain_sizes):
+            if self._supports_unique_mode(generator) and domain_size >= required_count:
+                generator.unique = True
+                self._plan.unique_settings.add(generator.setting)
+                return True
+        return False
@@ -0,0 +1,123 @@
+import random
+from array import array
+from typing import Tuple, Optional, List, Any, Sequence
+
+INT64_MIN = -2 ** 63
+INT64_MAX = 2 ** 63 - 1
+UINT64_MASK = 2 ** 64 - 1
+HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+"""Odd multiplier scrambling the hashes, 2 ** 64 divided by the golden ratio."""
+
+
+class ReferenceIndex:
+    """Set of key tuples referenced by a foreign key, supporting random choice.
+
+    The keys are distinct tuples of values of the referenced columns,
+    kept in insertion order. As long as the keys are single 64-bit integers,
+    they are kept in an array instead of a list of tuples.
+    The membership is tested by an open addressing hash table
+    of positions in the key sequence, so that the keys are not stored twice.
+    """
+
+    _EMPTY = -1
+    """Position of an empty slot."""
+
+    def __init__(self):
+        self._int_keys: Optional[array] = array('q')
+        """Integer keys, or None if some key is not a single integer."""
+        self._tuple_keys: Optional[List[Tuple]] = None
+        """Tuple keys, used once some key is not a single integer."""
+        self._slots = array('q', [self._EMPTY]) * 8
+        """Positions of the keys in the key sequence, by hash. At most half full."""
+
+    @property
+    def _keys(self) -> Sequence:
+        """Return the sequence of keys, either integers or tuples."""
+        if self._int_keys is not None:
+            return self._int_keys
+        return self._tuple_keys
+
+    @staticmethod
+    def _as_int(key: Tuple) -> Optional[int]:
+        """Return the integer of a single integer key, None otherwise."""
+        if len(key) != 1 or type(key[0]) is not int:
+            return None
+        if not INT64_MIN <= key[0] <= INT64_MAX:
+            return None
+        return key[0]
+
+    @staticmethod
+    def _scrambled_hash(value: Any) -> int:
+        """Return the hash of the value with its high bits mixed into the low ones.
+
+        Integers hash to themselves, so keys with a power of two stride
+        would share the low bits and collide in a few slots.
+        """
+        scrambled = (hash(value) * HASH_MULTIPLIER) & UINT64_MASK
+        return scrambled ^ (scrambled >> 32)
+
+    def _find(self, value: Any) -> int:
+        """Return the slot of the integer or tuple, or the empty slot where it belongs."""
+        keys = self._keys
+        slots = self._slots
+        mask = len(slots) - 1
+        slot = self._scrambled_hash(value) & mask
+        while True:
+            position = slots[slot]
+            if position == self._EMPTY or keys[position] == value:
+                return slot
+            slot = (slot + 1) & mask
+
+    def _rehash(self, slot_count: int):
+        """Rebuild the hash table with the given power of two slots."""
+        self._slots = array('q', [self._EMPTY]) * slot_count
+        for position, value in enumerate(self._keys):
+            self._slots[self._find(value)] = position
+
+    def _convert_to_tuples(self):
+        """Switch from the integer array to the list of tuples."""
+        self._tuple_keys = [(value,) for value in self._int_keys]
+        self._int_keys = None
+        self._rehash(len(self._slots))
+
+    def _insert(self, value: Any):
+        """Append the integer or tuple to the keys, unless it is already present."""
+        slot = self._find(value)
+        if self._slots[slot] != self._EMPTY:
+            return
+        keys = self._keys
+        self._slots[slot] = len(keys)
+        keys.append(value)
+        if 2 * len(keys) > len(self._slots):
+            self._rehash(2 * len(self._slots))
+
+    def add(self, key: Tuple):
+        """Add the key tuple, unless it is already present."""
+        if self._int_keys is not None:
+            value = self._as_int(key)
+            if value is not None:
+                self._insert(value)
+                return
+            self._convert_to_tuples()
+        self._insert(key)
+
+    def __contains__(self, key: Tuple) -> bool:
+        """Is the key tuple present?"""
+        if self._int_keys is not None:
+            if len(key) != 1:
+                return False
+            key = key[0]
+        return self._slots[self._find(key)] != self._EMPTY
+
+    def __len__(self) -> int:
+        """Return the number of distinct keys."""
+        return len(self._keys)
+
+    def choice(self, random_inst: random.Random) -> Tuple:
+        """Return a key tuple chosen uniformly at random.
+
+        The index must not be empty.
+        """
+        if self._int_keys is not None:
+            return random_inst.choice(self._int_keys),
+        return random_inst.choice(self._tuple_keys)
@@ -1,3 +1,5 @@
+from typing import Dict, Optional
+
 from core.service.generation_procedure.requisition import ExportRequisition
 
 
@@ -11,12 +13,20 @@ class ProcedureTableStatistics:
     if the requested count is 100.
     """
 
+    retry_limit = 10
+    """
+    How many times the columns of a violated constraint are regenerated
+    in a single row attempt, before the whole row is rejected.
+    """
+
     def __init__(self, table_name: str, requested_count: int):
         self._table_name = table_name
         self._requested_count = requested_count
         self._success_count = 0
         self._insert_failure_count = 0
         self._check_failure_count = 0
+        self.retry_counts: Dict[str, int] = {}
+        """Number of column regenerations by the violated constraint name."""
 
     def succeed_insert(self):
         self._success_count += 1
@@ -24,8 +34,12 @@ class ProcedureTableStatistics:
     def fail_insert(self):
         self._insert_failure_count += 1
 
-    def fail_check(self):
-        self._check_failure_count += 1
+    def fail_check(self, count: int = 1):
+        self._check_failure_count += count
+
+    def retry(self, constraint_name: str, count: int = 1):
+        """Count regenerations of the columns of a violated constraint."""
+        self.retry_counts[constraint_name] = self.retry_counts.get(constraint_name, 0) + count
 
     @property
     def satisfied(self) -> bool:
@@ -41,6 +55,18 @@ class ProcedureTableStatistics:
     def requested_count(self) -> int:
         return self._requested_count
 
+    @property
+    def remaining_attempts(self) -> int:
+        """Return how many more row generation attempts we tolerate."""
+        return max(self.tolerance_factor * self.requested_count - self.attempt_count, 0)
+
+    def next_batch_size(self, batch_size: int) -> int:
+        """Return the size of the next batch of rows, so that we generate
+        neither more rows than requested nor more attempts than tolerated.
+        """
+        missing = max(self.requested_count - self._success_count, 0)
+        return min(batch_size, missing, self.remaining_attempts)
+
     @property
     def expects_next_row(self) -> bool:
         """Return whether the controller should generate another row."""
@@ -48,6 +74,65 @@ class ProcedureTableStatistics:
             self.attempt_count < self.tolerance_factor * self.requested_count
 
 
+class KeyFilterStatistics:
+    """Holds the lookup counts, the throughput and the memory of a filtered key set.
+
+    The throughput is measured on the timed lookups only.
+    """
+
+    def __init__(self, filter_bytes: int):
+        self.filter_bytes = filter_bytes
+        """Size of the filter."""
+        self.lookup_count = 0
+        """Number of membership tests."""
+        self.filtered_count = 0
+        """Number of membership tests answered by the filter alone."""
+        self.false_positive_count = 0
+        """Number of keys passed by the filter, but missing in the exact store."""
+        self.timed_lookup_count = 0
+        """Number of membership tests, whose time was measured."""
+        self.timed_seconds = 0.
+        """Time spent by the timed membership tests."""
+
+    def time_lookups(self, count: int, seconds: float):
+        """Record the time spent by a number of membership tests."""
+        self.timed_lookup_count += count
+        self.timed_seconds += seconds
+
+    @property
+    def hit_rate(self) -> Optional[float]:
+        """Return the fraction of membership tests answered by the filter alone."""
+        if self.lookup_count == 0:
+            return None
+        return self.filtered_count / self.lookup_count
+
+    @property
+    def lookups_per_second(self) -> Optional[float]:
+        """Return the throughput of the timed membership tests."""
+        if self.timed_seconds == 0:
+            return None
+        return self.timed_lookup_count / self.timed_seconds
+
+    def merge(self, other: 'KeyFilterStatistics'):
+        """Add the lookups of another filter of the same constraint, e.g. of a worker.
+        The filter size is kept.
+        """
+        self.lookup_count += other.lookup_count
+        self.filtered_count += other.filtered_count
+        self.false_positive_count += other.false_positive_count
+        self.time_lookups(other.timed_lookup_count, other.timed_seconds)
+
+    def __str__(self) -> str:
+        text = '{} lookups, {} answered by the filter, {} false positives, ' \
+               '{} filter bytes'.format(self.lookup_count,
+                                        self.filtered_count,
+                                        self.false_positive_count,
+                                        self.filter_bytes)
+        if self.lookups_per_second is not None:
+            text += ', {:.0f} lookups/s'.format(self.lookups_per_second)
+        return text
+
+
 class ProcedureStatistics:
     """Holds the number of requested and generated rows in a run."""
 
@@ -56,6 +141,16 @@ class ProcedureStatistics:
             req.table_name: ProcedureTableStatistics(req.table_name, req.row_count)
             for req in requisition.rows
         }
+        self.key_filters: Dict[str, KeyFilterStatistics] = {}
+        """Statistics of the filtered key sets by constraint."""
 
     def get_table_statistics(self, table_name) -> ProcedureTableStatistics:
         return self._table_results[table_name]
+
+    @property
+    def retry_counts(self) -> Dict[str, int]:
+        """Number of column regenerations by the violated constraint name, in all tables."""
+        retry_counts = {}
+        for table_statistics in self._table_results.values():
+            retry_counts.update(table_statistics.retry_counts)
+        return retry_counts
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Optional, List
 
 from sqlalchemy import Table, MetaData
 
@@ -13,6 +13,12 @@ class OutputDriver(ABC):
     is_interactive: bool
     """Can generate database-generated values?"""
 
+    needs_generated_rows = False
+    """Does the driver read whole rows from the generated database at the end of the run?
+
+    If not, the generated database may keep only the columns needed by the generation.
+    """
+
     cli_command: str
     """Identifier, which makes the driver available from CLI."""
 
@@ -46,10 +52,19 @@ class OutputDriver(ABC):
         compare to the original row."""
         pass
 
+    def insert_rows(self, rows: List[GeneratedRow]) -> List[Optional[GeneratedRow]]:
+        """Insert the rows to a table. Return list of results
+        corresponding to the rows, as in insert_row.
+
+        By default, the rows are inserted one by one.
+        """
+        return [self.insert_row(row) for row in rows]
+
 
 class PreviewOutputDriver(OutputDriver):
     """Output driver for data preview. Has no effect."""
     is_interactive = False
+    needs_generated_rows = True
 
     def start_run(self, meta: MetaData):
         pass
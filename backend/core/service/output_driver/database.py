@@ -1,11 +1,15 @@
-from typing import Optional
+import io
+from datetime import date, datetime, timedelta
+from typing import Optional, List, Iterable, Any, Tuple
 
 from sqlalchemy import Table, MetaData
 from sqlalchemy.engine import Connection
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
+from core.model.meta_column import MetaColumn
 from core.model.meta_constraint import MetaConstraint
 from core.model.meta_table import MetaTable
+from core.service.data_source import DataSourceConstants
 from core.service.data_source.database_common import DatabaseConnectionManager, DataSourceOrUrl
 from core.service.exception import FatalDatabaseError
 from core.service.generation_procedure.database import GeneratedRow, GeneratedDatabase
@@ -13,13 +17,25 @@ from core.service.output_driver import OutputDriver
 
 
 class DatabaseOutputDriver(OutputDriver):
-    """Output driver for direct database insertion."""
+    """Output driver for direct database insertion.
+
+    Batches of rows are inserted in bulk, see insert_rows.
+    On PostgreSQL, batches without database-generated values
+    are loaded by COPY FROM STDIN, unless disabled.
+    """
 
     is_interactive = True
     cli_command = 'insert'
 
-    def __init__(self, data_source_url: DataSourceOrUrl, conn_manager: DatabaseConnectionManager):
+    max_parameters = 32767
+    """Maximum number of bound parameters in a single multi-row INSERT statement."""
+
+    def __init__(self,
+                 data_source_url: DataSourceOrUrl,
+                 conn_manager: DatabaseConnectionManager,
+                 use_copy: bool = True):
         super(DatabaseOutputDriver, self).__init__()
+        self._use_copy = use_copy
         self._data_source_url = data_source_url
         self._conn_manager = conn_manager
         self._conn: Optional[Connection] = None
@@ -63,3 +79,132 @@ class DatabaseOutputDriver(OutputDriver):
             for index, meta_column in enumerate(self._primary_constraint.constrained_columns):
                 row[meta_column.name] = inserted[index]
         return row
+
+    def insert_rows(self, rows: List[GeneratedRow]) -> List[Optional[GeneratedRow]]:
+        """Try to insert the rows in bulk, in a single transaction.
+
+        If the primary keys are generated by the database, they are fetched
+        by multi-row INSERT ... RETURNING statements. If the dialect does not
+        support it, the rows are inserted one by one. Otherwise, the rows
+        are inserted by executemany.
+        If all values are present and the database is PostgreSQL,
+        the rows are loaded by COPY instead, see _copy_rows.
+        In case of an integrity error, the transaction is rolled back
+        and the rows are inserted one by one, so that only the failing rows
+        are reported as failed.
+        """
+        if len(rows) < 2 or not rows[0]:
+            return super(DatabaseOutputDriver, self).insert_rows(rows)
+        missing_columns = self._missing_primary_key_columns(rows[0])
+        if missing_columns and not self._supports_multi_row_returning():
+            return super(DatabaseOutputDriver, self).insert_rows(rows)
+        if not missing_columns and self._supports_copy():
+            return self._copy_rows(rows)
+        returned_keys = []
+        try:
+            with self._conn.begin():
+                if missing_columns:
+                    returned_keys = self._insert_returning(rows, missing_columns)
+                else:
+                    self._conn.execute(self._current_table.insert(), rows)
+        except IntegrityError:
+            return super(DatabaseOutputDriver, self).insert_rows(rows)
+        except SQLAlchemyError:
+            raise FatalDatabaseError()
+        # the keys are valid only once the transaction is committed
+        for row, inserted in zip(rows, returned_keys):
+            for index, meta_column in enumerate(missing_columns):
+                row[meta_column.name] = inserted[index]
+        return rows
+
+    def _missing_primary_key_columns(self, row: GeneratedRow) -> List[MetaColumn]:
+        """Return the primary key columns, whose values are not present in the row."""
+        if self._primary_constraint is None:
+            return []
+        return [
+            meta_column
+            for meta_column in self._primary_constraint.constrained_columns
+            if meta_column.name not in row
+        ]
+
+    def _supports_multi_row_returning(self) -> bool:
+        """Can the dialect return values from a multi-row INSERT statement?"""
+        dialect = self._conn.dialect
+        return dialect.implicit_returning and dialect.supports_multivalues_insert
+
+    def _chunks(self, rows: List[GeneratedRow]) -> Iterable[List[GeneratedRow]]:
+        """Split the rows into chunks respecting the maximum number of parameters."""
+        chunk_size = max(1, self.max_parameters // len(rows[0]))
+        for start in range(0, len(rows), chunk_size):
+            yield rows[start:start + chunk_size]
+
+    def _insert_returning(self, rows: List[GeneratedRow], missing_columns: List[MetaColumn]) -> List[Tuple]:
+        """Insert the rows by multi-row INSERT statements and return
+        the missing primary key values returned by the database, in order of the rows.
+        """
+        returned_columns = [self._current_table.c[meta_column.name] for meta_column in missing_columns]
+        returned_keys = []
+        for chunk in self._chunks(rows):
+            statement = self._current_table.insert().values(chunk).returning(*returned_columns)
+            # the returned rows follow the order of the VALUES list
+            returned_keys.extend(self._conn.execute(statement).fetchall())
+        return returned_keys
+
+    def _supports_copy(self) -> bool:
+        """Can the rows be loaded by COPY FROM STDIN?"""
+        dialect = self._conn.dialect
+        return self._use_copy and \
+            dialect.name == DataSourceConstants.DRIVER_POSTGRES and \
+            dialect.driver == 'psycopg2'
+
+    def _copy_rows(self, rows: List[GeneratedRow]) -> List[Optional[GeneratedRow]]:
+        """Load the rows by COPY FROM STDIN in CSV format, in a single transaction.
+
+        The rows are already checked by the constraint checker. If the database
+        rejects them anyway (e.g. due to a CHECK constraint), the transaction
+        is rolled back and the rows are inserted one by one.
+        """
+        preparer = self._conn.dialect.identifier_preparer
+        column_names = list(rows[0].keys())
+        statement = 'COPY {} ({}) FROM STDIN WITH (FORMAT csv)'.format(
+            preparer.format_table(self._current_table),
+            ', '.join(preparer.format_column(self._current_table.c[name]) for name in column_names)
+        )
+        data = io.StringIO()
+        for row in rows:
+            data.write(','.join(self._csv_value(row[name]) for name in column_names))
+            data.write('\n')
+        data.seek(0)
+        dbapi = self._conn.dialect.dbapi
+        try:
+            with self._conn.begin():
+                cursor = self._conn.connection.cursor()
+                try:
+                    cursor.copy_expert(statement, data)
+                finally:
+                    cursor.close()
+        except dbapi.IntegrityError:
+            return super(DatabaseOutputDriver, self).insert_rows(rows)
+        except (dbapi.Error, SQLAlchemyError):
+            raise FatalDatabaseError()
+        return rows
+
+    @staticmethod
+    def _csv_value(value: Any) -> str:
+        """Render the value as a field of the PostgreSQL CSV format.
+
+        None is an unquoted empty field, strings are always quoted,
+        so that an empty string is distinguished from NULL.
+        Bytes are rendered in the hex format of bytea.
+        """
+        if value is None:
+            return ''
+        if isinstance(value, bool):
+            return 'true' if value else 'false'
+        if isinstance(value, (int, float)):
+            return str(value)
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return '"\\x{}"'.format(bytes(value).hex())
+        if isinstance(value, (date, datetime, timedelta)):
+            value = str(value)
+        return '"{}"'.format(str(value).replace('"', '""'))
@@ -1,5 +1,7 @@
+import tempfile
 from abc import abstractmethod
-from typing import TypeVar, Generic, Optional, final
+from argparse import ArgumentParser, Namespace
+from typing import TypeVar, Generic, Optional, final, IO, Iterator
 
 from sqlalchemy import Table, MetaData
 
@@ -12,7 +14,12 @@ DumpType = TypeVar('DumpType', str, bytes)
 
 
 class FileOutputDriver(Generic[DumpType], OutputDriver):
-    """Generic output driver for files."""
+    """Generic output driver for files.
+
+    The file content is written to a temporary file during the run,
+    so that the memory usage stays bounded. After the run, the content
+    may be streamed in chunks.
+    """
 
     mime_type: str
     """Mime type of the generated file."""
@@ -20,11 +27,18 @@ class FileOutputDriver(Generic[DumpType], OutputDriver):
     display_name: str
     """The name under which the driver shows up in the GUI."""
 
+    is_binary = False
+    """Is the file content binary? Text otherwise."""
+
+    chunk_size = 64 * 1024
+    """Size of the chunks yielded when streaming the file content."""
+
     is_interactive = False
 
     def __init__(self):
         super(FileOutputDriver, self).__init__()
         self._database: Optional[GeneratedDatabase] = None
+        self._output: Optional[IO[DumpType]] = None
 
     @classmethod
     @final
@@ -36,6 +50,16 @@ class FileOutputDriver(Generic[DumpType], OutputDriver):
             return cls_name[:-len(suffix)]
         return cls_name
 
+    @classmethod
+    def add_cli_arguments(cls, parser: ArgumentParser):
+        """Add optional arguments configuring the driver to its CLI command parser."""
+        pass
+
+    @classmethod
+    def from_cli_arguments(cls, args: Namespace) -> 'FileOutputDriver':
+        """Create the driver configured by the parsed CLI arguments."""
+        return cls()
+
     def start_run(self, meta: MetaData):
         pass
 
@@ -48,10 +72,54 @@ class FileOutputDriver(Generic[DumpType], OutputDriver):
     def insert_row(self, row: GeneratedRow) -> Optional[GeneratedRow]:
         return row
 
-    @abstractmethod
+    def _make_temporary_file(self, binary: Optional[bool] = None) -> IO:
+        """Create and return an anonymous temporary file for reading and writing.
+
+        The mode is binary or text according to the parameter,
+        which defaults to the driver's content type.
+        """
+        if binary is None:
+            binary = self.is_binary
+        if binary:
+            return tempfile.TemporaryFile('w+b')
+        return tempfile.TemporaryFile('w+', encoding='utf-8', newline='')
+
+    def _open_output(self) -> IO[DumpType]:
+        """Return a readable stream of the file content, positioned at the start.
+
+        Called after the end of the run.
+        """
+        self._output.seek(0)
+        return self._output
+
+    def iter_dump(self) -> Iterator[DumpType]:
+        """Yield the file content in chunks of bounded size."""
+        stream = self._open_output()
+        while True:
+            chunk = stream.read(self.chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+    def dump_to(self, file: IO[DumpType]):
+        """Write the file content to a file object chunk by chunk."""
+        for chunk in self.iter_dump():
+            file.write(chunk)
+
     def dump(self) -> DumpType:
-        """Return file content."""
-        pass
+        """Return the whole file content.
+
+        The content is read to the memory. Prefer dump_to or iter_dump
+        for large outputs.
+        """
+        empty = b'' if self.is_binary else ''
+        return empty.join(self.iter_dump())
+
+    def close(self):
+        """Release the resources holding the file content."""
+        if self._output is not None:
+            self._output.close()
+            self._output = None
 
     @classmethod
     @abstractmethod
@@ -1,13 +1,13 @@
+from argparse import ArgumentParser, Namespace
 from datetime import date, datetime, timedelta
-from io import StringIO
 
-from typing import Optional
+from typing import Optional, Tuple, List, Callable, Any, Dict, FrozenSet
 
 from sqlalchemy import Table
 from sqlalchemy.dialects import postgresql
-from sqlalchemy.sql import Insert
 
 from core.model.meta_table import MetaTable
+from core.service.exception import SomeError
 from core.service.generation_procedure.database import GeneratedRow, GeneratedDatabase
 from core.service.output_driver.file_driver.base import FileOutputDriver
 
@@ -35,38 +35,146 @@ class LiteralCompiler(dialect.statement_compiler):
         return super(LiteralCompiler, self).render_literal_value(value, typ)
 
 
+class InsertTemplate:
+    """INSERT statement of a table and a fixed list of columns,
+    compiled once and rendered for any number of rows.
+
+    The values are rendered by the literal processors of the column types,
+    same as by the LiteralCompiler.
+    """
+
+    def __init__(self, table: Table, column_names: Tuple[str, ...]):
+        self._column_names = column_names
+        compiler = LiteralCompiler(dialect, None)
+        columns = [table.c[name] for name in column_names]
+        self._processors: List[Callable[[Any], str]] = [
+            self._make_processor(compiler, column.type)
+            for column in columns
+        ]
+        preparer = dialect.identifier_preparer
+        self._head = 'INSERT INTO {} ({}) VALUES '.format(
+            preparer.format_table(table),
+            ', '.join(preparer.format_column(column) for column in columns)
+        )
+
+    @staticmethod
+    def _make_processor(compiler: LiteralCompiler, typ) -> Callable[[Any], str]:
+        """Return a function rendering values of the given type as literals.
+
+        The literal processor of the dialect specific type is resolved once,
+        when the template is compiled.
+        """
+        processor = typ.dialect_impl(dialect).literal_processor(dialect)
+
+        def process(value: Any) -> str:
+            if value is None:
+                return 'NULL'
+            elif isinstance(value, (date, datetime, timedelta)):
+                return '\'{}\''.format(str(value))
+            elif processor is None:
+                return compiler.render_literal_value(value, typ)
+            return processor(value)
+
+        return process
+
+    def render_values(self, row: GeneratedRow) -> str:
+        """Render the parenthesized tuple of values in the row."""
+        return '({})'.format(', '.join(
+            processor(row[name])
+            for name, processor in zip(self._column_names, self._processors)
+        ))
+
+    def render(self, values: List[str]) -> str:
+        """Render the statement inserting the rendered tuples of values."""
+        return self._head + ', '.join(values)
+
+
 class InsertScriptOutputDriver(FileOutputDriver[str]):
-    """Output file driver creating an insert script."""
+    """Output file driver creating an insert script.
+
+    The statements are rendered from per-table templates. A statement
+    may insert multiple rows, up to the given number of rows per statement.
+    """
 
     mime_type = 'application/sql'
     display_name = 'INSERT Script'
     cli_command = 'script'
 
-    def __init__(self):
+    def __init__(self, rows_per_statement: int = 1):
         super().__init__()
-        self._io = StringIO()
+        if rows_per_statement < 1:
+            raise SomeError('The number of rows per statement must be a positive number')
+        self._rows_per_statement = rows_per_statement
+        self._output = self._make_temporary_file()
         self._current_table: Optional[Table] = None
+        self._templates: Dict[Tuple[Table, FrozenSet[str]], InsertTemplate] = {}
+        self._last_key: Optional[FrozenSet[str]] = None
+        """Keys of the last row inserted to the current table."""
+        self._last_template: Optional[InsertTemplate] = None
+        """Template of the last row inserted to the current table."""
+        self._pending_template: Optional[InsertTemplate] = None
+        self._pending_values: List[str] = []
+
+    @classmethod
+    def add_cli_arguments(cls, parser: ArgumentParser):
+        parser.add_argument('--rows-per-statement',
+                            help='insert up to this many rows in a single statement',
+                            type=int,
+                            default=1)
+
+    @classmethod
+    def from_cli_arguments(cls, args: Namespace) -> 'InsertScriptOutputDriver':
+        return cls(rows_per_statement=args.rows_per_statement)
 
     def switch_table(self, table: Table, meta_table: MetaTable):
+        self._flush()
         self._current_table = table
+        self._last_key = None
+        self._last_template = None
+
+    def _get_template(self, row: GeneratedRow) -> InsertTemplate:
+        """Find or compile the template for the current table and the row columns.
+
+        The rows of a table mostly have the same keys as the previous row,
+        which is checked without building any tuple of the keys.
+        """
+        if self._last_key is not None and row.keys() == self._last_key:
+            return self._last_template
+        row_key = frozenset(row)
+        key = (self._current_table, row_key)
+        if key not in self._templates:
+            # the columns are ordered as in the table, same as by the compiler
+            column_names = tuple(column.name for column in self._current_table.columns if column.name in row)
+            self._templates[key] = InsertTemplate(self._current_table, column_names)
+        self._last_key = row_key
+        self._last_template = self._templates[key]
+        return self._last_template
 
     def insert_row(self, row: GeneratedRow) -> Optional[GeneratedRow]:
-        stmt = self._current_table.insert().values(row)
-        self._io.write(self._stringify_stmt(stmt))
-        self._io.write('\n')
+        template = self._get_template(row)
+        if template is not self._pending_template:
+            self._flush()
+            self._pending_template = template
+        self._pending_values.append(template.render_values(row))
+        if len(self._pending_values) >= self._rows_per_statement:
+            self._flush()
         return row
 
-    @staticmethod
-    def _stringify_stmt(stmt: Insert) -> str:
-        """Convert statement to string."""
-        return LiteralCompiler(dialect, stmt).process(stmt)
+    def _flush(self):
+        """Write the statement with the pending rows to the output."""
+        if self._pending_values:
+            self._output.write(self._pending_template.render(self._pending_values))
+            self._output.write('\n')
+            self._pending_values.clear()
+        self._pending_template = None
 
     def end_run(self, database: GeneratedDatabase):
+        self._flush()
         super(FileOutputDriver, self).end_run(database)
         self._current_table = None
-
-    def dump(self) -> str:
-        return self._io.getvalue()
+        self._last_key = None
+        self._last_template = None
+        self._templates.clear()
 
     @classmethod
     def add_extension(cls, file_name_base: str) -> str:
@@ -1,21 +1,85 @@
 import json
+from typing import Dict, IO, Optional
 
+from sqlalchemy import Table
+
+from core.model.meta_table import MetaTable
+from core.service.generation_procedure.database import GeneratedDatabase, GeneratedRow
 from core.service.output_driver.file_driver.base import FileOutputDriver
 from core.service.types import json_serialize_default
 
 
+class JsonTableWriter:
+    """Writes the serialized rows of a single table to a temporary file."""
+
+    def __init__(self, io: IO[str]):
+        self.io = io
+        self.row_count = 0
+
+    def write_row(self, row: GeneratedRow):
+        """Serialize the row as an element of the indented table array."""
+        if self.row_count:
+            self.io.write(',\n')
+        serialized = json.dumps(row, indent=2, sort_keys=True, default=json_serialize_default)
+        self.io.write('    ')
+        self.io.write(serialized.replace('\n', '\n    '))
+        self.row_count += 1
+
+
 class JsonOutputDriver(FileOutputDriver[str]):
-    """Output file driver for JSON output."""
+    """Output file driver for JSON output.
+
+    The rows of each table are serialized as they are inserted.
+    The tables are assembled into a single JSON object at the end of the run.
+    """
 
     mime_type = 'application/json'
     display_name = 'JSON'
     cli_command = 'json'
 
-    def dump(self) -> str:
-        return json.dumps(self._database.get_dict(),
-                          indent=2,
-                          sort_keys=True,
-                          default=json_serialize_default)
+    def __init__(self):
+        super(JsonOutputDriver, self).__init__()
+        self._table_writers: Dict[str, JsonTableWriter] = {}
+        self._writer: Optional[JsonTableWriter] = None
+
+    def switch_table(self, table: Table, meta_table: MetaTable):
+        if meta_table.name not in self._table_writers:
+            io = self._make_temporary_file()
+            self._table_writers[meta_table.name] = JsonTableWriter(io)
+        self._writer = self._table_writers[meta_table.name]
+
+    def insert_row(self, row: GeneratedRow) -> Optional[GeneratedRow]:
+        self._writer.write_row(row)
+        return row
+
+    def end_run(self, database: GeneratedDatabase):
+        super(JsonOutputDriver, self).end_run(database)
+        self._output = self._make_temporary_file()
+        self._output.write('{')
+        for index, table_name in enumerate(sorted(self._table_writers)):
+            writer = self._table_writers[table_name]
+            if index:
+                self._output.write(',')
+            self._output.write('\n  {}: '.format(json.dumps(table_name)))
+            if writer.row_count:
+                self._output.write('[\n')
+                self._copy_table(writer.io)
+                self._output.write('\n  ]')
+            else:
+                self._output.write('[]')
+            writer.io.close()
+        self._output.write('\n}' if self._table_writers else '}')
+        self._table_writers.clear()
+        self._writer = None
+
+    def _copy_table(self, io: IO[str]):
+        """Copy the content of the table file to the output chunk by chunk."""
+        io.seek(0)
+        while True:
+            chunk = io.read(self.chunk_size)
+            if not chunk:
+                return
+            self._output.write(chunk)
 
     @classmethod
     def add_extension(cls, file_name_base: str) -> str:
@@ -1,6 +1,6 @@
 import os
 import tempfile
-from typing import Optional
+from typing import Optional, IO
 
 from sqlalchemy import Table, create_engine, MetaData
 from sqlalchemy.engine import Engine, Connection
@@ -14,11 +14,16 @@ from core.service.output_driver.file_driver.base import FileOutputDriver
 
 
 class SqliteOutputDriver(FileOutputDriver[bytes]):
-    """Output file driver creating SQLite files."""
+    """Output file driver creating SQLite files.
+
+    The database is written to a temporary file, which is streamed
+    from the disk after the run.
+    """
 
     mime_type = DataSourceConstants.MIME_TYPE_SQLITE
     display_name = 'SQLite Database File'
     cli_command = 'sqlite'
+    is_binary = True
 
     def __init__(self):
         super(SqliteOutputDriver, self).__init__()
@@ -26,7 +31,6 @@ class SqliteOutputDriver(FileOutputDriver[bytes]):
         self._engine: Engine = create_engine('sqlite:///{}'.format(self._db_file))
         self._conn: Connection = self._engine.connect()
         self._current_table: Optional[Table] = None
-        self._output: Optional[bytes] = None
 
     def start_run(self, meta: MetaData):
         meta.create_all(self._engine)
@@ -34,10 +38,9 @@ class SqliteOutputDriver(FileOutputDriver[bytes]):
     def end_run(self, database: GeneratedDatabase):
         super(SqliteOutputDriver, self).end_run(database)
         self._conn.close()
+        self._engine.dispose()
         os.close(self._db_fd)
-        with open(self._db_file, 'rb') as file:
-            self._output = file.read()
-        os.unlink(self._db_file)
+        self._db_fd = None
 
     def switch_table(self, table: Table, meta_table: MetaTable):
         self._current_table = table
@@ -50,12 +53,22 @@ class SqliteOutputDriver(FileOutputDriver[bytes]):
         except SQLAlchemyError:
             self._conn.close()
             os.close(self._db_fd)
-            os.unlink(self._db_file)
+            self._db_fd = None
+            self.close()
             raise FatalDatabaseError()
         return row
 
-    def dump(self) -> bytes:
-        return self._output
+    def _open_output(self) -> IO[bytes]:
+        if self._output is None:
+            self._output = open(self._db_file, 'rb')
+        return super(SqliteOutputDriver, self)._open_output()
+
+    def close(self):
+        """Close and delete the temporary database file."""
+        super(SqliteOutputDriver, self).close()
+        if self._db_file is not None and os.path.exists(self._db_file):
+            os.unlink(self._db_file)
+        self._db_file = None
 
     @classmethod
     def add_extension(cls, file_name_base: str) -> str:
@@ -1,8 +1,8 @@
-from io import StringIO, BytesIO
 import csv
-from zipfile import ZIP_DEFLATED, ZipFile
+import os
+from zipfile import ZIP_DEFLATED, ZipFile, ZIP64_LIMIT
 
-from typing import Optional, Dict
+from typing import Optional, Dict, IO
 
 from attr import dataclass
 from sqlalchemy import Table
@@ -16,42 +16,57 @@ from core.service.output_driver.file_driver.base import FileOutputDriver
 class TableIoWriter:
     """Table writer and its output IO."""
     writer: csv.DictWriter
-    io: StringIO
+    io: IO[str]
 
 
 class ZippedCsvOutputDriver(FileOutputDriver[bytes]):
-    """Output file driver creating zipped CSV files per table."""
+    """Output file driver creating zipped CSV files per table.
+
+    Each table is written to its own temporary file during the run.
+    The files are compressed into a temporary zip file at the end of the run.
+    """
 
     mime_type = 'application/zip'
     display_name = 'Zipped CSV'
     cli_command = 'zip'
+    is_binary = True
 
     def __init__(self):
         super(ZippedCsvOutputDriver, self).__init__()
-        self._zip_io = BytesIO()
-        self._zip_file = ZipFile(self._zip_io, 'w', ZIP_DEFLATED, False)
         self._table_ios: Dict[MetaTable, TableIoWriter] = {}
         self._writer: Optional[csv.DictWriter] = None
 
-    def _write_tables_to_zip_file(self):
+    def _write_tables_to_zip_file(self, zip_file: ZipFile):
         for meta_table, io_writer in self._table_ios.items():
             file_name = '{}.csv'.format(meta_table.name)
-            table_str = io_writer.io.getvalue()
-            self._zip_file.writestr(file_name, table_str)
+            io_writer.io.flush()
+            force_zip64 = os.fstat(io_writer.io.fileno()).st_size > ZIP64_LIMIT
+            io_writer.io.seek(0)
+            with zip_file.open(file_name, 'w', force_zip64=force_zip64) as entry:
+                while True:
+                    chunk = io_writer.io.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    entry.write(chunk.encode('utf-8'))
             io_writer.io.close()
 
     def end_run(self, database: GeneratedDatabase):
         super(ZippedCsvOutputDriver, self).end_run(database)
-        self._write_tables_to_zip_file()
-        for file in self._zip_file.filelist:
+        self._output = self._make_temporary_file()
+        zip_file = ZipFile(self._output, 'w', ZIP_DEFLATED, allowZip64=True)
+        self._write_tables_to_zip_file(zip_file)
+        for file in zip_file.filelist:
             file.create_system = 0
+        zip_file.close()
+        self._table_ios.clear()
+        self._writer = None
 
     def switch_table(self, table: Table, meta_table: MetaTable):
         if meta_table in self._table_ios:
             self._writer = self._table_ios[meta_table].writer
             return
         # we see the table for the first time: create IO, writer, header
-        io = StringIO()
+        io = self._make_temporary_file(binary=False)
         fields = list(map(lambda col: col.name, meta_table.columns))
         self._writer = csv.DictWriter(io, fieldnames=fields, quoting=csv.QUOTE_NONNUMERIC)
         self._table_ios[meta_table] = TableIoWriter(writer=self._writer, io=io)
@@ -61,10 +76,6 @@ class ZippedCsvOutputDriver(FileOutputDriver[bytes]):
         self._writer.writerow(row)
         return row
 
-    def dump(self) -> bytes:
-        self._zip_file.close()
-        return self._zip_io.getvalue()
-
     @classmethod
     def add_extension(cls, file_name_base: str) -> str:
         return '{}.zip'.format(file_name_base)
@@ -20,6 +20,10 @@ setup(
     extras_require={
         'dev': [
             'pytest'
+        ],
+        # vectorized batch generation
+        'numpy': [
+            'numpy'
         ]
     }
 )
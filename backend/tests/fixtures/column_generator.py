@@ -0,0 +1,16 @@
+from typing import Optional
+
+from core.model.generator_setting import GeneratorSetting
+from core.model.meta_column import MetaColumn
+from core.service.column_generator.base import RegisteredGenerator, ColumnGenerator
+from core.service.types import Types
+
+
+def make_generator(name: str, params: dict, col_type: Types = Types.INTEGER, seed: Optional[float] = 1.) \
+        -> ColumnGenerator:
+    """Make a seeded generator instance assigned to a new column."""
+    generator_setting = GeneratorSetting(name=name, params=params, null_frequency=0)
+    generator_setting.columns = [MetaColumn(name='col', col_type=col_type, nullable=False)]
+    generator = RegisteredGenerator.get_by_name(name)(generator_setting)
+    generator.seed(seed)
+    return generator
@@ -0,0 +1,19 @@
+from typing import List, Any, Iterator, Tuple
+
+from core.model.data_source import DataSource
+from core.service.data_source.data_provider.base_provider import DataProvider
+from core.service.injector import Injector
+
+
+class ListDataProvider(DataProvider):
+    """Provide the values of a list."""
+
+    def __init__(self, values: List[Any], injector: Injector):
+        super().__init__(DataSource(), [], injector)
+        self._values = values
+
+    def scalar_data(self) -> Iterator[Any]:
+        return iter(self._values)
+
+    def vector_data(self) -> Iterator[Tuple]:
+        return ((value,) for value in self._values)
@@ -7,12 +7,14 @@ from typing import Callable, AnyStr, Tuple
 
 import pytest
 
+from cli.reconstruction import ProjectReconstruction
 from core.facade.data_source import DataSourceFacade
 from core.model.data_source import DataSource
+from core.model.meta_table import MetaTable
 from core.model.project import Project
 from core.service.types import json_serialize_default
 from tests.fixtures.project import UserProject
-from web.view.project import SaveView
+from web.view.project import SaveView, SavedProject
 
 
 @dataclass
@@ -92,3 +94,22 @@ def saved_mock_project_file(request, session, user_import_mock_database) -> Tupl
     yield fd, file_path
     os.close(fd)
     os.unlink(file_path)
+
+
+@pytest.fixture
+def saved_mock_project(saved_mock_project_file) -> SavedProject:
+    """Return the saved project with imported mock database,
+    reconstructed from its file like in the CLI."""
+    project_fd, project_file_path = saved_mock_project_file
+    with open(project_file_path, 'r') as project_file:
+        return ProjectReconstruction(json.load(project_file)).parse()
+
+
+def narrow_publisher_names(project: Project) -> MetaTable:
+    """Let the publisher company names be single letters and return the publisher table."""
+    publisher = next(meta_table for meta_table in project.tables if meta_table.name == 'publisher')
+    company_name = next(meta_column for meta_column in publisher.columns if meta_column.name == 'company_name')
+    company_name.generator_setting.name = 'String'
+    company_name.generator_setting.params = {'min_length': 1, 'max_length': 1, 'unique': False}
+    company_name.generator_setting.null_frequency = 0
+    return publisher
@@ -1,5 +1,6 @@
 from dataclasses import asdict
 from itertools import cycle, islice
+from typing import Sequence, Iterator
 
 import pytest
 from sqlalchemy import MetaData, Table, Column, Integer, ForeignKey
@@ -11,17 +12,14 @@ CIRCULAR_FK_NAME = 'fid'
 CIRCULAR_TABLES = ('A', 'B', 'C')
 
 
-@pytest.fixture(params=CIRCULAR_TABLES)
-def circular_meta(request) -> MetaData:
-    """Return circularly dependent tables.
-
-    Tables A, B, C are created. The FKs are A->B, B->C, C->A.
-    The parameter specifies which FK is nullable.
+def make_cycle_meta(table_names: Sequence[str], nullable_tables: Sequence[str]) -> MetaData:
+    """Return tables, each of which references the next one, the last one references the first one.
+    The FKs of the given tables are nullable.
     """
     meta = MetaData()
     shift = 1
-    tables_shifted = islice(cycle(CIRCULAR_TABLES), shift, len(CIRCULAR_TABLES) + shift)
-    for table_name, next_table_name in zip(CIRCULAR_TABLES, tables_shifted):
+    tables_shifted = islice(cycle(table_names), shift, len(table_names) + shift)
+    for table_name, next_table_name in zip(table_names, tables_shifted):
         Table(
             table_name,
             meta,
@@ -29,22 +27,35 @@ def circular_meta(request) -> MetaData:
             Column(CIRCULAR_FK_NAME,
                    Integer,
                    ForeignKey('{}.pid'.format(next_table_name)),
-                   nullable=table_name == request.param),
+                   nullable=table_name in nullable_tables),
         )
     return meta
 
 
-@pytest.fixture
-def user_mock_circular_database(injector,
-                                session,
-                                user_project,
-                                circular_meta) -> UserMockDataSource:
-    """Create a database and data source with the circular schema,
-    add it to the user's project."""
+@pytest.fixture(params=CIRCULAR_TABLES)
+def circular_meta(request) -> MetaData:
+    """Return circularly dependent tables.
+
+    Tables A, B, C are created. The FKs are A->B, B->C, C->A.
+    The parameter specifies which FK is nullable.
+    """
+    return make_cycle_meta(CIRCULAR_TABLES, (request.param,))
+
+
+@pytest.fixture(params=[(('A', 'B'), ('A',)), (CIRCULAR_TABLES, ('A', 'B'))])
+def cycle_meta(request) -> MetaData:
+    """Return a cycle of two tables with one nullable FK,
+    or a cycle of three tables with two nullable FKs."""
+    return make_cycle_meta(*request.param)
+
+
+def mock_cycle_database(injector, session, user_project, meta: MetaData) -> Iterator[UserMockDataSource]:
+    """Create a database and data source with the given schema,
+    add it to the user's project, delete it when done."""
     facade = injector.get(DataSourceFacade)
     data_source = facade.create_mock_database(user_project.project.id,
                                               file_name='circular.db',
-                                              mock_factory=lambda: circular_meta)
+                                              mock_factory=lambda: meta)
     session.commit()
     yield UserMockDataSource(
         data_source=data_source,
@@ -54,6 +65,16 @@ def user_mock_circular_database(injector,
         facade.delete(data_source)
 
 
+@pytest.fixture
+def user_mock_circular_database(injector,
+                                session,
+                                user_project,
+                                circular_meta) -> UserMockDataSource:
+    """Create a database and data source with the circular schema,
+    add it to the user's project."""
+    yield from mock_cycle_database(injector, session, user_project, circular_meta)
+
+
 @pytest.fixture
 def user_import_circular_database(injector, session, user_mock_circular_database) -> UserMockDataSource:
     """Return the circular data source and import its schema
@@ -62,3 +83,12 @@ def user_import_circular_database(injector, session, user_mock_circular_database
     facade.import_schema(user_mock_circular_database.data_source)
     session.commit()
     return user_mock_circular_database
+
+
+@pytest.fixture
+def user_import_cycle_database(injector, session, user_project, cycle_meta) -> UserMockDataSource:
+    """Create a database with the cycle schema and import its schema to the user's project."""
+    for user_mock_database in mock_cycle_database(injector, session, user_project, cycle_meta):
+        injector.get(DataSourceFacade).import_schema(user_mock_database.data_source)
+        session.commit()
+        yield user_mock_database
@@ -1,9 +1,34 @@
+import csv
+import io
 import json
 from typing import AnyStr, Tuple
+from zipfile import ZipFile
+
+import pytest
+from sqlalchemy import create_engine, select, func
 
 from cli.controller import CommandLineController
+from core.service.exception import RequisitionInfeasibleError
 from core.service.mock_schema import mock_book_author_publisher
+from core.service.output_driver.database import DatabaseOutputDriver
+from core.service.output_driver.file_driver.insert_script import InsertScriptOutputDriver
+from core.service.output_driver.file_driver import zipped_csv
 from core.service.output_driver.file_driver.json_file import JsonOutputDriver
+from core.service.output_driver.file_driver.zipped_csv import ZippedCsvOutputDriver
+
+
+def assert_references_exist(generated_obj: dict):
+    """Check that the foreign keys reference generated rows."""
+    meta = mock_book_author_publisher()
+    for table_name, table in meta.tables.items():
+        for fk in table.foreign_key_constraints:
+            ref_keys = {
+                tuple(row[element.column.name] for element in fk.elements)
+                for row in generated_obj[fk.referred_table.name]
+            }
+            for row in generated_obj[table_name]:
+                key = tuple(row[column.name] for column in fk.columns)
+                assert key in ref_keys or all(value is None for value in key)
 
 
 class TestCli:
@@ -28,8 +53,138 @@ class TestCli:
 
         # check the output
         with open(output_file_path, 'r') as output_file:
-            generated_obj = json.load(output_file)
+            output = output_file.read()
+        generated_obj = json.loads(output)
+        assert output == json.dumps(generated_obj, indent=2, sort_keys=True)
         meta = mock_book_author_publisher()
         for table_name in meta.tables:
             assert table_name in generated_obj
             assert generated_obj[table_name]
+        assert_references_exist(generated_obj)
+
+    def test_json_plan(self,
+                       saved_mock_project_file: Tuple[int, AnyStr],
+                       temp_output_file: Tuple[int, AnyStr],
+                       capsys):
+        """Test that the planner reports a too small domain of a primary key,
+        fails in the strict mode and picks the unique mode in the auto mode."""
+        project_fd, project_file_path = saved_mock_project_file
+        output_fd, output_file_path = temp_output_file
+        with open(project_file_path, 'r') as project_file:
+            saved_project = json.load(project_file)
+        publisher = next(table for table in saved_project['project']['tables'] if table['name'] == 'publisher')
+        name_setting = next(setting for setting in publisher['generator_settings'] if setting['name'] == 'Name')
+        name_setting['name'] = 'String'
+        name_setting['params'] = {'min_length': 1, 'max_length': 1, 'unique': False}
+
+        def generate(row_count: int, mode: str) -> dict:
+            for row in saved_project['requisition']['rows']:
+                if row['table_name'] == 'publisher':
+                    row['row_count'] = row_count
+            with open(project_file_path, 'w') as project_file:
+                json.dump(saved_project, project_file)
+            controller = CommandLineController()
+            controller.execute([
+                JsonOutputDriver.cli_command,
+                project_file_path,
+                output_file_path,
+                '--batch-size',
+                '10',
+                '--plan',
+                mode
+            ])
+            with open(output_file_path, 'r') as output_file:
+                return json.load(output_file)
+
+        with pytest.raises(RequisitionInfeasibleError):
+            generate(60, 'strict')
+        generated_obj = generate(60, 'warn')
+        assert 'publisher.pk_publisher' in capsys.readouterr().err
+        assert len(generated_obj['publisher']) < 60
+        generated_obj = generate(45, 'auto')
+        assert 'publisher.pk_publisher' not in capsys.readouterr().err
+        assert len(generated_obj['publisher']) == 45
+        assert_references_exist(generated_obj)
+
+    def test_insert_batch(self,
+                          saved_mock_project_file: Tuple[int, AnyStr],
+                          temp_output_file: Tuple[int, AnyStr]):
+        """Test bulk insertion to an SQLite database in the batch mode."""
+        project_fd, project_file_path = saved_mock_project_file
+        output_fd, output_file_path = temp_output_file
+        url = 'sqlite:///{}'.format(output_file_path)
+        meta = mock_book_author_publisher()
+        engine = create_engine(url)
+        meta.create_all(engine)
+
+        controller = CommandLineController()
+        controller.execute([
+            DatabaseOutputDriver.cli_command,
+            project_file_path,
+            url,
+            '--batch-size',
+            '5'
+        ])
+
+        with engine.connect() as conn:
+            for table in meta.tables.values():
+                assert conn.execute(select([func.count()]).select_from(table)).scalar() > 0
+        engine.dispose()
+
+    def test_script_rows_per_statement(self,
+                                       saved_mock_project_file: Tuple[int, AnyStr],
+                                       temp_output_file: Tuple[int, AnyStr]):
+        """Test that the multi-row statements insert the same rows as the single-row ones."""
+        project_fd, project_file_path = saved_mock_project_file
+        output_fd, output_file_path = temp_output_file
+        meta = mock_book_author_publisher()
+
+        table_rows = []
+        for statement_args in ([], ['--rows-per-statement', '4']):
+            controller = CommandLineController()
+            controller.execute([
+                InsertScriptOutputDriver.cli_command,
+                project_file_path,
+                output_file_path,
+                *statement_args
+            ])
+            with open(output_file_path, 'r') as output_file:
+                statements = output_file.read().splitlines()
+            engine = create_engine('sqlite://')
+            meta.create_all(engine)
+            with engine.connect() as conn:
+                for statement in statements:
+                    conn.execute(statement)
+                table_rows.append({
+                    table_name: conn.execute(select([table])).fetchall()
+                    for table_name, table in meta.tables.items()
+                })
+            engine.dispose()
+        single_row, multi_row = table_rows
+        assert single_row['book']
+        assert single_row == multi_row
+
+    def test_zip64(self,
+                   saved_mock_project_file: Tuple[int, AnyStr],
+                   temp_output_file: Tuple[int, AnyStr],
+                   monkeypatch):
+        """Test that the tables exceeding the zip64 limit are written as zip64 entries."""
+        project_fd, project_file_path = saved_mock_project_file
+        output_fd, output_file_path = temp_output_file
+        monkeypatch.setattr(zipped_csv, 'ZIP64_LIMIT', 10)
+
+        controller = CommandLineController()
+        controller.execute([
+            ZippedCsvOutputDriver.cli_command,
+            project_file_path,
+            output_file_path
+        ])
+
+        meta = mock_book_author_publisher()
+        with ZipFile(output_file_path) as zip_file:
+            assert zip_file.testzip() is None
+            for table_name, table in meta.tables.items():
+                with zip_file.open('{}.csv'.format(table_name)) as entry:
+                    rows = list(csv.DictReader(io.TextIOWrapper(entry, encoding='utf-8')))
+                assert rows
+                assert set(rows[0]) == {column.name for column in table.columns}
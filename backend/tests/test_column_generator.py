@@ -0,0 +1,197 @@
+import random
+from collections import Counter
+from typing import Optional
+
+import pytest
+
+from core.model.generator_setting import GeneratorSetting
+from core.service.column_generator.base import RegisteredGenerator, SingleColumnGenerator, GeneratorCategory
+from core.service.column_generator.basic_generator import vectorized
+from core.service.column_generator.basic_generator.categorical import AliasTable
+from core.service.exception import GeneratorSettingError, GeneratorRegistrationError, SomeError
+from core.service.generation_procedure.database import GeneratedDatabase
+from core.service.generation_procedure.parallel import ShardPosition
+from core.service.injector import Injector
+from core.service.types import Types
+from tests.fixtures.column_generator import make_generator
+from tests.fixtures.data_provider import ListDataProvider
+
+
+class TestColumnGenerator:
+    """Test the column generators."""
+
+    def test_unique_mode_off_by_default(self):
+        """Test that the unique mode is opt-in and a setting without columns is rejected."""
+        assert make_generator('Integer', {}).unique is False
+        assert make_generator('String', {}, Types.STRING).unique is False
+        for name in ('Integer', 'String', 'Float'):
+            with pytest.raises(GeneratorSettingError):
+                RegisteredGenerator.get_by_name(name)(GeneratorSetting(name=name))
+
+    def test_unique_integers(self):
+        """Test that the unique integers exhaust the interval in an order depending on the seed."""
+        params = {'min': 1, 'max': 50, 'unique': True}
+
+        def draw(seed: Optional[float]):
+            generator = make_generator('Integer', params, seed=seed)
+            return [generator.make_scalar(None) for _ in range(50)]
+
+        first = draw(1.)
+        assert sorted(first) == list(range(1, 51))
+        assert draw(1.) == first
+        assert draw(2.) != first
+        assert draw(None) != draw(None)
+
+    def test_unique_integer_shards(self):
+        """Test that the shards of a table requesting the whole interval draw a permutation of it,
+        like the whole table does, and that the shards drawing extra integers stay disjoint."""
+        params = {'min': 1, 'max': 60, 'unique': True}
+        values = []
+        for index in range(4):
+            generator = make_generator('Integer', params, seed=11. + index)
+            generator.start_shard(ShardPosition(15 * index, 15, 60, index, 4), 0.5)
+            values.extend(generator.make_scalar(None) for _ in range(15))
+        assert sorted(values) == list(range(1, 61))
+        generator = make_generator('Integer', params, seed=0.5)
+        assert sorted(generator.make_scalar(None) for _ in range(60)) == list(range(1, 61))
+
+        params = {'min': 0, 'max': 199, 'unique': True}
+        values = []
+        for index in range(2):
+            generator = make_generator('Integer', params, seed=11. + index)
+            generator.start_shard(ShardPosition(50 * index, 50, 100, index, 2), 0.5)
+            values.extend(generator.make_scalar(None) for _ in range(100))
+        assert sorted(values) == list(range(200))
+
+    def test_shard_position(self):
+        """Test that the shard positions map the draws to disjoint numbers of the table sequence."""
+        positions = [ShardPosition(start, min(4, 10 - start), 10, index, 3)
+                     for index, start in enumerate(range(0, 10, 4))]
+        numbers = [position.sequence_number(draw) for position in positions for draw in range(position.row_count)]
+        assert numbers == list(range(10))
+        extra_numbers = [position.sequence_number(draw) for position in positions for draw in range(4, 8)]
+        assert len(set(extra_numbers)) == len(extra_numbers)
+        assert min(extra_numbers) == 10
+        whole_table = ShardPosition.whole_table(10)
+        assert [whole_table.sequence_number(draw) for draw in range(20)] == list(range(20))
+        extra_shard = ShardPosition.after_shards(10, 3, 8)
+        assert extra_shard.sequence_number(0) > max(extra_numbers)
+        assert [extra_shard.sequence_number(draw) for draw in range(3)] == list(range(31, 34))
+
+    def test_unique_strings(self):
+        """Test that the unique strings do not repeat and depend on the seed."""
+        params = {'min_length': 1, 'max_length': 2, 'unique': True}
+        generator = make_generator('String', params, Types.STRING)
+        values = [generator.make_scalar(None) for _ in range(500)]
+        assert len(set(values)) == 500
+        assert all(1 <= len(value) <= 2 for value in values)
+        other = make_generator('String', params, Types.STRING, seed=2.)
+        assert [other.make_scalar(None) for _ in range(500)] != values
+
+    def test_alias_table(self):
+        """Test that the alias table draws the outcomes in proportion to their weights."""
+        weights = [1., 0., 2., 7.]
+        alias_table = AliasTable(weights)
+        assert len(alias_table) == 4
+        random_inst = random.Random(0)
+        counts = Counter(alias_table.draw(random_inst) for _ in range(20000))
+        assert counts[1] == 0
+        for index, weight in enumerate(weights):
+            assert counts[index] / 20000 == pytest.approx(weight / 10, abs=0.02)
+        for invalid_weights in ([], [0., 0.]):
+            with pytest.raises(ValueError):
+                AliasTable(invalid_weights)
+
+    def test_categorical_estimation(self):
+        """Test that the categorical generator estimates the most common values
+        with their counts and generates them in proportion."""
+        generator = make_generator('Categorical', {'separator': ';', 'values': 'x;y;z'}, Types.STRING)
+        generator.max_estimated_values = 2
+        provider = ListDataProvider(['a'] * 6 + ['b'] * 3 + ['c'] + [None] * 2, Injector())
+        generator.estimate_params(provider)
+        assert generator.values == 'a;b'
+        assert generator.weights == '6,3'
+        assert generator.setting.null_frequency == pytest.approx(1 / 6)
+        generator.seed(1)
+        counts = Counter(generator.make_scalar(None) for _ in range(9000))
+        assert set(counts) == {'a', 'b'}
+        assert counts['a'] / 9000 == pytest.approx(2 / 3, abs=0.03)
+
+    def test_vectorized_batches(self):
+        """Test that the NumPy batches are reproducible, respect the parameters
+        and contain plain Python values with nulls in the requested frequency."""
+        pytest.importorskip('numpy')
+        cases = [
+            ('Integer', {'min': 3, 'max': 9}, Types.INTEGER, int),
+            ('Float', {'min': 3., 'max': 9.}, Types.FLOAT, float),
+            ('Gaussian', {'mu': 6., 'sigma': 1.}, Types.FLOAT, float),
+            ('Bernoulli', {'success_probability': 0.5}, Types.BOOL, bool),
+        ]
+        for name, params, col_type, value_type in cases:
+            generator = make_generator(name, params, col_type)
+            values = generator.make_batch(1000, None)['col']
+            assert len(values) == 1000
+            assert all(type(value) is value_type for value in values), name
+            assert make_generator(name, params, col_type).make_batch(1000, None)['col'] == values
+            assert make_generator(name, params, col_type, seed=2.).make_batch(1000, None)['col'] != values
+            if name in ('Integer', 'Float'):
+                assert all(3 <= value <= 9 for value in values)
+        generator = make_generator('Integer', {'min': 3, 'max': 9})
+        generator.setting.null_frequency = 0.5
+        values = generator.make_batch(1000, None)['col']
+        assert values.count(None) / 1000 == pytest.approx(0.5, abs=0.1)
+
+    def test_vectorized_fallback(self, monkeypatch):
+        """Test that without NumPy, the batches are the values of make_dict."""
+        monkeypatch.setattr(vectorized, 'numpy', None)
+        generator = make_generator('Integer', {'min': 3, 'max': 9})
+        generator.setting.null_frequency = 0.3
+        values = generator.make_batch(100, None)['col']
+        other = make_generator('Integer', {'min': 3, 'max': 9})
+        other.setting.null_frequency = 0.3
+        assert values == [other.make_dict(None)['col'] for _ in range(100)]
+        assert None in values
+
+    def test_registered_metadata(self):
+        """Test that the metadata of a generator type are resolved on its registration."""
+        metadata = RegisteredGenerator.get_metadata('Integer')
+        assert metadata.factory is RegisteredGenerator.get_by_name('Integer')
+        assert metadata.only_for_type == Types.INTEGER
+        assert metadata.category == GeneratorCategory.GENERAL
+        assert metadata.supports_null and not metadata.is_multi_column
+        assert 'max' in [param.name for param in metadata.param_list]
+        assert RegisteredGenerator.get_metadata('ForeignKey').is_multi_column
+        assert RegisteredGenerator.get_metadata('ForeignKey').only_for_type is None
+        with pytest.raises(SomeError):
+            RegisteredGenerator.get_metadata('Invalid')
+
+    def test_generators_for_type(self, monkeypatch):
+        """Test that the compatible generators are listed in order of registration,
+        memoized per column type until another generator type is registered."""
+        monkeypatch.setattr(RegisteredGenerator, '_by_name', dict(RegisteredGenerator._by_name))
+        monkeypatch.setattr(RegisteredGenerator, '_by_type', {})
+        integer_generators = RegisteredGenerator.for_type(Types.INTEGER)
+        assert integer_generators == [
+            metadata
+            for metadata in RegisteredGenerator.iter_metadata()
+            if metadata.only_for_type in (None, Types.INTEGER)
+        ]
+        names = [metadata.name for metadata in integer_generators]
+        assert 'Integer' in names and 'ForeignKey' in names and 'String' not in names
+        assert RegisteredGenerator.for_type(Types.INTEGER) is integer_generators
+
+        class ProbeGenerator(RegisteredGenerator, SingleColumnGenerator[int]):
+            """Generator registered by the test."""
+
+            def make_scalar(self, generated_database: GeneratedDatabase) -> int:
+                return 0
+
+        class DerivedProbeGenerator(ProbeGenerator):
+            """Generator deriving indirectly, which is not registered."""
+        refreshed = RegisteredGenerator.for_type(Types.INTEGER)
+        assert refreshed[-1].factory is ProbeGenerator
+        assert refreshed[:-1] == integer_generators
+        assert not RegisteredGenerator.is_name_registered('DerivedProbe')
+        with pytest.raises(GeneratorRegistrationError):
+            class InvalidGenerator(RegisteredGenerator):
+                pass
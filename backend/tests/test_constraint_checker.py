@@ -0,0 +1,87 @@
+from typing import Optional
+
+from core.model.meta_table import MetaTable
+from core.service.generation_procedure.constraint_checker import ConstraintChecker
+from core.service.generation_procedure.database import GeneratedRow
+from core.service.generation_procedure.key_set import KeyStorage
+from core.service.generation_procedure.requisition import ExportRequisition, ExportRequisitionRow
+from web.view.project import SavedProject
+
+
+def publisher_checker(saved_project: SavedProject, interactive_driver: bool = False, **kwargs) -> ConstraintChecker:
+    """Return a checker of a requisition of the publisher table."""
+    requisition = ExportRequisition([ExportRequisitionRow('publisher', 10, 5)])
+    return ConstraintChecker(saved_project.project, interactive_driver, requisition, **kwargs)
+
+
+def publisher_table(saved_project: SavedProject) -> MetaTable:
+    """Return the publisher table of the project."""
+    return next(meta_table for meta_table in saved_project.project.tables if meta_table.name == 'publisher')
+
+
+def publisher_row(company_name: Optional[str], parent_company: Optional[str] = None) -> GeneratedRow:
+    """Return a generated row of the publisher table."""
+    return {'company_name': company_name, 'parent_company': parent_company, 'is_public_company': True}
+
+
+class TestConstraintChecker:
+    """Test the integrity constraint checks of the generated rows."""
+
+    def test_find_violation(self, saved_mock_project: SavedProject):
+        """Test that each kind of constraint is reported by its qualified name."""
+        checker = publisher_checker(saved_mock_project)
+        publisher = publisher_table(saved_mock_project)
+        assert checker.find_violation(publisher, publisher_row('a')) is None
+        checker.register_row(publisher, publisher_row('a'))
+        assert checker.find_violation(publisher, publisher_row('a')).constraint_name == 'publisher.pk_publisher'
+        violation = checker.find_violation(publisher, publisher_row('b', 'c'))
+        assert violation.constraint_name == 'publisher.fk_publisher_parent'
+        assert violation.column_names == ['parent_company']
+        assert checker.check_row(publisher, publisher_row('b', 'a'))
+        violation = checker.find_violation(publisher, publisher_row(None))
+        assert violation.constraint_name == 'publisher.company_name'
+        checker.clean_up()
+
+    def test_interactive_primary_key(self, saved_mock_project: SavedProject):
+        """Test that the primary keys are not checked for interactive drivers, which generate them."""
+        checker = publisher_checker(saved_mock_project, interactive_driver=True)
+        publisher = publisher_table(saved_mock_project)
+        checker.register_row(publisher, publisher_row('a'))
+        assert checker.check_row(publisher, publisher_row('a'))
+        checker.clean_up()
+
+    def test_check_batch(self, saved_mock_project: SavedProject):
+        """Test that the batch check agrees with the row checks
+        and rejects the repetitions of unique tuples within the batch."""
+        checker = publisher_checker(saved_mock_project)
+        publisher = publisher_table(saved_mock_project)
+        checker.register_row(publisher, publisher_row('a'))
+        rows = [
+            publisher_row('a'),
+            publisher_row('b', 'a'),
+            publisher_row('b'),
+            publisher_row('c', 'b'),
+            publisher_row('d', 'x'),
+            publisher_row(None),
+            publisher_row('e'),
+        ]
+        assert checker.check_batch(publisher, rows) == [rows[1], rows[6]]
+        checker.clean_up()
+
+    def test_key_storages(self, saved_mock_project: SavedProject):
+        """Test that the unique checks give the same results with each key storage, filtered or not."""
+        publisher = publisher_table(saved_mock_project)
+        rows = [publisher_row(str(index % 7)) for index in range(20)]
+        for name in KeyStorage.get_storage_names():
+            for key_filter in (False, True):
+                checker = publisher_checker(saved_mock_project,
+                                            key_storage=KeyStorage.make_storage(name),
+                                            key_filter=key_filter)
+                passing = []
+                for row in rows:
+                    if checker.check_row(publisher, row):
+                        checker.register_row(publisher, row)
+                        passing.append(row['company_name'])
+                assert passing == [str(index) for index in range(7)], name
+                assert bool(checker.get_key_filter_statistics()) == key_filter
+                checker.clean_up()
@@ -0,0 +1,192 @@
+import os
+import statistics
+import tempfile
+
+import pytest
+from sqlalchemy import create_engine, MetaData, Table, Column, Integer
+
+from core.model.data_source import DataSource
+from core.service.data_source.data_provider.database_provider import DatabaseDataProvider
+from core.service.data_source.data_provider.profile import ColumnProfile
+from core.service.data_source.data_provider.sampling import EstimationBudget, reservoir_sample
+from core.service.data_source.database_common import DatabaseReflectionCache
+from core.service.data_source.identifier import Identifier
+from core.service.injector import Injector
+from tests.fixtures.data_provider import ListDataProvider
+
+
+@pytest.fixture
+def flag_database() -> DataSource:
+    """Create a temp sqlite database with a table of 1000 integer flags,
+    every fourth flag is 1, every tenth flag is null. A table without
+    a primary key holds the same flags. Another table is empty."""
+    fd, db_file = tempfile.mkstemp()
+    engine = create_engine('sqlite:///{}'.format(db_file))
+    meta = MetaData()
+    table = Table('flags', meta,
+                  Column('id', Integer, primary_key=True),
+                  Column('flag', Integer, nullable=True))
+    unkeyed_table = Table('unkeyed_flags', meta, Column('flag', Integer, nullable=True))
+    Table('other', meta, Column('id', Integer, primary_key=True))
+    meta.create_all(engine)
+    rows = [
+        {'id': i, 'flag': None if i % 10 == 0 else int(i % 4 == 0)}
+        for i in range(1, 1001)
+    ]
+    engine.execute(table.insert(), rows)
+    engine.execute(unkeyed_table.insert(), [{'flag': row['flag']} for row in rows])
+    engine.dispose()
+    yield DataSource(driver='sqlite', db=db_file)
+    os.close(fd)
+    os.unlink(db_file)
+
+
+class TestDataProvider:
+    """Test the estimates of the data providers."""
+
+    def test_database_true_count(self, flag_database: DataSource, monkeypatch):
+        """Test that the true count of a table larger than the sample
+        is comparable with its not null count."""
+        monkeypatch.setattr(EstimationBudget, 'max_rows', 50)
+        injector = Injector()
+        provider = DatabaseDataProvider(flag_database, [Identifier('flags', 'flag')], injector)
+        try:
+            assert provider.get_not_null_count() == 900
+            assert provider.get_true_count() == 200
+            assert len(provider.sample().values) == 50
+        finally:
+            injector.clean_up()
+
+    def test_block_sample_without_primary_key(self, flag_database: DataSource, monkeypatch):
+        """Test that the blocks of a table without a primary key are ordered by the sampled column."""
+        monkeypatch.setattr(EstimationBudget, 'max_rows', 50)
+        injector = Injector()
+        try:
+            provider = DatabaseDataProvider(flag_database, [Identifier('unkeyed_flags', 'flag')], injector)
+            statements = []
+            safe_exec = provider._safe_exec
+
+            def record_statement(query):
+                statements.append(str(query))
+                return safe_exec(query)
+            monkeypatch.setattr(provider, '_safe_exec', record_statement)
+            values = provider.sample().values
+            assert len(values) == 50
+            block_statements = [statement for statement in statements if 'LIMIT' in statement]
+            assert block_statements
+            assert all('ORDER BY unkeyed_flags.flag' in statement for statement in block_statements)
+        finally:
+            injector.clean_up()
+
+    def test_reflection_cache(self, flag_database: DataSource, monkeypatch):
+        """Test that the providers sharing an injector reflect each requested table once."""
+        reflected_tables = []
+        reflect = MetaData.reflect
+
+        def record_reflection(meta, bind=None, only=None, **kwargs):
+            reflected_tables.append(only)
+            return reflect(meta, bind=bind, only=only, **kwargs)
+        monkeypatch.setattr(MetaData, 'reflect', record_reflection)
+        injector = Injector()
+        try:
+            for _ in range(2):
+                provider = DatabaseDataProvider(flag_database, [Identifier('flags', 'flag')], injector)
+                assert provider.estimate_min() == 0
+                assert provider.estimate_max() == 1
+                assert provider.get_null_count() == 100
+            assert reflected_tables == [['flags']]
+            reflection_cache = injector.get(DatabaseReflectionCache)
+            table = reflection_cache.get_table(flag_database, 'flags')
+            assert reflection_cache.get_table(flag_database, 'missing') is None
+            reflection_cache.invalidate(flag_database)
+            assert reflection_cache.get_table(flag_database, 'flags') is not table
+            assert reflected_tables == [['flags'], ['flags']]
+        finally:
+            injector.clean_up()
+
+    def test_reservoir_sample_deterministic(self):
+        """Test that the sample depends only on the budget, unless the time is limited."""
+        budget = EstimationBudget.configured(max_rows=10, seed=3)
+        assert budget.make_deadline() is None
+        sample = reservoir_sample(range(1000), budget)
+        assert len(sample.values) == 10
+        assert sample.population_count == 1000
+        assert reservoir_sample(range(1000), budget) == sample
+        other = reservoir_sample(range(1000), EstimationBudget.configured(max_rows=10, seed=4))
+        assert other.values != sample.values
+
+    def test_sampled_estimates(self):
+        """Test that the counts are scaled to the whole data source
+        and the accuracy of the estimates is reported."""
+        injector = Injector()
+        injector.provide(EstimationBudget, EstimationBudget.configured(max_rows=100))
+        values = [None if i % 10 == 0 else i % 2 for i in range(1000)]
+        provider = ListDataProvider(values, injector)
+        assert provider.estimate_accuracy() is None
+        assert provider.get_count() == 1000
+        assert provider.get_null_count() + provider.get_not_null_count() == 1000
+        assert provider.get_null_count() == pytest.approx(100, abs=60)
+        assert provider.get_true_count() == pytest.approx(450, abs=150)
+        accuracy = provider.estimate_accuracy()
+        assert not accuracy.is_exact
+        assert accuracy.sample_count == 100
+        assert accuracy.population_count == 1000
+        assert 0 < accuracy.null_frequency_standard_error < 0.1
+        assert 0 < accuracy.mean_standard_error < 0.1
+
+    def test_exact_estimates(self):
+        """Test that the estimates covering the whole data source are exact."""
+        provider = ListDataProvider([None, 1, 2, 3], Injector())
+        assert provider.get_null_count() == 1
+        accuracy = provider.estimate_accuracy()
+        assert accuracy.is_exact
+        assert accuracy.mean_standard_error == 0.
+        assert accuracy.null_frequency_standard_error == 0.
+
+    def test_column_profile(self):
+        """Test the statistics of the single pass profile against the direct computations."""
+        numbers = [3, 1.5, 4, 1, 5, 9, 2, 6]
+        strings = ['a', 'bcd', '', 'a']
+        profile = ColumnProfile.from_values(numbers + [None, None])
+        assert (profile.count, profile.null_count, profile.not_null_count) == (10, 2, 8)
+        assert (profile.min, profile.max) == (1, 9)
+        assert profile.null_frequency == 0.2
+        assert profile.mean == pytest.approx(statistics.mean(numbers))
+        assert profile.variance == pytest.approx(statistics.pvariance(numbers))
+        assert profile.true_count == 8
+        profile = ColumnProfile.from_values(strings)
+        assert (profile.min_length, profile.max_length) == (0, 3)
+        assert profile.mean_length == 1.25
+        assert profile.true_count == 3
+        assert profile.distinct_count == 3
+        assert profile.top_values(1) == [('a', 2)]
+        assert profile.mean is None and profile.variance is None
+
+    def test_column_profile_heavy_hitter(self, monkeypatch):
+        """Test that a value more frequent than count / distinct limit is found beyond the limit."""
+        monkeypatch.setattr(ColumnProfile, 'distinct_limit', 4)
+        values = [value for index in range(100) for value in ('x', 'y{}'.format(index))]
+        profile = ColumnProfile.from_values(values)
+        assert profile.distinct_count is None
+        assert profile.top_values(1)[0][0] == 'x'
+
+    def test_single_pass(self):
+        """Test that all estimates of a provider are served by a single pass over its data."""
+        passes = []
+
+        class CountingProvider(ListDataProvider):
+            def scalar_data(self):
+                passes.append(1)
+                return super().scalar_data()
+        provider = CountingProvider([None, 1, 2, 3, 0], Injector())
+        assert provider.estimate_min() == 0
+        assert provider.estimate_max() == 3
+        assert provider.get_count() == 5
+        assert provider.get_null_count() == 1
+        assert provider.get_not_null_count() == 4
+        assert provider.get_true_count() == 3
+        assert provider.estimate_null_frequency() == 0.2
+        assert provider.estimate_mean() == 1.5
+        assert provider.estimate_variance() == 1.25
+        assert provider.top_values(1)[0][1] == 1
+        assert len(passes) == 1
@@ -1,10 +1,21 @@
+import os
 from io import BytesIO
 from typing import Tuple
 
+import pytest
 from flask.testing import FlaskClient
-from sqlalchemy import MetaData
+from sqlalchemy import MetaData, select, func
 
+from core.facade.data_source import DataSourceFacade
+from core.service.data_source.csv_common import CsvColumnCache
+from core.service.data_source.data_provider.database_provider import DatabaseDataProvider
+from core.service.data_source.data_provider.sampling import EstimationBudget
+from core.service.data_source.database_common import DatabaseConnectionManager
+from core.service.generation_procedure.requisition import ExportRequisition, ExportRequisitionRow
+from core.service.generation_procedure.statistics import ProcedureTableStatistics
+from core.service.data_source.json_common import JsonDocumentCache, JsonStreamReader
 from core.service.mock_schema import mock_book_author_publisher
+from core.service.output_driver.database import DatabaseOutputDriver
 from tests.fixtures.data_source import UserMockDataSource
 from tests.fixtures.project import UserProject
 from tests.validator.project_view_meta import ProjectViewMetaValidator
@@ -35,6 +46,22 @@ class TestDataSource:
         validator = ProjectViewMetaValidator(json, meta)
         validator.validate()
 
+    def test_import_from_mock_sampled(self,
+                                      client: FlaskClient,
+                                      user_mock_database: UserMockDataSource,
+                                      auth_header: dict,
+                                      monkeypatch):
+        """Test schema import from the mock database, where the estimates
+        are based on small samples read at random offsets."""
+        monkeypatch.setattr(EstimationBudget, 'max_rows', 2)
+        monkeypatch.setattr(DatabaseDataProvider, 'sample_block_size', 1)
+        url = '/api/data-source/{}/import'.format(user_mock_database.data_source.id)
+        response = client.post(url, headers=auth_header)
+        json = response.get_json()
+        meta = mock_book_author_publisher()
+        validator = ProjectViewMetaValidator(json, meta)
+        validator.validate()
+
     def test_upload_json(self,
                          client: FlaskClient,
                          user_project: UserProject,
@@ -66,6 +93,21 @@ class TestDataSource:
         validator = ProjectViewMetaValidator(json, mock_json_meta, False)
         validator.validate()
 
+    def test_import_from_json_streamed(self,
+                                       client: FlaskClient,
+                                       user_mock_json: UserMockDataSource,
+                                       mock_json_meta: MetaData,
+                                       auth_header: dict,
+                                       monkeypatch):
+        """Test schema import from a JSON file, which is streamed in small chunks."""
+        monkeypatch.setattr(JsonDocumentCache, 'stream_bytes', 0)
+        monkeypatch.setattr(JsonStreamReader, 'chunk_size', 7)
+        url = '/api/data-source/{}/import'.format(user_mock_json.data_source.id)
+        response = client.post(url, headers=auth_header)
+        json = response.get_json()
+        validator = ProjectViewMetaValidator(json, mock_json_meta, False)
+        validator.validate()
+
     def test_import_from_csv(self,
                              client: FlaskClient,
                              user_mock_csv: UserMockDataSource,
@@ -78,6 +120,29 @@ class TestDataSource:
         validator = ProjectViewMetaValidator(json, mock_csv_meta, False)
         validator.validate()
 
+    def test_csv_column_cache(self,
+                              client: FlaskClient,
+                              user_mock_csv: UserMockDataSource,
+                              auth_header: dict):
+        """Test that the schema import from a CSV file builds its columnar cache."""
+        url = '/api/data-source/{}/import'.format(user_mock_csv.data_source.id)
+        client.post(url, headers=auth_header)
+        cache = CsvColumnCache(user_mock_csv.data_source.file_path)
+        assert cache.is_fresh()
+        assert list(cache.iter_column('length')) == [123., 99.5, 12.]
+        assert list(cache.iter_column('box_office')) == ['', '$333', '$9']
+
+    def test_csv_column_cache_invalid_row(self, tmp_path):
+        """Test that a row failing to parse leaves neither the cache nor its temporary directory."""
+        file_path = str(tmp_path / 'data.csv')
+        with open(file_path, 'w') as file:
+            file.write('"name","length"\n"a",1\n"b",x\n')
+        cache = CsvColumnCache(file_path)
+        with pytest.raises(ValueError):
+            cache.build_from_file()
+        assert not cache.is_fresh()
+        assert os.listdir(str(tmp_path)) == ['data.csv']
+
     def test_import_from_circular(self,
                                   client: FlaskClient,
                                   user_mock_circular_database: UserMockDataSource,
@@ -90,3 +155,51 @@ class TestDataSource:
         json = response.get_json()
         validator = ProjectViewMetaValidator(json, circular_meta)
         validator.validate()
+
+    def test_export_to_mock(self,
+                            client: FlaskClient,
+                            user_import_mock_database: UserMockDataSource,
+                            auth_header: dict,
+                            monkeypatch):
+        """Test that the export to a database inserts the rows in batches."""
+        batch_sizes = []
+        insert_rows = DatabaseOutputDriver.insert_rows
+
+        def record_batch_size(driver, rows):
+            batch_sizes.append(len(rows))
+            return insert_rows(driver, rows)
+        monkeypatch.setattr(DatabaseOutputDriver, 'insert_rows', record_batch_size)
+        data = {
+            'rows': [
+                {'table_name': table_name, 'row_count': 5, 'seed': 3}
+                for table_name in mock_book_author_publisher().tables
+            ]
+        }
+        url = '/api/data-source-database/{}/export'.format(user_import_mock_database.data_source.id)
+        response = client.post(url, json=data, headers=auth_header)
+        assert response.status_code == 200
+        assert batch_sizes
+        assert max(batch_sizes) > 1
+
+    def test_export_constrained_table(self, injector, user_import_mock_database: UserMockDataSource, monkeypatch):
+        """Test that the export in batches repairs the rows violating the constraints like the row mode,
+        so that it inserts all requested rows."""
+        retried_constraints = []
+        retry = ProcedureTableStatistics.retry
+
+        def record_retry(stats, constraint_name, count=1):
+            retried_constraints.append(constraint_name)
+            return retry(stats, constraint_name, count)
+        monkeypatch.setattr(ProcedureTableStatistics, 'retry', record_retry)
+        data_source = user_import_mock_database.data_source
+        publisher_table = next(meta_table for meta_table in data_source.project.tables if meta_table.name == 'publisher')
+        company_name = next(meta_column for meta_column in publisher_table.columns if meta_column.name == 'company_name')
+        company_name.generator_setting.name = 'String'
+        company_name.generator_setting.params = {'min_length': 8, 'max_length': 8, 'unique': False}
+        company_name.generator_setting.null_frequency = 0.5
+        requisition = ExportRequisition([ExportRequisitionRow('publisher', 30, 3)])
+        injector.get(DataSourceFacade).export_to_data_source(data_source, requisition)
+        publisher = mock_book_author_publisher().tables['publisher']
+        with injector.get(DatabaseConnectionManager).get_engine(data_source).connect() as conn:
+            assert conn.execute(select([func.count()]).select_from(publisher)).scalar() == 30
+        assert 'publisher.company_name' in retried_constraints
@@ -0,0 +1,82 @@
+import gc
+import threading
+
+from core.service.column_generator.faker_generator.pool import FakerPool
+from core.service.types import Types
+from tests.fixtures.column_generator import make_generator
+
+
+class Owner:
+    """Object holding a Faker instance."""
+
+
+class TestFakerPool:
+    """Test the reuse of the Faker instances."""
+
+    def test_reuse(self):
+        """Test that an instance is handed out to a single owner at a time
+        and reused once its owner is garbage collected."""
+        owner, other_owner = Owner(), Owner()
+        fake = FakerPool.acquire(owner)
+        assert FakerPool.acquire(other_owner) is not fake
+        assert FakerPool.acquire(Owner(), 'de_DE') is not fake
+        del owner
+        gc.collect()
+        assert FakerPool.acquire(Owner()) is fake
+
+    def test_cross_thread_release(self):
+        """Test that an instance released in another thread is reused by the current thread."""
+        acquired = []
+
+        def acquire_in_thread():
+            owner = Owner()
+            acquired.append(FakerPool.acquire(owner))
+            del owner
+
+        thread = threading.Thread(target=acquire_in_thread)
+        thread.start()
+        thread.join()
+        gc.collect()
+        assert FakerPool.acquire(Owner()) is acquired[0]
+
+    def test_cap(self, monkeypatch):
+        """Test that at most max_free_count instances of a locale are kept."""
+        monkeypatch.setattr(FakerPool, 'max_free_count', 2)
+        monkeypatch.setattr(FakerPool, '_free_instances', {})
+        owners = [Owner() for _ in range(4)]
+        for owner in owners:
+            FakerPool.acquire(owner)
+        del owner, owners
+        gc.collect()
+        assert FakerPool.free_count() == 2
+
+    def test_fresh_random_state(self):
+        """Test that a reused instance does not keep the random state of its previous owner."""
+        owner = Owner()
+        fake = FakerPool.acquire(owner)
+        fake.seed_instance(1)
+        state = fake.random.getstate()
+        del owner
+        gc.collect()
+        assert FakerPool.acquire(Owner()) is fake
+        assert fake.random.getstate() != state
+
+    def test_independent_seeding(self):
+        """Test that the generators alive at the same time draw independently,
+        and a generator with a reused instance draws like one with a new instance."""
+        def draw(seed: float) -> list:
+            generator = make_generator('Name', {}, Types.STRING, seed=seed)
+            return [generator.make_scalar(None) for _ in range(20)]
+
+        expected = draw(1.)
+        first = make_generator('Name', {}, Types.STRING, seed=1.)
+        second = make_generator('Name', {}, Types.STRING, seed=2.)
+        values = []
+        for _ in range(20):
+            values.append(first.make_scalar(None))
+            second.make_scalar(None)
+        assert values == expected
+        del first, second
+        gc.collect()
+        assert draw(1.) == expected
+        assert draw(2.) != expected
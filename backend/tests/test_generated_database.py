@@ -0,0 +1,63 @@
+import os
+from datetime import datetime
+
+import pytest
+
+from core.service.exception import SomeError
+from core.service.generation_procedure.database import TableStorage, SqliteStorage, GeneratedDatabase
+from core.service.types import Types
+
+
+class TestGeneratedDatabase:
+    """Test the storages of the generated rows."""
+
+    def test_kept_columns(self):
+        """Test that each storage keeps only the kept columns and returns their values unchanged."""
+        kept_columns = {'id': Types.INTEGER, 'created': Types.DATETIME, 'active': Types.BOOL}
+        rows = [
+            {'id': index, 'created': datetime(2020, 1, 1, index), 'active': index % 2 == 0, 'name': 'x'}
+            for index in range(5)
+        ] + [{'id': None, 'created': None, 'active': None, 'name': None}]
+        expected = [{name: row[name] for name in kept_columns} for row in rows]
+        for name in TableStorage.get_storage_names():
+            storage = TableStorage.make_storage(name)
+            table = storage.make_table('t', kept_columns)
+            for row in rows:
+                table.append(row)
+            assert len(table) == 6
+            assert list(table) == expected, name
+            assert table[-1] == expected[-1]
+            with pytest.raises(IndexError):
+                table[6]
+            storage.clean_up()
+
+    def test_whole_rows(self):
+        """Test that the tables keeping whole rows keep all columns, even the ones missing in the first row."""
+        for name in TableStorage.get_storage_names():
+            database = GeneratedDatabase(TableStorage.make_storage(name))
+            table = database.add_table('t')
+            table.append({'a': 1})
+            table.append({'a': 2, 'b': 'y'})
+            assert [row.get('b') for row in table] == [None, 'y'], name
+            assert database.get_table_row_count('t') == 2
+            assert database.get_table_row_count('missing') == 0
+            database.clean_up()
+
+    def test_no_kept_columns(self):
+        """Test that a table keeping no columns still counts the rows."""
+        for name in TableStorage.get_storage_names():
+            storage = TableStorage.make_storage(name)
+            table = storage.make_table('t', {})
+            table.append({'a': 1})
+            assert len(table) == 1
+            assert table[0] == {}
+            storage.clean_up()
+
+    def test_invalid_storage(self):
+        """Test that an unknown storage name is rejected and the disk storage removes its file."""
+        with pytest.raises(SomeError):
+            TableStorage.make_storage('invalid')
+        storage = SqliteStorage()
+        storage.clean_up()
+        assert not os.path.exists(storage._db_file)
+        storage.clean_up()
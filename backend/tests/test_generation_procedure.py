@@ -0,0 +1,134 @@
+import os
+from typing import Optional
+
+import pytest
+
+from core.service.generation_procedure.controller import ProcedureController
+from core.service.generation_procedure.database import SqliteStorage, GeneratedRow
+from core.service.generation_procedure.requisition import ExportRequisition, ExportRequisitionRow
+from core.service.generation_procedure.statistics import ProcedureTableStatistics
+from core.service.output_driver import PreviewOutputDriver
+from tests.fixtures.data_source import narrow_publisher_names
+from web.view.project import SavedProject
+
+
+class KeyOnlyOutputDriver(PreviewOutputDriver):
+    """Preview driver, which does not need the whole generated rows."""
+    needs_generated_rows = False
+
+
+class FailingOutputDriver(PreviewOutputDriver):
+    """Preview driver, which fails on the first inserted row."""
+
+    def insert_row(self, row: GeneratedRow) -> Optional[GeneratedRow]:
+        raise RuntimeError('Insertion failed')
+
+
+def publisher_requisition(row_count: int) -> ExportRequisition:
+    """Return a requisition of the publisher table only."""
+    return ExportRequisition([ExportRequisitionRow('publisher', row_count, 5)])
+
+
+class TestGenerationProcedure:
+    """Test the generation procedure controller."""
+
+    def test_repair_row(self, saved_mock_project: SavedProject):
+        """Test that a row violating a primary key is repaired
+        by regenerating only the columns of the key."""
+        publisher = narrow_publisher_names(saved_mock_project.project)
+        controller = ProcedureController(saved_mock_project.project, publisher_requisition(10), PreviewOutputDriver())
+        generators = controller._table_generators(publisher)
+        controller.seed_all(generators, 1)
+        database = controller._database
+        checker = controller._checker
+        row = controller._make_row(generators, database)
+        checker.register_row(publisher, row)
+
+        stats = ProcedureTableStatistics('publisher', 10)
+        violating_row = dict(row)
+        violation = checker.find_violation(publisher, violating_row)
+        assert violation.constraint_name == 'publisher.pk_publisher'
+        assert [generator.setting.name for generator in controller._violating_generators(generators, violation)] \
+            == ['String']
+        assert controller._repair_row(publisher, violating_row, generators, database, checker, stats)
+        assert violating_row['company_name'] != row['company_name']
+        for column_name, value in row.items():
+            if column_name != 'company_name':
+                assert violating_row[column_name] == value
+        assert stats.retry_counts['publisher.pk_publisher'] >= 1
+        checker.clean_up()
+
+    def test_shard_retry_counts(self, saved_mock_project: SavedProject):
+        """Test that the retries in the worker tasks are counted in the statistics of the run."""
+        narrow_publisher_names(saved_mock_project.project)
+        for shard_size in (None, 4):
+            controller = ProcedureController(saved_mock_project.project,
+                                             publisher_requisition(20),
+                                             PreviewOutputDriver(),
+                                             workers=1,
+                                             shard_size=shard_size)
+            generated = controller.run()
+            assert len(generated.get_table('publisher')) == 20
+            generated.clean_up()
+            assert controller.statistics.retry_counts['publisher.pk_publisher'] > 0
+
+    def test_batch_sizes(self):
+        """Test that the batches neither exceed the missing rows nor the tolerated attempts."""
+        stats = ProcedureTableStatistics('publisher', 10)
+        assert stats.next_batch_size(4) == 4
+        for _ in range(8):
+            stats.succeed_insert()
+        assert stats.next_batch_size(4) == 2
+        stats.fail_check(11)
+        assert stats.next_batch_size(4) == 1
+        assert list(ProcedureController._batch_rows({'a': [1, 2], 'b': ['x', 'y']}, 2)) == \
+            [{'a': 1, 'b': 'x'}, {'a': 2, 'b': 'y'}]
+        assert list(ProcedureController._batch_rows({}, 3)) == [{}, {}, {}]
+
+    def test_batch_mode(self, saved_mock_project: SavedProject):
+        """Test that the batch mode generates the same rows as the row mode
+        in a table without foreign keys."""
+        requisition = ExportRequisition([ExportRequisitionRow('place', 10, 5)])
+        generated_rows = []
+        for batch_size in (None, 3):
+            controller = ProcedureController(saved_mock_project.project,
+                                             requisition,
+                                             PreviewOutputDriver(),
+                                             batch_size=batch_size)
+            generated = controller.run()
+            generated_rows.append(list(generated.get_table('place')))
+            generated.clean_up()
+        row_mode, batch_mode = generated_rows
+        assert len(row_mode) == 10
+        assert row_mode == batch_mode
+
+    def test_kept_columns(self, saved_mock_project: SavedProject):
+        """Test that only the columns referenced from the requisition are kept,
+        unless the output driver needs whole rows."""
+        requisition = ExportRequisition([
+            ExportRequisitionRow('publisher', 10, 5),
+            ExportRequisitionRow('place', 10, 5)
+        ])
+        project = saved_mock_project.project
+        controller = ProcedureController(project, requisition, KeyOnlyOutputDriver())
+        tables = {meta_table.name: meta_table for meta_table in project.tables}
+        publisher = tables['publisher']
+        assert set(controller._kept_columns(publisher)) == {'company_name'}
+        assert controller._kept_columns(tables['place']) == {}
+        generated = controller.run()
+        assert all(set(row) == {'company_name'} for row in generated.get_table('publisher'))
+        assert len(generated.get_table('place')) == 10
+        generated.clean_up()
+        controller = ProcedureController(project, requisition, PreviewOutputDriver())
+        assert controller._kept_columns(publisher) is None
+
+    def test_failed_run_cleans_up(self, saved_mock_project: SavedProject):
+        """Test that a failed run removes the file of the disk storage."""
+        storage = SqliteStorage()
+        controller = ProcedureController(saved_mock_project.project,
+                                         publisher_requisition(10),
+                                         FailingOutputDriver(),
+                                         storage=storage)
+        with pytest.raises(RuntimeError):
+            controller.run()
+        assert not os.path.exists(storage._db_file)
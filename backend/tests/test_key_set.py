@@ -0,0 +1,78 @@
+from core.service.generation_procedure.key_set import KeyStorage, HashedKeySet, CompactKeySet, \
+    FilteredKeySet, TupleKeySet
+
+
+class TestKeySet:
+    """Test the storages of the unique keys."""
+
+    def test_colliding_hashes(self):
+        """Test that distinct keys with equal hashes are told apart."""
+        assert hash(-1) == hash(-2)
+        for key_set in (HashedKeySet(), CompactKeySet()):
+            key_set.add(('a', -1))
+            assert ('a', -1) in key_set
+            assert ('a', -2) not in key_set
+            key_set.add(('a', -2))
+            assert ('a', -2) in key_set
+            assert len(key_set) == 2
+
+    def test_storages_agree(self):
+        """Test that each storage keeps the same set of keys as a set does."""
+        keys = [(value % 97, 'x' * (value % 5)) for value in range(500)] + [(None, None), (-1, ''), (-2, '')]
+        for name in KeyStorage.get_storage_names():
+            storage = KeyStorage.make_storage(name)
+            key_set = storage.make_key_set()
+            expected = set()
+            for key in keys[::2]:
+                key_set.add(key)
+                expected.add(key)
+            for key in keys:
+                assert (key in key_set) == (key in expected), (name, key)
+            assert len(key_set) == len(expected)
+            storage.clean_up()
+
+    def test_compact_bitmap(self):
+        """Test that dense integer keys stay in the bitmap and sparse ones move to the hashed arena."""
+        key_set = CompactKeySet()
+        for value in range(100, 0, -1):
+            key_set.add((value,))
+        assert key_set._bitmap is not None
+        assert (50,) in key_set and (0,) not in key_set
+        key_set.add((10 ** 12,))
+        assert key_set._bitmap is None
+        assert (50,) in key_set and (10 ** 12,) in key_set and len(key_set) == 101
+
+    def test_filtered_key_set(self):
+        """Test that the filter answers the lookups of new keys and counts them."""
+        key_set = FilteredKeySet(TupleKeySet(), 100)
+        for value in range(100):
+            key_set.add((value,))
+        assert all((value,) in key_set for value in range(100))
+        assert not any((value,) in key_set for value in range(100, 1100))
+        statistics = key_set.statistics
+        assert statistics.lookup_count == 1100
+        assert statistics.filtered_count + statistics.false_positive_count == 1000
+        assert statistics.filtered_count > 900
+        assert len(key_set) == 100
+        assert 'answered by the filter' in str(statistics)
+
+    def test_filter_throughput(self):
+        """Test that the batch lookups are timed and agree with the single lookups,
+        and that the statistics of two filters add up."""
+        key_set = FilteredKeySet(TupleKeySet(), 100)
+        for value in range(0, 200, 2):
+            key_set.add((value,))
+        keys = [(value,) for value in range(200)]
+        assert key_set.statistics.lookups_per_second is None
+        assert key_set.contains_many(keys) == [key in key_set for key in keys]
+        statistics = key_set.statistics
+        assert statistics.lookup_count == 400
+        assert statistics.timed_lookup_count >= 200
+        assert statistics.lookups_per_second > 0
+        assert 'lookups/s' in str(statistics)
+        merged = FilteredKeySet(TupleKeySet(), 100).statistics
+        merged.merge(statistics)
+        merged.merge(statistics)
+        assert merged.lookup_count == 800
+        assert merged.timed_lookup_count == 2 * statistics.timed_lookup_count
+        assert merged.hit_rate == statistics.hit_rate
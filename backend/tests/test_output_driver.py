@@ -0,0 +1,150 @@
+from contextlib import contextmanager
+from datetime import datetime, date
+from types import SimpleNamespace
+from typing import List, Tuple, Any
+
+from sqlalchemy import MetaData, Table, Column, Integer, String, LargeBinary, DateTime, Boolean, Date, Float
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import IntegrityError
+
+from core.model.meta_column import MetaColumn
+
+from core.service.data_source.database_common import DatabaseConnectionManager
+from core.service.output_driver.database import DatabaseOutputDriver
+from core.service.output_driver.file_driver.insert_script import InsertTemplate, InsertScriptOutputDriver
+
+
+class StubCursor:
+    """DBAPI cursor recording the COPY statements and their data."""
+
+    def __init__(self, copies: List[Tuple[str, str]]):
+        self._copies = copies
+
+    def copy_expert(self, statement: str, file):
+        self._copies.append((statement, file.read()))
+
+    def close(self):
+        pass
+
+
+class StubConnection:
+    """Connection to PostgreSQL through psycopg2, recording the COPY statements."""
+
+    def __init__(self, responses: List[Any] = ()):
+        self.dialect = postgresql.dialect()
+        self.copies: List[Tuple[str, str]] = []
+        self.connection = self
+        self._responses = list(responses)
+        """Results of the executed statements in order, an exception is raised."""
+
+    def execute(self, statement, *args):
+        response = self._responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    def cursor(self) -> StubCursor:
+        return StubCursor(self.copies)
+
+    @contextmanager
+    def begin(self):
+        yield
+
+
+def make_result(returned_keys: List[Tuple] = (), inserted_primary_key: List[Any] = ()) -> SimpleNamespace:
+    """Return an execution result with the given returned keys."""
+    return SimpleNamespace(fetchall=lambda: list(returned_keys), inserted_primary_key=list(inserted_primary_key))
+
+
+class TestOutputDriver:
+    """Test the output drivers."""
+
+    def test_copy_rows(self):
+        """Test the CSV payload of the COPY FROM STDIN statement."""
+        table = Table('item', MetaData(),
+                      Column('id', Integer, primary_key=True),
+                      Column('name', String),
+                      Column('note', String),
+                      Column('data', LargeBinary),
+                      Column('created', DateTime),
+                      Column('day', Date),
+                      Column('flag', Boolean))
+        rows = [
+            {'id': 1, 'name': 'say "hi", bye', 'note': None, 'data': b'\x00\xff',
+             'created': datetime(2021, 1, 2, 3, 4, 5), 'day': date(2021, 1, 2), 'flag': True},
+            {'id': 2, 'name': 'two\nlines', 'note': '', 'data': None,
+             'created': None, 'day': None, 'flag': False},
+        ]
+        conn = StubConnection()
+        driver = DatabaseOutputDriver('postgresql://', DatabaseConnectionManager())
+        driver._conn = conn
+        driver._current_table = table
+
+        assert driver.insert_rows(rows) == rows
+        statement, data = conn.copies[0]
+        assert statement == 'COPY item (id, name, note, data, created, day, flag) FROM STDIN WITH (FORMAT csv)'
+        assert data == '1,"say ""hi"", bye",,"\\x00ff","2021-01-02 03:04:05","2021-01-02",true\n' \
+                       '2,"two\nlines","",,,,false\n'
+
+    def test_insert_returning_rollback(self):
+        """Test that the keys returned in a rolled back transaction are not stored in the rows."""
+        table = Table('item', MetaData(), Column('id', Integer, primary_key=True), Column('name', String))
+        rows = [{'name': name} for name in 'abcd']
+        violation = IntegrityError('INSERT', {}, Exception())
+        conn = StubConnection([
+            # two multi-row statements, the second one fails
+            make_result(returned_keys=[(101,), (102,)]),
+            violation,
+            # the rows inserted one by one, the second one fails
+            make_result(inserted_primary_key=[201]),
+            violation,
+            make_result(inserted_primary_key=[203]),
+            make_result(inserted_primary_key=[204]),
+        ])
+        # enabled by the dialect on the first connection to the server
+        conn.dialect.implicit_returning = True
+        driver = DatabaseOutputDriver('postgresql://', DatabaseConnectionManager())
+        driver.max_parameters = 2
+        driver._conn = conn
+        driver._current_table = table
+        driver._primary_constraint = SimpleNamespace(constrained_columns=[MetaColumn(name='id')])
+
+        results = driver.insert_rows(rows)
+        assert results == [{'name': 'a', 'id': 201}, None, {'name': 'c', 'id': 203}, {'name': 'd', 'id': 204}]
+        assert rows[1] == {'name': 'b'}
+
+    def test_insert_template(self):
+        """Test the literals rendered by the INSERT statement template."""
+        table = Table('item', MetaData(),
+                      Column('id', Integer, primary_key=True),
+                      Column('name', String),
+                      Column('price', Float),
+                      Column('flag', Boolean),
+                      Column('created', DateTime))
+        template = InsertTemplate(table, ('id', 'name', 'price', 'flag', 'created'))
+        values = [
+            template.render_values({'id': 1, 'name': "it's", 'price': 2.5, 'flag': True,
+                                    'created': datetime(2021, 1, 2, 3, 4, 5)}),
+            template.render_values({'id': 2, 'name': None, 'price': None, 'flag': False, 'created': None})
+        ]
+        assert template.render(values) == \
+            'INSERT INTO item (id, name, price, flag, created) VALUES ' \
+            "(1, 'it''s', 2.5, true, '2021-01-02 03:04:05'), (2, NULL, NULL, false, NULL)"
+
+    def test_template_cache(self):
+        """Test that the rows with the same keys share a template in any key order,
+        and the rows with other keys or of another table get their own."""
+        meta = MetaData()
+        item = Table('item', meta, Column('id', Integer, primary_key=True), Column('name', String))
+        other = Table('other', meta, Column('id', Integer, primary_key=True), Column('name', String))
+        driver = InsertScriptOutputDriver()
+        driver.switch_table(item, None)
+        template = driver._get_template({'id': 1, 'name': 'a'})
+        assert driver._get_template({'name': 'b', 'id': 2}) is template
+        id_template = driver._get_template({'id': 3})
+        assert id_template is not template
+        assert id_template.render([id_template.render_values({'id': 3})]) == 'INSERT INTO item (id) VALUES (3)'
+        assert driver._get_template({'id': 4, 'name': 'c'}) is template
+        driver.switch_table(other, None)
+        assert driver._get_template({'id': 1, 'name': 'a'}) is not template
+        assert len(driver._templates) == 3
@@ -0,0 +1,177 @@
+import multiprocessing
+import os
+
+import pytest
+from sqlalchemy import MetaData
+
+from core.model.meta_constraint import MetaConstraint
+from core.model.project import Project
+from core.service.generation_procedure.controller import ProcedureController
+from core.service.generation_procedure.database import GeneratedDatabase
+from core.service.generation_procedure.parallel import WorkerPool, TableResult
+from core.service.generation_procedure.requisition import ExportRequisition, ExportRequisitionRow
+from core.service.output_driver import PreviewOutputDriver
+from tests.fixtures.data_source import UserMockDataSource
+from web.view.project import SavedProject
+
+
+def generate_in_process(value: int) -> TableResult:
+    """Return a result recording the value and the current process."""
+    return TableResult(rows=[{'value': value, 'pid': os.getpid()}], check_failure_count=0)
+
+
+def assert_references_exist(project: Project, generated: GeneratedDatabase):
+    """Check that the foreign keys reference generated rows."""
+    for meta_table in project.tables:
+        for constraint in meta_table.constraints:
+            if constraint.constraint_type != MetaConstraint.FOREIGN:
+                continue
+            ref_keys = {
+                tuple(row[column.name] for column in constraint.referenced_columns)
+                for row in generated.get_table(constraint.referenced_columns[0].table.name)
+            }
+            for row in generated.get_table(meta_table.name):
+                key = tuple(row[column.name] for column in constraint.constrained_columns)
+                assert key in ref_keys or all(value is None for value in key)
+
+
+class TestParallel:
+    """Test the generation of tables in worker processes."""
+
+    def test_worker_pool(self):
+        """Test that the tasks run in forked workers and the results keep the order of the tasks."""
+        tasks = [(value,) for value in range(6)]
+        with WorkerPool(generate_in_process, 1) as pool:
+            results = pool.map(tasks)
+        assert [result.rows[0]['value'] for result in results] == list(range(6))
+        assert {result.rows[0]['pid'] for result in results} == {os.getpid()}
+        if 'fork' not in multiprocessing.get_all_start_methods():
+            pytest.skip('The platform cannot fork')
+        with WorkerPool(generate_in_process, 3) as pool:
+            results = pool.map(tasks)
+        assert [result.rows[0]['value'] for result in results] == list(range(6))
+        assert os.getpid() not in {result.rows[0]['pid'] for result in results}
+
+    def test_dependency_levels(self, saved_mock_project: SavedProject):
+        """Test that each table is placed one level after the tables it references,
+        ignoring the references to itself."""
+        controller = ProcedureController(saved_mock_project.project,
+                                         saved_mock_project.requisition,
+                                         PreviewOutputDriver(),
+                                         workers=2)
+        levels = [
+            sorted(meta_table.name for _, meta_table in level)
+            for level in controller._dependency_levels()
+        ]
+        assert levels == [['place', 'publisher'], ['author'], ['book'], ['book_purchase']]
+
+    def test_cycle_levels(self, user_import_cycle_database: UserMockDataSource, cycle_meta: MetaData):
+        """Test that the tables of a reference cycle are generated one by one,
+        so that the later tables reference the rows of the earlier ones."""
+        project = user_import_cycle_database.data_source.project
+        requisition = ExportRequisition([
+            ExportRequisitionRow(table_name, 10, 3)
+            for table_name in cycle_meta.tables
+        ])
+        controller = ProcedureController(project, requisition, PreviewOutputDriver(), workers=2)
+        levels = controller._dependency_levels()
+        assert [len(level) for level in levels] == [1] * len(cycle_meta.tables)
+        generated = controller.run()
+        for _, meta_table in [level[0] for level in levels[1:]]:
+            rows = list(generated.get_table(meta_table.name))
+            assert rows
+            assert any(row['fid'] is not None for row in rows), meta_table.name
+        assert_references_exist(project, generated)
+        generated.clean_up()
+
+    def test_parallel_run(self, saved_mock_project: SavedProject):
+        """Test that the tables generated by the workers reference each other's rows."""
+        project = saved_mock_project.project
+        controller = ProcedureController(project, saved_mock_project.requisition, PreviewOutputDriver(), workers=3)
+        generated = controller.run()
+        for row in saved_mock_project.requisition.rows:
+            assert generated.get_table_row_count(row.table_name) > 0
+        assert_references_exist(project, generated)
+        generated.clean_up()
+
+    def test_worker_key_filters(self, saved_mock_project: SavedProject):
+        """Test that the lookups of the filtered key sets in the workers are merged into the run statistics."""
+        controller = ProcedureController(saved_mock_project.project,
+                                         saved_mock_project.requisition,
+                                         PreviewOutputDriver(),
+                                         batch_size=5,
+                                         workers=2,
+                                         key_filter=True)
+        controller.run().clean_up()
+        key_filters = controller.statistics.key_filters
+        assert key_filters['publisher.pk_publisher'].lookup_count > 0
+        assert key_filters['publisher.pk_publisher'].lookups_per_second > 0
+
+    def test_make_shards(self, saved_mock_project: SavedProject):
+        """Test that the shards cover the requested rows with consecutive positions and distinct seeds,
+        and that the tables with self-references or few rows are not split."""
+        requisition = ExportRequisition([
+            ExportRequisitionRow('place', 10, 5),
+            ExportRequisitionRow('publisher', 10, 5),
+            ExportRequisitionRow('author', 4, None),
+        ])
+        controller = ProcedureController(saved_mock_project.project,
+                                         requisition,
+                                         PreviewOutputDriver(),
+                                         workers=2,
+                                         shard_size=4)
+        tables = {meta_table.name: meta_table for meta_table in saved_mock_project.project.tables}
+        shards = controller._make_shards(tables['place'])
+        assert [shard.row_count for shard in shards] == [4, 4, 2]
+        assert [shard.position.first_row for shard in shards] == [0, 4, 8]
+        assert {(shard.position.table_row_count, shard.position.shard_count) for shard in shards} == {(10, 3)}
+        assert {shard.table_seed for shard in shards} == {5}
+        assert len({shard.seed for shard in shards}) == 3
+        assert controller._make_shards(tables['place']) == shards
+        publisher_shards = controller._make_shards(tables['publisher'])
+        assert [(shard.row_count, shard.seed) for shard in publisher_shards] == [(10, 5)]
+        author_shards = controller._make_shards(tables['author'])
+        assert len(author_shards) == 1
+        assert author_shards[0].seed is not None
+        assert author_shards[0].seed == author_shards[0].table_seed
+
+    def test_top_up(self, saved_mock_project: SavedProject):
+        """Test that the rows missing after merging the shards are generated in the current process,
+        drawing unique values after the ones of the shards."""
+        place = next(meta_table for meta_table in saved_mock_project.project.tables if meta_table.name == 'place')
+        city = next(meta_column for meta_column in place.columns if meta_column.name == 'city')
+        city.generator_setting.name = 'String'
+        city.generator_setting.params = {'min_length': 1, 'max_length': 3, 'unique': True}
+        city.generator_setting.null_frequency = 0
+        requisition = ExportRequisition([ExportRequisitionRow('place', 10, 5)])
+        controller = ProcedureController(saved_mock_project.project,
+                                         requisition,
+                                         PreviewOutputDriver(),
+                                         workers=2,
+                                         shard_size=4)
+        table_db = controller._database.add_table(place.name, controller._kept_columns(place))
+        stats = controller.statistics.get_table_statistics(place.name)
+        controller._top_up(place, table_db, stats, 3)
+        assert len(table_db) == 10
+        controller._database.clean_up()
+
+    def test_sharded_run(self, saved_mock_project: SavedProject):
+        """Test that the merged shards are complete and keep the unique keys unique."""
+        project = saved_mock_project.project
+        controller = ProcedureController(project,
+                                         saved_mock_project.requisition,
+                                         PreviewOutputDriver(),
+                                         workers=2,
+                                         shard_size=3)
+        generated = controller.run()
+        for meta_table in project.tables:
+            rows = list(generated.get_table(meta_table.name))
+            assert rows
+            for constraint in meta_table.constraints:
+                if constraint.constraint_type not in (MetaConstraint.PRIMARY, MetaConstraint.UNIQUE):
+                    continue
+                keys = [tuple(row[column.name] for column in constraint.constrained_columns) for row in rows]
+                keys = [key for key in keys if not all(value is None for value in key)]
+                assert len(keys) == len(set(keys)), constraint.name
+        assert_references_exist(project, generated)
+        generated.clean_up()
@@ -0,0 +1,70 @@
+import pytest
+
+from core.service.exception import RequisitionInfeasibleError
+from core.service.generation_procedure.planner import RequisitionPlanner
+from core.service.generation_procedure.requisition import ExportRequisition, ExportRequisitionRow
+from tests.fixtures.data_source import narrow_publisher_names
+from web.view.project import SavedProject
+
+
+def make_planner(saved_project: SavedProject, publisher_count: int, repairs: bool = False) -> RequisitionPlanner:
+    """Return a planner of the publisher and book tables."""
+    requisition = ExportRequisition([
+        ExportRequisitionRow('publisher', publisher_count, 1),
+        ExportRequisitionRow('book', 10, 1)
+    ])
+    return RequisitionPlanner(saved_project.project, requisition, False, repairs)
+
+
+class TestPlanner:
+    """Test the requisition planner."""
+
+    def test_feasible(self, saved_mock_project: SavedProject):
+        """Test that a requisition within the domains has no issues in any mode."""
+        for mode in RequisitionPlanner.modes:
+            plan = make_planner(saved_mock_project, 7).plan(mode)
+            assert plan.issues == []
+            assert plan.unique_settings == set()
+            assert plan.expected_counts == {'publisher': 7, 'book': 10}
+
+    def test_warn(self, saved_mock_project: SavedProject):
+        """Test that the warn mode reports the expected collisions and the small domains."""
+        narrow_publisher_names(saved_mock_project.project)
+        plan = make_planner(saved_mock_project, 45).plan(RequisitionPlanner.WARN)
+        assert {issue.constraint_name for issue in plan.issues} == {'publisher.pk_publisher'}
+        assert 'random draws' in plan.issues[0].message
+        assert plan.expected_counts['publisher'] < 45
+        assert plan.unique_settings == set()
+
+        plan = make_planner(saved_mock_project, 60).plan(RequisitionPlanner.WARN)
+        assert 'at most 52 distinct keys' in plan.issues[0].message
+        assert plan.expected_counts['publisher'] == 52
+
+    def test_warn_repairs(self, saved_mock_project: SavedProject):
+        """Test that the retries of the repaired rows are taken into account."""
+        narrow_publisher_names(saved_mock_project.project)
+        plan = make_planner(saved_mock_project, 45, repairs=True).plan(RequisitionPlanner.WARN)
+        assert plan.issues == []
+
+    def test_strict(self, saved_mock_project: SavedProject):
+        """Test that the strict mode raises an error listing the issues."""
+        narrow_publisher_names(saved_mock_project.project)
+        with pytest.raises(RequisitionInfeasibleError):
+            make_planner(saved_mock_project, 45).plan(RequisitionPlanner.STRICT)
+
+    def test_auto(self, saved_mock_project: SavedProject):
+        """Test that the auto mode picks the unique mode, if the domain is large enough."""
+        publisher = narrow_publisher_names(saved_mock_project.project)
+        company_name_setting = next(meta_column.generator_setting
+                                    for meta_column in publisher.columns
+                                    if meta_column.name == 'company_name')
+        planner = make_planner(saved_mock_project, 45)
+        plan = planner.plan(RequisitionPlanner.AUTO)
+        assert plan.issues == []
+        assert plan.unique_settings == {company_name_setting}
+        assert plan.expected_counts['publisher'] == 45
+        assert company_name_setting.params['unique'] is False
+
+        plan = make_planner(saved_mock_project, 60).plan(RequisitionPlanner.AUTO)
+        assert {issue.constraint_name for issue in plan.issues} == {'publisher.pk_publisher'}
+        assert plan.unique_settings == set()
@@ -1,5 +1,6 @@
 from json import loads
 
+import pytest
 from flask.testing import FlaskClient
 from sqlalchemy import MetaData, Table
 from sqlalchemy.orm import Session
@@ -7,6 +8,7 @@ from sqlalchemy.orm import Session
 from core.model.project import Project
 from core.service.generation_procedure.requisition import ExportRequisitionRow
 from core.service.mock_schema import mock_book_author_publisher
+from core.service.output_driver.file_driver.facade import FileOutputDriverFacade
 from tests.fixtures.data_source import UserMockDataSource
 from tests.fixtures.project import UserProject
 from web.view.project import ProjectView, ProjectListView, PreviewView, ExportRequisitionRowView, SaveView
@@ -98,3 +100,18 @@ class TestProject:
         response = client.post(url, json=data, headers=auth_header)
         python_object_saved = loads(response.data)
         assert not SaveView().validate(python_object_saved)
+
+    @pytest.mark.parametrize('driver_name', FileOutputDriverFacade.get_driver_name_list())
+    def test_export(self,
+                    client: FlaskClient,
+                    user_import_mock_database: UserMockDataSource,
+                    auth_header: dict,
+                    driver_name: str):
+        """Test the streamed file export with each file driver."""
+        url = '/api/project/{}/export'.format(user_import_mock_database.project.id)
+        data = self._make_requisition_data(mock_book_author_publisher(), 10)
+        data['driver_name'] = driver_name
+        response = client.post(url, json=data, headers=auth_header)
+        assert response.status_code == 200
+        assert response.is_streamed
+        assert response.data
@@ -0,0 +1,56 @@
+import pickle
+import random
+import time
+
+from core.service.generation_procedure.reference_index import ReferenceIndex
+
+
+class TestReferenceIndex:
+    """Test the index of referenced keys."""
+
+    def test_membership(self):
+        """Test that the index agrees with a set, before and after switching to tuple keys."""
+        random_inst = random.Random(0)
+        reference_index = ReferenceIndex()
+        keys = set()
+        for _ in range(2000):
+            key = (random_inst.randrange(-1000, 1000),)
+            reference_index.add(key)
+            keys.add(key)
+        assert reference_index._int_keys is not None
+        assert len(reference_index) == len(keys)
+        assert all(key in reference_index for key in keys)
+        assert (-1, -2) not in reference_index
+
+        for key in [('a', -1), ('a', -2), (2 ** 64,), (-1,)]:
+            reference_index.add(key)
+            keys.add(key)
+        assert reference_index._tuple_keys is not None
+        assert len(reference_index) == len(keys)
+        for value in range(-1100, 1100):
+            assert ((value,) in reference_index) == ((value,) in keys)
+        assert ('a', -2) in reference_index
+        assert ('a', -3) not in reference_index
+
+    def test_choice(self):
+        """Test that the choice returns the added keys, also after pickling."""
+        reference_index = ReferenceIndex()
+        for value in range(100):
+            reference_index.add((value,))
+            reference_index.add((value,))
+        shipped = pickle.loads(pickle.dumps(reference_index))
+        assert len(shipped) == 100
+        random_inst = random.Random(1)
+        chosen = {shipped.choice(random_inst) for _ in range(1000)}
+        assert chosen <= {(value,) for value in range(100)}
+        assert len(chosen) > 90
+
+    def test_strided_keys(self):
+        """Test that the keys with a power of two stride do not collide."""
+        reference_index = ReferenceIndex()
+        start = time.perf_counter()
+        for value in range(20000):
+            reference_index.add((value * 65536,))
+        assert all((value * 65536,) in reference_index for value in range(20000))
+        assert (65535,) not in reference_index
+        assert time.perf_counter() - start < 2
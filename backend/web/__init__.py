@@ -36,7 +36,10 @@ def create_app(**kwargs) -> Flask:
         DATABASE_DB=os.environ.get('POSTGRES_DB'),
         DATABASE_HOST=os.environ.get('DATABASE_HOST'),
         DATABASE_PORT=os.environ.get('DATABASE_PORT'),
-        ORIGIN=os.environ.get('ORIGIN')
+        ORIGIN=os.environ.get('ORIGIN'),
+        ESTIMATION_MAX_ROWS=os.environ.get('ESTIMATION_MAX_ROWS'),
+        ESTIMATION_MAX_SECONDS=os.environ.get('ESTIMATION_MAX_SECONDS'),
+        ESTIMATION_SEED=os.environ.get('ESTIMATION_SEED')
     )
     app.config.from_mapping(**kwargs)
 
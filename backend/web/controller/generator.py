@@ -16,7 +16,7 @@ from web.controller.util import TOKEN_SECURITY, BAD_REQUEST_SCHEMA, bad_request,
 from web.service.database import get_db_session
 from web.service.injector import inject, get_injector
 from web.view.generator import GeneratorListView, GeneratorSettingWrite, GeneratorSettingView, GeneratorSettingCreate, \
-    OutputFileDriverListView
+    OutputFileDriverListView, GeneratorSettingEstimatedView, EstimateAccuracyView
 
 generator = Blueprint('generator', __name__, url_prefix='/api')
 
@@ -32,7 +32,7 @@ generator = Blueprint('generator', __name__, url_prefix='/api')
     }
 })
 def get_generators():
-    generators = RegisteredGenerator.__subclasses__()
+    generators = list(RegisteredGenerator.iter_metadata())
     return GeneratorListView().dump({'items': generators})
 
 
@@ -134,8 +134,9 @@ def create_generator_setting():
     ],
     'responses': {
         200: {
-            'description': 'Patched generator setting',
-            'schema': GeneratorSettingView
+            'description': 'Patched generator setting, with the accuracy of the estimated params '
+                           'if they were estimated from a sample',
+            'schema': GeneratorSettingEstimatedView
         },
         400: BAD_REQUEST_SCHEMA
     }
@@ -145,15 +146,18 @@ def patch_generator_setting(generator_setting: GeneratorSetting):
     estimate_params = request.json.get('estimate_params')
     facade = GeneratorSettingFacade(generator_setting)
 
+    accuracy = None
     if estimate_params:
-        facade.maybe_estimate_params(get_injector())
+        accuracy = facade.maybe_estimate_params(get_injector())
     else:
         gen_instance = facade.make_generator_instance()
         gen_instance.save_params()
 
     db_session = get_db_session()
     db_session.commit()
-    return GeneratorSettingView().dump(generator_setting)
+    response = GeneratorSettingView().dump(generator_setting)
+    response['estimate_accuracy'] = EstimateAccuracyView().dump(accuracy) if accuracy is not None else None
+    return response
 
 
 @generator.route('/generator-setting/<id>', methods=('DELETE',))
@@ -147,8 +147,8 @@ def get_project(proj: Project):
 def generate_project_preview(proj: Project):
     requisition = ExportRequisitionView().load(request.json)
     facade = inject(ProjectFacade)
-    tables = facade.generate_preview(proj, requisition)
-    return PreviewView().dump({'tables': tables})
+    tables, retry_counts = facade.generate_preview(proj, requisition)
+    return PreviewView().dump({'tables': tables, 'retry_counts': retry_counts})
 
 
 @project.route('/project/<id>/export', methods=('POST',))
@@ -185,11 +185,13 @@ def export_project(proj: Project):
     facade = inject(ProjectFacade)
     file_driver = facade.generate_file_export(proj, requisition, driver_name)
     file_name = file_driver.add_extension(secure_filename(proj.name))
-    return Response(
-        file_driver.dump(),
+    response = Response(
+        file_driver.iter_dump(),
         mimetype=file_driver.mime_type,
         headers=file_attachment_headers(file_name)
     )
+    response.call_on_close(file_driver.close)
+    return response
 
 
 @project.route('/project/<id>/save', methods=('POST',))
@@ -1,10 +1,11 @@
-from typing import TypeVar, Type
+from typing import TypeVar, Type, Optional, Any, Callable
 
 from flask import g, current_app
 from sqlalchemy.orm import Session
 
 from core.facade.project import ProjectStorage
 from core.service.auth.token import SecretKey
+from core.service.data_source.data_provider.sampling import EstimationBudget
 from core.service.injector import Injector
 from web.service.database import get_db_session
 
@@ -17,10 +18,28 @@ def get_injector() -> Injector:
     injector.provide(Session, get_db_session())
     injector.provide(SecretKey, current_app.config['SECRET_KEY'])
     injector.provide(ProjectStorage, current_app.config['PROJECT_STORAGE'])
+    injector.provide(EstimationBudget, make_estimation_budget())
     g.injector = injector
     return injector
 
 
+def _config_value(key: str, convert: Callable[[Any], Any]) -> Optional[Any]:
+    """Return the converted configuration value, None if it is not set."""
+    value = current_app.config.get(key)
+    if value is None or value == '':
+        return None
+    return convert(value)
+
+
+def make_estimation_budget() -> EstimationBudget:
+    """Create the estimation budget from the app's configuration."""
+    return EstimationBudget.configured(
+        max_rows=_config_value('ESTIMATION_MAX_ROWS', int),
+        max_seconds=_config_value('ESTIMATION_MAX_SECONDS', float),
+        seed=_config_value('ESTIMATION_SEED', int)
+    )
+
+
 T = TypeVar('T')
 
 
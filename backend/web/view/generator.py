@@ -1,11 +1,9 @@
-from typing import Type
-
 from marshmallow import Schema, ValidationError, post_load
 from marshmallow.fields import Int, Str, Dict, Float, Bool, Raw, Nested, List, Method
 from marshmallow.validate import Range
 
 from core.model.generator_setting import GeneratorSetting
-from core.service.column_generator.base import RegisteredGenerator, ColumnGenerator, MultiColumnGenerator
+from core.service.column_generator.base import RegisteredGenerator, GeneratorMetadata
 from core.service.output_driver.file_driver.base import FileOutputDriver
 
 
@@ -20,6 +18,18 @@ class GeneratorSettingView(Schema):
         return GeneratorSetting(**data)
 
 
+class EstimateAccuracyView(Schema):
+    is_exact = Bool()
+    sample_count = Int()
+    population_count = Int(allow_none=True)
+    mean_standard_error = Float(allow_none=True)
+    null_frequency_standard_error = Float(allow_none=True)
+
+
+class GeneratorSettingEstimatedView(GeneratorSettingView):
+    estimate_accuracy = Nested(EstimateAccuracyView(), allow_none=True)
+
+
 def validate_generator_name(name):
     if not RegisteredGenerator.is_name_registered(name):
         raise ValidationError('invalid generator name')
@@ -51,29 +61,17 @@ class GeneratorParam(Schema):
 
 
 class GeneratorView(Schema):
-    name = Method('get_name')
+    name = Str()
     category = Method('get_category_value')
-    only_for_type = Method('get_only_for_type')
+    only_for_type = Raw()
     supports_null = Bool()
-    is_multi_column = Method('get_is_multi_column')
+    is_multi_column = Bool()
     param_list = List(Nested(GeneratorParam()))
-    tooltip = Method('get_tooltip')
-
-    def get_name(self, obj: Type[ColumnGenerator]):
-        return obj.name()
+    tooltip = Str()
 
-    def get_category_value(self, obj: Type[ColumnGenerator]):
+    def get_category_value(self, obj: GeneratorMetadata):
         return obj.category.value
 
-    def get_only_for_type(self, obj: Type[ColumnGenerator]):
-        return obj.only_for_type()
-
-    def get_is_multi_column(self, obj: Type[ColumnGenerator]):
-        return issubclass(obj, MultiColumnGenerator)
-
-    def get_tooltip(self, obj: Type[ColumnGenerator]):
-        return obj.__doc__
-
 
 class GeneratorListView(Schema):
     items = List(Nested(GeneratorView()))
@@ -54,6 +54,7 @@ class ExportFileRequisitionView(ExportRequisitionView):
 
 class PreviewView(Schema):
     tables = Dict(keys=Str(), values=List(Dict(keys=Str())))
+    retry_counts = Dict(keys=Str(), values=Int())
 
 
 class SavedProjectView(Schema):